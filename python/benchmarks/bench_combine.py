@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: combining audio segments
+
+Compares the old accumulate-with-``+=`` combine loop against the
+single-pass ``concatenate_audio`` used by text_to_speech.py, reporting
+wall time and peak Python memory for increasing segment counts.
+
+Segments are synthetic 16-bit mono WAV tones, so no network, TTS engine
+or ffmpeg is needed (only pydub).
+
+Usage:
+    python benchmarks/bench_combine.py
+    python benchmarks/bench_combine.py --counts 10 50 100 --seconds 3
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tts'))
+
+from text_to_speech import concatenate_audio  # noqa: E402
+
+
+def write_tone(path: Path, seconds: float, frame_rate: int = 24000, freq: float = 440.0):
+    """Write a mono 16-bit sine tone WAV file."""
+    frames = int(seconds * frame_rate)
+    samples = (int(8000 * math.sin(2 * math.pi * freq * n / frame_rate)) for n in range(frames))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(struct.pack(f'<{frames}h', *samples))
+
+
+def legacy_concatenate(segments, pause_duration=1000):
+    """The original quadratic combine loop, kept for comparison."""
+    from pydub import AudioSegment
+
+    combined = AudioSegment.empty()
+    pause = AudioSegment.silent(duration=pause_duration)
+    for i, segment_file in enumerate(segments):
+        combined += AudioSegment.from_file(segment_file)
+        if i < len(segments) - 1:
+            combined += pause
+    return combined
+
+
+def measure(func, segments):
+    """Return (seconds, peak MiB) for one call of func(segments)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(segments)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark audio segment combining')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 25, 50, 100],
+                        help='Segment counts to benchmark. Default: 10 25 50 100')
+    parser.add_argument('--seconds', type=float, default=2.0,
+                        help='Length of each synthetic segment in seconds. Default: 2.0')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tone = Path(tmp) / 'tone.wav'
+        write_tone(tone, args.seconds)
+
+        print(f"{'segments':>8}  {'legacy s':>9}  {'linear s':>9}  {'legacy MiB':>10}  {'linear MiB':>10}")
+        for count in args.counts:
+            segments = [str(tone)] * count
+            legacy_time, legacy_peak = measure(legacy_concatenate, segments)
+            linear_time, linear_peak = measure(concatenate_audio, segments)
+            print(f"{count:>8}  {legacy_time:>9.3f}  {linear_time:>9.3f}  "
+                  f"{legacy_peak:>10.1f}  {linear_peak:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: building the slide deck guides
+
+Renders a deck spec (the emergency contacts guide by default) three ways:
+
+- inline: font attributes written on every paragraph, every shape built
+  through python-pptx (create_contacts_pptx.py before text styles)
+- styles: paragraphs reference the template's named text styles
+- clone:  styles, plus step cards and tip boxes deep-copied from prototypes
+
+Reports the median build-and-save time, the .pptx size and the
+uncompressed size of the slide XML. ``--steps`` builds a synthetic deck
+with that many step cards instead, like the multi-platform variants.
+
+Needs python-pptx only; nothing is written outside a temporary buffer.
+
+Usage:
+    python benchmarks/bench_deck.py
+    python benchmarks/bench_deck.py decks/my_variant.json --repeat 20
+    python benchmarks/bench_deck.py --steps 400
+"""
+
+import argparse
+import io
+import math
+import statistics
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import create_contacts_pptx as deck  # noqa: E402
+
+# mode: (INLINE_STYLES, CLONE_SHAPES)
+MODES = {
+    'inline': (True, False),
+    'styles': (False, False),
+    'clone': (False, True),
+}
+
+
+def build(spec) -> bytes:
+    """Build the deck and return the saved .pptx bytes."""
+    buffer = io.BytesIO()
+    deck.build_deck(spec).save(buffer)
+    return buffer.getvalue()
+
+
+def slide_xml_bytes(data: bytes) -> int:
+    """Total uncompressed size of the slide parts in a .pptx."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return sum(info.file_size for info in archive.infolist()
+                   if info.filename.startswith('ppt/slides/slide'))
+
+
+def synthetic_spec(steps: int) -> dict:
+    """A title slide, then slides of four step cards and a tip each."""
+    slides = [{'type': 'title', 'title': 'Synthetic Guide'}]
+    for page in range(math.ceil(steps / 4)):
+        count = min(4, steps - page * 4)
+        slides.append({
+            'type': 'steps',
+            'title': f"Part {page + 1}",
+            'steps': [{'title': f"Step {page * 4 + i + 1}",
+                       'text': "Tap the button, then confirm the change."}
+                      for i in range(count)],
+            'tips': [{'text': "You can undo this from the same screen."}],
+        })
+    return {'name': 'synthetic', 'slides': slides}
+
+
+def measure(spec, repeat: int, mode: str):
+    """Return (median seconds, .pptx bytes, slide XML bytes) for one mode."""
+    deck.INLINE_STYLES, deck.CLONE_SHAPES = MODES[mode]
+    data = build(spec)  # warm-up: imports, the cached template and prototypes
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(spec)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), len(data), slide_xml_bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark slide deck generation')
+    parser.add_argument('spec', nargs='?', default=str(deck.DEFAULT_SPEC),
+                        help='Deck spec to build. Default: decks/emergency_icloud_contacts.json')
+    parser.add_argument('--steps', type=int, default=None,
+                        help='Build a synthetic deck with this many step cards instead of a spec')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Timed builds per mode (the median is kept). Default: 10')
+    args = parser.parse_args()
+
+    spec = synthetic_spec(args.steps) if args.steps else deck.load_spec(args.spec)
+    results = {mode: measure(spec, args.repeat, mode) for mode in MODES}
+
+    print(f"{'mode':>8}  {'build ms':>9}  {'pptx bytes':>10}  {'slide XML':>10}")
+    for mode, (seconds, size, xml) in results.items():
+        print(f"{mode:>8}  {seconds * 1000:>9.1f}  {size:>10}  {xml:>10}")
+
+    print()
+    for old, new in (('inline', 'styles'), ('styles', 'clone')):
+        (old_time, old_size, old_xml), (new_time, new_size, new_xml) = results[old], results[new]
+        print(f"{new} vs {old}: build time {1 - new_time / old_time:.0%} less, "
+              f".pptx {1 - new_size / old_size:.1%} smaller, "
+              f"slide XML {1 - new_xml / old_xml:.0%} smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: load test of tts_service.py with the stub backend
+
+Starts the service in-process with the deterministic stub synthesizer,
+fires concurrent requests over a small set of distinct prompts, and
+reports throughput, latency percentiles and how many requests were
+coalesced or served from cache instead of synthesized.
+
+Usage:
+    python benchmarks/bench_service.py
+    python benchmarks/bench_service.py --requests 500 --concurrency 50 --distinct 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tts'))
+
+from tts_service import TTSService  # noqa: E402
+
+
+async def request(port: int, payload: dict):
+    """POST one synthesis job; return (status, body bytes, seconds)."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(
+        f"POST /synthesize HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'transfer-encoding: chunked'):
+            chunked = True
+
+    data = b''
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                break
+            data += await reader.readexactly(size + 2)
+    else:
+        data = await reader.read()
+    writer.close()
+    return status, data, time.perf_counter() - started
+
+
+async def run(args):
+    service = TTSService(backend='stub', max_workers=args.workers, stub_delay=args.delay)
+    server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        payload = {
+            'text': "$name, you have the right to remain silent.",
+            'params': {'name': f"Person {i % args.distinct}"},
+        }
+        async with semaphore:
+            return await request(port, payload)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    server.close()
+    await server.wait_closed()
+
+    latencies = sorted(seconds * 1000 for _, _, seconds in results)
+    failures = sum(1 for status, _, _ in results if status != 200)
+    stats = service.stats
+    print(f"Requests: {args.requests} ({failures} failed), concurrency {args.concurrency}, "
+          f"{args.distinct} distinct prompts")
+    print(f"Throughput: {args.requests / elapsed:.0f} req/s over {elapsed:.2f}s")
+    print(f"Latency: p50 {statistics.median(latencies):.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.0f} ms, max {latencies[-1]:.0f} ms")
+    print(f"Syntheses: {stats['syntheses']}, coalesced: {stats['coalesced']}, "
+          f"cache hits: {stats['cache_hits']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the TTS service with a stub backend')
+    parser.add_argument('--requests', type=int, default=200, help='Total requests. Default: 200')
+    parser.add_argument('--concurrency', type=int, default=20,
+                        help='Requests in flight at once. Default: 20')
+    parser.add_argument('--distinct', type=int, default=5,
+                        help='Number of distinct prompts. Default: 5')
+    parser.add_argument('--delay', type=float, default=0.3,
+                        help='Stub synthesis latency in seconds. Default: 0.3')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Service synthesis threads. Default: 4')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI start-up time of text_to_speech.py
+
+Runs ``python -X importtime`` on ``text_to_speech.py --help`` and on an
+empty interpreter, then reports the modules the CLI adds and their total
+import time. Exits non-zero if the import budget is exceeded or if an
+engine/audio library is imported before it is needed, so it can guard
+start-up time in CI.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 40 --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'tts' / 'text_to_speech.py'
+
+# Libraries that must only be imported once synthesis or combining starts
+LAZY_MODULES = ['gtts', 'pyttsx3', 'pydub', 'requests', 'concurrent.futures']
+
+
+def import_times(args):
+    """Return {module: self-time in microseconds} for one interpreter run."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        capture_output=True, text=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def wall_time(args, runs):
+    """Return the median wall time in milliseconds over runs."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark text_to_speech.py start-up')
+    parser.add_argument('--budget-ms', type=float, default=30.0,
+                        help='Maximum import time added by the CLI. Default: 30')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Runs used for the wall time median. Default: 5')
+    args = parser.parse_args()
+
+    baseline = import_times(['-c', 'pass'])
+    cli = import_times([str(SCRIPT), '--help'])
+    added = {name: us for name, us in cli.items() if name not in baseline}
+    added_ms = sum(added.values()) / 1000
+
+    print(f"Modules added by the CLI: {len(added)}, import time {added_ms:.1f} ms "
+          f"(budget {args.budget_ms:.1f} ms)")
+    for name, us in sorted(added.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {us / 1000:7.2f} ms  {name}")
+
+    empty_ms = wall_time(['-c', 'pass'], args.runs)
+    help_ms = wall_time([str(SCRIPT), '--help'], args.runs)
+    print(f"Wall time: --help {help_ms:.0f} ms, empty interpreter {empty_ms:.0f} ms")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in added]
+    if eager:
+        failures.append(f"imported at start-up: {', '.join(eager)}")
+    if added_ms > args.budget_ms:
+        failures.append(f"import time {added_ms:.1f} ms exceeds {args.budget_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Start-up within budget")
+
+
+if __name__ == '__main__':
+    main()
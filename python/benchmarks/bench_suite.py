@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: text_to_speech.py pipeline regressions
+
+Runs the real pipeline against the deterministic fake engine in
+fake_engine.py (tones whose length is proportional to the text) and the
+local gTTS stand-in in fake_gtts.py, so it needs no network, speech
+driver or ffmpeg (only pydub). Measures:
+
+- segment throughput of convert_script_to_speech()
+- gTTS segment throughput over HTTP with parallel workers, after checking
+  that retried requests succeed and segments stay in script order
+- combine time against segment count
+- peak Python memory of synthesis and of the largest combine
+- CLI start-up time (``--help``)
+
+Results are compared with a stored baseline (baseline.json next to this
+file) and the run exits non-zero when a metric regresses by more than
+the tolerance. Record a new baseline on the reference machine with
+``--save-baseline`` when a change is expected to move the numbers.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --segments 1000 --counts 50 200 800
+    python benchmarks/bench_suite.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPT = BENCH_DIR.parent / 'tts' / 'text_to_speech.py'
+BASELINE = BENCH_DIR / 'baseline.json'
+
+sys.path.insert(0, str(SCRIPT.parent))
+
+import fake_engine  # noqa: E402
+import fake_gtts  # noqa: E402
+from mp3_frames import read_frames  # noqa: E402
+from text_to_speech import concatenate_audio, convert_script_to_speech  # noqa: E402
+
+# Sentences cycled through to build synthetic scripts of any length
+LINES = [
+    "If you are stopped by police, stay calm and keep your hands visible.",
+    "You have the right to remain silent.",
+    "Say: I do not consent to a search.",
+    "Ask if you are free to leave. If yes, calmly walk away.",
+    "If you are arrested, ask for a lawyer immediately.",
+    "Do not resist, even if you believe the stop is unfair.",
+    "Remember officer names and badge numbers.",
+    "You can record police in public places.",
+]
+
+
+def write_script(path: Path, count: int):
+    """Write a script of count lines cycling through LINES."""
+    lines = [f"{LINES[i % len(LINES)]} ({i + 1})" for i in range(count)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def timed(repeat: int, func, *args, **kwargs):
+    """
+    Return (median seconds, peak MiB, result) over repeat calls of func.
+
+    One untimed warm-up call comes first so lazy imports and file system
+    caches do not count. Memory is traced on the last call only, because
+    tracing slows the timed calls down.
+    """
+    quiet(func, *args, **kwargs)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        quiet(func, *args, **kwargs)
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = quiet(func, *args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / (1024 * 1024), result
+
+
+def bench_throughput(tmp: Path, segments: int, processes: int, repeat: int) -> dict:
+    """Synthesize a script of segments lines with the fake engine."""
+    script = tmp / 'bench_script.txt'
+    write_script(script, segments)
+    output = tmp / 'throughput'
+
+    elapsed, peak, result = timed(
+        repeat, convert_script_to_speech, str(script), str(output), engine='pyttsx3',
+        combine=False, force=True, processes=processes
+    )
+    if result['error']:
+        raise RuntimeError(f"pipeline failed: {result['error']}")
+
+    return {
+        'synth_segments_per_s': segments / elapsed,
+        'synth_peak_mib': peak,
+    }
+
+
+def bench_gtts(tmp: Path, segments: int, workers: int, latency_ms: float, repeat: int) -> dict:
+    """
+    Synthesize a script over HTTP against the gTTS stand-in.
+
+    An untimed run first has every 15th request fail, and checks that
+    retries recover every segment and that the combined programme keeps
+    the script order, by reading the stand-in's text tags back from the
+    joined MP3 frames. The timed runs then measure throughput with
+    ``workers`` concurrent requests of latency_ms each.
+    """
+    script = tmp / 'gtts_script.txt'
+    write_script(script, segments)
+    lines = script.read_text(encoding='utf-8').splitlines()
+    output = tmp / 'gtts'
+    server = fake_gtts.start(latency_ms=latency_ms, fail_every=15)
+    try:
+        result = quiet(convert_script_to_speech, str(script), str(output), engine='gtts',
+                       endpoint=server.endpoint, workers=workers, retries=2, force=True)
+        if result['error']:
+            raise RuntimeError(f"gTTS pipeline failed: {result['error']}")
+        if server.received <= segments:
+            raise RuntimeError("gTTS stand-in failed no requests; retries were not exercised")
+        with open(result['combined'], 'rb') as f:
+            tags = [fake_gtts.frame_marker(frame) for _, frame in read_frames(f.read())]
+        # One run of tagged frames per segment, separated by untagged pause frames
+        order = [tag for i, tag in enumerate(tags) if tag and (i == 0 or tags[i - 1] != tag)]
+        if order != [fake_gtts.marker(line) for line in lines]:
+            raise RuntimeError("combined gTTS audio is out of script order")
+
+        server.fail_every = 0
+        elapsed, peak, _ = timed(
+            repeat, convert_script_to_speech, str(script), str(output), engine='gtts',
+            endpoint=server.endpoint, workers=workers, force=True
+        )
+    finally:
+        server.stop()
+
+    return {
+        'gtts_segments_per_s': segments / elapsed,
+        'gtts_peak_mib': peak,
+    }
+
+
+def bench_combine(tmp: Path, counts: list, repeat: int) -> dict:
+    """Time concatenate_audio() for each segment count."""
+    segment_dir = tmp / 'combine'
+    segment_dir.mkdir()
+    files = []
+    for i in range(max(counts)):
+        path = segment_dir / f"segment_{i:04d}.wav"
+        fake_engine.write_wav(str(path), fake_engine.tone(LINES[i % len(LINES)]))
+        files.append(str(path))
+
+    metrics = {}
+    peak = 0.0
+    for count in counts:
+        elapsed, peak, _ = timed(repeat, concatenate_audio, files[:count], 1000)
+        metrics[f'combine_{count}_s'] = elapsed
+    metrics['combine_peak_mib'] = peak
+    return metrics
+
+
+def bench_startup(runs: int) -> dict:
+    """Median wall time of ``text_to_speech.py --help``."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, str(SCRIPT), '--help'],
+                       capture_output=True, check=True)
+        times.append(time.perf_counter() - started)
+    return {'startup_s': statistics.median(times)}
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith('_per_s')
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_seconds: float) -> list:
+    """
+    Return (metric, baseline, current, change) rows for regressed metrics.
+
+    Timings that moved by less than min_seconds are treated as noise,
+    whatever their relative change.
+    """
+    regressions = []
+    for metric, value in results.items():
+        reference = baseline.get(metric)
+        if not reference:
+            continue
+        if metric.endswith('_s') and abs(value - reference) < min_seconds:
+            continue
+        change = (value - reference) / reference
+        if higher_is_better(metric):
+            change = -change
+        if change > tolerance:
+            regressions.append((metric, reference, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the TTS pipeline against a baseline')
+    parser.add_argument('--segments', type=int, default=300,
+                        help='Segments synthesized for the throughput run. Default: 300')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='pyttsx3 worker processes for the throughput run. Default: 1')
+    parser.add_argument('--gtts-segments', type=int, default=60,
+                        help='Segments synthesized for the gTTS run. Default: 60')
+    parser.add_argument('--gtts-workers', type=int, default=4,
+                        help='Concurrent gTTS requests. Default: 4')
+    parser.add_argument('--gtts-latency-ms', type=float, default=20,
+                        help='Latency of each gTTS stand-in request. Default: 20')
+    parser.add_argument('--counts', type=int, nargs='+', default=[25, 100, 400],
+                        help='Segment counts for the combine run. Default: 25 100 400')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed runs per measurement (the median is kept). Default: 5')
+    parser.add_argument('--startup-runs', type=int, default=5,
+                        help='CLI start-ups to take the median of. Default: 5')
+    parser.add_argument('--baseline', default=str(BASELINE),
+                        help='Baseline JSON file. Default: benchmarks/baseline.json')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before a metric counts as regressed. Default: 0.25')
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help='Ignore timing changes smaller than this many seconds. Default: 0.01')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline instead of comparing')
+    parser.add_argument('--output', default=None,
+                        help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    fake_engine.install()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results.update(bench_throughput(tmp, args.segments, args.processes, args.repeat))
+        results.update(bench_gtts(tmp, args.gtts_segments, args.gtts_workers,
+                                  args.gtts_latency_ms, args.repeat))
+        results.update(bench_combine(tmp, args.counts, args.repeat))
+    results.update(bench_startup(args.startup_runs))
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'settings': {'segments': args.segments, 'processes': args.processes,
+                     'gtts_segments': args.gtts_segments, 'gtts_workers': args.gtts_workers,
+                     'gtts_latency_ms': args.gtts_latency_ms, 'counts': args.counts},
+        'results': {metric: round(value, 4) for metric, value in results.items()},
+    }
+
+    baseline_file = Path(args.baseline)
+    baseline = {}
+    if baseline_file.exists() and not args.save_baseline:
+        with open(baseline_file, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('settings') != report['settings']:
+            print("⚠️  Baseline was recorded with different settings; comparing anyway")
+
+    print(f"{'metric':<24} {'current':>10} {'baseline':>10}")
+    for metric, value in report['results'].items():
+        reference = baseline.get('results', {}).get(metric)
+        reference = f"{reference:>10.4f}" if reference is not None else f"{'-':>10}"
+        print(f"{metric:<24} {value:>10.4f} {reference}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"\n✅ Baseline saved to: {baseline_file}")
+        return
+
+    if not baseline:
+        print(f"\n⚠️  No baseline at {baseline_file}; run with --save-baseline to record one")
+        return
+
+    regressions = compare(report['results'], baseline.get('results', {}), args.tolerance,
+                          args.min_seconds)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}:")
+        for metric, reference, value, change in regressions:
+            print(f"   {metric}: {reference:.4f} -> {value:.4f} ({change:+.0%} worse)")
+        sys.exit(1)
+
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Deterministic offline stand-in for the pyttsx3 module, for benchmarks.
+
+``install()`` registers this module as ``pyttsx3`` so text_to_speech.py
+runs its real pyttsx3 code path without a speech driver. Every queued
+segment is rendered as a 16-bit mono WAV tone whose length is
+proportional to the text, so runs are repeatable and need no network,
+speech engine or ffmpeg.
+"""
+
+import hashlib
+import math
+import struct
+import sys
+import time
+import wave
+from typing import Optional
+
+FRAME_RATE = 16000
+
+# Audio length per character of text, and simulated synthesis cost
+MS_PER_CHAR = 60
+LATENCY_MS_PER_CHAR = 0.0
+
+
+class Voice:
+    def __init__(self, name: str, voice_id: str):
+        self.name = name
+        self.id = voice_id
+
+
+def tone(text: str, ms_per_char: Optional[int] = None, frame_rate: int = FRAME_RATE) -> bytes:
+    """Return PCM samples of a tone for text (pitch derived from the text)."""
+    ms_per_char = ms_per_char or MS_PER_CHAR
+    freq = 300 + int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:2], 16)
+    period = [int(6000 * math.sin(2 * math.pi * freq * n / frame_rate))
+              for n in range(frame_rate // freq)]
+    cycle = struct.pack(f'<{len(period)}h', *period)
+    frames = frame_rate * len(text) * ms_per_char // 1000
+    repeats = -(-frames * 2 // len(cycle))
+    return (cycle * repeats)[:frames * 2]
+
+
+def write_wav(path: str, pcm: bytes, frame_rate: int = FRAME_RATE):
+    """Write mono 16-bit PCM to a WAV file."""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(pcm)
+
+
+class Engine:
+    """The subset of the pyttsx3 engine API that text_to_speech.py uses."""
+
+    def __init__(self):
+        self.properties = {'rate': 200, 'volume': 1.0, 'voice': None}
+        self.queued = []
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def getProperty(self, name):
+        if name == 'voices':
+            return [Voice('Fake Default', 'fake-default'), Voice('Fake Female', 'fake-female')]
+        return self.properties.get(name)
+
+    def save_to_file(self, text: str, output_file: str):
+        self.queued.append((text, output_file))
+
+    def runAndWait(self):
+        queued, self.queued = self.queued, []
+        for text, output_file in queued:
+            if LATENCY_MS_PER_CHAR:
+                time.sleep(len(text) * LATENCY_MS_PER_CHAR / 1000)
+            write_wav(output_file, tone(text))
+
+
+def init() -> Engine:
+    return Engine()
+
+
+def install(ms_per_char: int = MS_PER_CHAR, latency_ms_per_char: float = 0.0):
+    """Register the fake engine as ``pyttsx3`` for this process (and forked workers)."""
+    global MS_PER_CHAR, LATENCY_MS_PER_CHAR
+    MS_PER_CHAR = ms_per_char
+    LATENCY_MS_PER_CHAR = latency_ms_per_char
+    sys.modules['pyttsx3'] = sys.modules[__name__]
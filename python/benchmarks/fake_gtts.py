@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Deterministic offline stand-in for the Google TTS endpoint, for benchmarks.
+
+``start()`` serves gTTS requests from a local HTTP server on a background
+thread. Passing its ``endpoint`` as ``--gtts-endpoint`` (or ``endpoint=``)
+makes text_to_speech.py run its real gTTS code path with no network:
+HTTP requests, retries, rate limiting, the worker pool and the MP3 frame
+joiner. Every request is answered with silent MPEG-2 Layer III frames
+(24 kHz mono, like gTTS) whose count is proportional to the text, so
+segment lengths are repeatable and no encoder or ffmpeg is needed.
+Each frame also carries a tag derived from the text (``marker()``) in
+its ancillary data, so ``frame_marker()`` can tell which request any
+frame of a joined programme came from.
+
+The server records every request it answered, and can add latency or
+fail every Nth request with HTTP 503 to exercise the retry path.
+
+Usage:
+    python benchmarks/fake_gtts.py --port 8765
+    python tts/text_to_speech.py script.txt out/ --gtts-endpoint http://127.0.0.1:8765
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+# Audio length per character of text (matches fake_engine.py)
+MS_PER_CHAR = 60
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: 96-byte frames of 576 samples (24 ms).
+# All-zero side information declares no main data, so the frame decodes as
+# silence and the bytes after it are ancillary data that decoders skip.
+FRAME_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC4])
+FRAME_BYTES = 96
+FRAME_MS = 24
+SIDE_INFO = 9
+ANCILLARY = len(FRAME_HEADER) + SIDE_INFO
+
+MARKER = b'FAKE'
+
+
+def marker(text: str) -> bytes:
+    """Tag identifying the text a frame was rendered for."""
+    return MARKER + hashlib.sha256(text.encode('utf-8')).digest()[:8]
+
+
+def frame_marker(frame: bytes) -> Optional[bytes]:
+    """Return the tag of a stand-in frame (None for other frames, such as pauses)."""
+    tag = frame[ANCILLARY:ANCILLARY + len(MARKER) + 8]
+    return tag if tag.startswith(MARKER) else None
+
+
+def mp3(text: str, ms_per_char: int = MS_PER_CHAR) -> bytes:
+    """Return silent MP3 frames lasting about ms_per_char per character of text."""
+    tag = marker(text)
+    frame = FRAME_HEADER + bytes(SIDE_INFO) + tag + bytes(FRAME_BYTES - ANCILLARY - len(tag))
+    return frame * max(1, len(text) * ms_per_char // FRAME_MS)
+
+
+def parse_request(body: str) -> Tuple[str, str, bool]:
+    """Return (text, lang, slow) from a gTTS batchexecute request body."""
+    payload = json.loads(urllib.parse.parse_qs(body)['f.req'][0])
+    text, lang, slow = json.loads(payload[0][0][1])[:3]
+    return text, lang, bool(slow)
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: 'FakeGTTSServer'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        with self.server.lock:
+            self.server.received += 1
+            failing = (self.server.fail_every
+                       and self.server.received % self.server.fail_every == 0)
+        if failing:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        text, lang, slow = parse_request(body)
+        with self.server.lock:
+            self.server.requests.append((text, lang, slow))
+
+        audio = base64.b64encode(mp3(text)).decode('ascii')
+        reply = (')]}\'\n\n[["wrb.fr","jQ1olc","[\\"%s\\"]",null,null,null,"generic"]]'
+                 % audio).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGTTSServer(ThreadingHTTPServer):
+    """
+    Local gTTS endpoint.
+
+    Attributes:
+        requests: (text, lang, slow) of every answered request, in arrival order
+        received: Number of requests received, failed ones included
+        latency_ms: Delay added to every request
+        fail_every: Answer every Nth request with HTTP 503 (0 = never)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency_ms: float = 0, fail_every: int = 0):
+        super().__init__(('127.0.0.1', port), Handler)
+        self.latency_ms = latency_ms
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.requests: List[Tuple[str, str, bool]] = []
+        self.received = 0
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.requests = []
+            self.received = 0
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start(port: int = 0, latency_ms: float = 0, fail_every: int = 0) -> FakeGTTSServer:
+    """Serve on port (0 = any free port) from a background thread."""
+    server = FakeGTTSServer(port, latency_ms, fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the gTTS endpoint')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on. Default: 8765')
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='Delay added to every request. Default: 0')
+    parser.add_argument('--fail-every', type=int, default=0,
+                        help='Answer every Nth request with HTTP 503 (0 = never). Default: 0')
+    args = parser.parse_args()
+
+    server = FakeGTTSServer(args.port, args.latency_ms, args.fail_every)
+    print(f"Serving gTTS stand-in on {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,65 @@
 """
 Generate a PowerPoint guide: How to Create an Emergency iCloud Contact List
 with Apple Contacts for the Good Trouble Safety Automation Toolkit.
+
+Decks are described as data (JSON, or YAML when PyYAML is installed) in
+decks/ and rendered by build_deck(). Each slide names a slide type
+(title, steps, checklist, ...) and holds only its text; layout and
+colors live in the slide type renderers below. ``${name}`` placeholders
+are filled from the spec's ``variables``, and a spec can ``extend``
+another, so per-organisation variants only list what differs.
+
+Fonts, sizes and colors are named text styles (TEXT_STYLES) stored once
+in a generated template as the master's text style levels. Paragraphs
+reference a style by level and only carry the attributes that differ
+from it, instead of repeating every font attribute on every paragraph.
+
+Step cards and tip boxes are built once as prototypes and deep-copied
+with their text and position patched (CLONE_SHAPES), which is much
+cheaper than running python-pptx's shape factory for every card.
+
+Each rendered deck gets a manifest of slide content hashes next to it.
+When a spec is rendered again over its previous output, only the slides
+whose hash changed are rebuilt and spliced into the existing package;
+every other part is copied over as is.
+
+Decks can also be exported to PDF and per-slide PNG thumbnails with
+LibreOffice (soffice) and poppler (pdftoppm), run headless. Exports
+are keyed by slide hash in the same manifest, so only stale files are
+regenerated.
+
+Usage:
+    python create_contacts_pptx.py
+    python create_contacts_pptx.py decks/my_variant.json -o out/guide.pptx
+    python create_contacts_pptx.py --export pdf png
+    python create_contacts_pptx.py batch decks/ out/ --jobs 4
 """
 
+import argparse
+import copy
+import functools
+import hashlib
+import io
+import json
+import os
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.shapes.autoshape import Shape
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
 
 # ── Palette ──────────────────────────────────────────────────────────────
 DARK_BG       = RGBColor(0x1A, 0x1A, 0x2E)
@@ -23,6 +75,42 @@ STEP_BG       = RGBColor(0xE8, 0xF0, 0xFE)
 TIP_BG        = RGBColor(0xFF, 0xF3, 0xCD)
 WARN_BG       = RGBColor(0xFD, 0xE8, 0xE8)
 GREEN         = RGBColor(0x28, 0xA7, 0x45)
+TIP_LABEL     = RGBColor(0x85, 0x6D, 0x00)
+WHITE_CARD    = RGBColor(0xFF, 0xFF, 0xFF)
+
+# ── Text styles ──────────────────────────────────────────────────────────
+# Stored in the template as text style levels: a paragraph at level N
+# (``a:pPr lvl="N"``) takes its defaults from lvl(N+1)pPr. Level 0 needs
+# no attribute at all, so it holds the most common style.
+TextStyle = namedtuple("TextStyle", "level size bold color alignment")
+
+TEXT_STYLES = {
+    "body":       TextStyle(0, 13, False, DARK_TEXT, PP_ALIGN.LEFT),
+    "title":      TextStyle(1, 28, True, DARK_TEXT, PP_ALIGN.LEFT),
+    "step_title": TextStyle(2, 17, True, DARK_TEXT, PP_ALIGN.LEFT),
+    "tip":        TextStyle(3, 12, False, DARK_TEXT, PP_ALIGN.LEFT),
+    "tip_label":  TextStyle(4, 11, True, TIP_LABEL, PP_ALIGN.LEFT),
+    "badge":      TextStyle(5, 20, True, WHITE, PP_ALIGN.CENTER),
+    "item":       TextStyle(6, 16, False, DARK_TEXT, PP_ALIGN.LEFT),
+    "hero":       TextStyle(7, 36, True, WHITE, PP_ALIGN.CENTER),
+    "caption":    TextStyle(8, 15, False, MED_GRAY, PP_ALIGN.CENTER),
+}
+STYLE_FONT = "Calibri"
+
+# Write every font attribute on each paragraph instead of referencing the
+# template's styles (the output before styles existed; for benchmarks)
+INLINE_STYLES = False
+
+# Copy step cards and tip boxes from prototypes instead of building each
+# one through python-pptx (False builds every shape; for benchmarks)
+CLONE_SHAPES = True
+
+# ── Paths ────────────────────────────────────────────────────────────────
+SCRIPT_DIR = Path(__file__).resolve().parent
+DECKS_DIR = SCRIPT_DIR / "decks"
+DEFAULT_SPEC = DECKS_DIR / "emergency_icloud_contacts.json"
+# Generated guides are committed next to the other iOS docs
+OUTPUT_DIR = SCRIPT_DIR.parent / "doc" / "ios"
 
 
 def set_slide_bg(slide, color):
@@ -32,25 +120,46 @@ def set_slide_bg(slide, color):
     fill.fore_color.rgb = color
 
 
-def add_textbox(slide, left, top, width, height, text,
-                font_size=18, bold=False, color=WHITE,
-                alignment=PP_ALIGN.LEFT, font_name="Calibri"):
+def apply_style(paragraph, style, **overrides):
+    """
+    Format a paragraph with a named text style from TEXT_STYLES.
+
+    Only overrides (size, bold, color, alignment) that differ from the
+    style are written on the paragraph; the rest comes from the template.
+    """
+    base = TEXT_STYLES[style]
+    if INLINE_STYLES:
+        overrides = {**base._asdict(), **overrides, "font": STYLE_FONT}
+    else:
+        overrides = {key: value for key, value in overrides.items()
+                     if getattr(base, key) != value}
+        if base.level:
+            paragraph.level = base.level
+
+    if "size" in overrides:
+        paragraph.font.size = Pt(overrides["size"])
+    if "bold" in overrides:
+        paragraph.font.bold = overrides["bold"]
+    if "color" in overrides:
+        paragraph.font.color.rgb = overrides["color"]
+    if "font" in overrides:
+        paragraph.font.name = overrides["font"]
+    if "alignment" in overrides:
+        paragraph.alignment = overrides["alignment"]
+
+
+def add_textbox(slide, left, top, width, height, text, style="body", **overrides):
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
     p = tf.paragraphs[0]
     p.text = text
-    p.font.size = Pt(font_size)
-    p.font.bold = bold
-    p.font.color.rgb = color
-    p.font.name = font_name
-    p.alignment = alignment
+    apply_style(p, style, **overrides)
     return txBox
 
 
 def add_bullet_list(slide, left, top, width, height, items,
-                    font_size=16, color=WHITE, spacing=Pt(6),
-                    font_name="Calibri", bold_first=False):
+                    style="item", spacing=Pt(6), bold_first=False, **overrides):
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -60,13 +169,11 @@ def add_bullet_list(slide, left, top, width, height, items,
         else:
             p = tf.add_paragraph()
         p.text = item
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = color
-        p.font.name = font_name
         p.space_after = spacing
         if bold_first and i == 0:
-            p.font.bold = True
-        p.level = 0
+            apply_style(p, style, **{**overrides, "bold": True})
+        else:
+            apply_style(p, style, **overrides)
     return txBox
 
 
@@ -83,6 +190,15 @@ def add_rounded_rect(slide, left, top, width, height, fill_color):
 def add_step_card(slide, number, title, instructions, top_offset,
                   bg_color=STEP_BG):
     """Add a numbered step card with a colored badge and instructions."""
+    texts = [str(number), title, instructions]
+    if CLONE_SHAPES:
+        clone_prototype(slide, "step_card", top_offset, texts, bg_color)
+    else:
+        _build_step_card(slide, texts, top_offset, bg_color)
+
+
+def _build_step_card(slide, texts, top_offset, bg_color):
+    number, title, instructions = texts
     card_left = Inches(0.6)
     card_width = Inches(8.8)
     card_height = Inches(1.1)
@@ -101,411 +217,775 @@ def add_step_card(slide, number, title, instructions, top_offset,
     tf = badge.text_frame
     tf.word_wrap = False
     p = tf.paragraphs[0]
-    p.text = str(number)
-    p.font.size = Pt(20)
-    p.font.bold = True
-    p.font.color.rgb = WHITE
-    p.font.name = "Calibri"
-    p.alignment = PP_ALIGN.CENTER
+    p.text = number
+    apply_style(p, "badge")
     tf.paragraphs[0].space_before = Pt(0)
     tf.paragraphs[0].space_after = Pt(0)
 
     # Title
     add_textbox(slide, card_left + Inches(0.85), top_offset + Inches(0.08),
-                Inches(7.5), Inches(0.35), title,
-                font_size=17, bold=True, color=DARK_TEXT)
+                Inches(7.5), Inches(0.35), title, style="step_title")
 
     # Instructions
     add_textbox(slide, card_left + Inches(0.85), top_offset + Inches(0.42),
-                Inches(7.7), Inches(0.65), instructions,
-                font_size=13, color=DARK_TEXT)
+                Inches(7.7), Inches(0.65), instructions, style="body")
+
 
+def add_tip_box(slide, text, top, icon_label="TIP", bg=TIP_BG, label_color=TIP_LABEL):
+    texts = [icon_label, text]
+    if CLONE_SHAPES:
+        clone_prototype(slide, "tip_box", top, texts, bg, label_color)
+    else:
+        _build_tip_box(slide, texts, top, bg, label_color)
 
-def add_tip_box(slide, text, top, icon_label="TIP", bg=TIP_BG, label_color=RGBColor(0x85, 0x6D, 0x0)):
+
+def _build_tip_box(slide, texts, top, bg, label_color):
+    icon_label, text = texts
     left = Inches(0.6)
     width = Inches(8.8)
     height = Inches(0.7)
     add_rounded_rect(slide, left, top, width, height, bg)
     add_textbox(slide, left + Inches(0.2), top + Inches(0.05),
-                Inches(0.7), Inches(0.3), icon_label,
-                font_size=11, bold=True, color=label_color)
+                Inches(0.7), Inches(0.3), icon_label, style="tip_label", color=label_color)
     add_textbox(slide, left + Inches(0.2), top + Inches(0.28),
-                Inches(8.3), Inches(0.4), text,
-                font_size=12, color=DARK_TEXT)
+                Inches(8.3), Inches(0.4), text, style="tip")
+
+
+# ── Shape prototypes ─────────────────────────────────────────────────────
+# kind: (builder, number of texts)
+PROTOTYPES = {
+    "step_card": (_build_step_card, 3),
+    "tip_box": (_build_tip_box, 2),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def shape_prototype(kind, args, inline_styles):
+    """
+    Build the shapes of a PROTOTYPES entry once, at the top of a scratch slide.
+
+    Placeholder text keeps a run in every text-bearing shape, so
+    clone_prototype() can find where its texts go.
+    """
+    builder, text_count = PROTOTYPES[kind]
+    prs = Presentation(io.BytesIO(template_bytes()))
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    builder(slide, ["#"] * text_count, Emu(0), *args)
+    return tuple(shape._element for shape in slide.shapes)
+
+
+def _next_shape_id(spTree):
+    """Next free shape id, allocated the same way python-pptx does."""
+    used_ids = [int(value) for value in spTree.xpath("//@id") if value.isdigit()]
+    return max(used_ids) + 1 if used_ids else 1
+
+
+def clone_prototype(slide, kind, top, texts, *args):
+    """Copy a prototype's shapes onto the slide, moved down by top, with texts filled in."""
+    spTree = slide.shapes._spTree
+    shape_id = _next_shape_id(spTree)
+    texts = list(texts)
+    for prototype in shape_prototype(kind, args, INLINE_STYLES):
+        sp = copy.deepcopy(prototype)
+        cNvPr = sp.nvSpPr.cNvPr
+        cNvPr.id = shape_id
+        cNvPr.name = f"{cNvPr.name.rsplit(' ', 1)[0]} {shape_id - 1}"
+        sp.y = sp.y + top
+        spTree.insert_element_before(sp, "p:extLst")
+        if sp.xpath(".//a:r"):
+            Shape(sp, slide.shapes).text_frame.paragraphs[0].text = texts.pop(0)
+        shape_id += 1
+
+
+def add_badge(slide, left, top, size, label, fill_color, font_size):
+    """Add a filled circle with a centered bold label."""
+    badge = slide.shapes.add_shape(MSO_SHAPE.OVAL, left, top, size, size)
+    badge.fill.solid()
+    badge.fill.fore_color.rgb = fill_color
+    badge.line.fill.background()
+    p = badge.text_frame.paragraphs[0]
+    p.text = label
+    apply_style(p, "badge", size=font_size)
+    return badge
+
+
+def add_slide_header(slide, title, rule_width, top=0.3, rule_color=ACCENT_BLUE):
+    """Add a content slide's title with the accent rule underneath."""
+    add_textbox(slide, Inches(0.6), Inches(top), Inches(8.8), Inches(0.6),
+                title, style="title")
+    add_rounded_rect(slide, Inches(0.6), Inches(top + 0.55), Inches(rule_width), Inches(0.04),
+                     rule_color)
+
+
+# Tip box styles: background and label color
+TIP_STYLES = {
+    "tip": (TIP_BG, TIP_LABEL),
+    "warning": (WARN_BG, ACCENT_RED),
+}
+
+
+def add_tips(slide, tips, top):
+    """
+    Add a slide's tip boxes, stacked from top (in inches).
+
+    A tip may set its own ``top``; the next one follows 0.2in below it.
+    """
+    for tip in tips:
+        top = tip.get("top", top)
+        bg, label_color = TIP_STYLES[tip.get("style", "tip")]
+        add_tip_box(slide, tip["text"], Inches(round(top, 2)), icon_label=tip.get("label", "TIP"),
+                    bg=bg, label_color=label_color)
+        top += 0.9
 
 
 # ═════════════════════════════════════════════════════════════════════════
-# BUILD PRESENTATION
+# SLIDE TYPES
 # ═════════════════════════════════════════════════════════════════════════
-prs = Presentation()
-prs.slide_width = Inches(10)
-prs.slide_height = Inches(7.5)
-blank_layout = prs.slide_layouts[6]  # blank
-
-# ─── SLIDE 1 – Title ─────────────────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, DARK_BG)
-
-# Top accent line
-add_rounded_rect(slide, Inches(0), Inches(0), Inches(10), Inches(0.06), ACCENT_BLUE)
-
-add_textbox(slide, Inches(0.8), Inches(1.5), Inches(8.4), Inches(1.0),
-            "How to Create an Emergency\niCloud Contact List",
-            font_size=36, bold=True, color=WHITE, alignment=PP_ALIGN.CENTER,
-            font_name="Calibri")
-
-add_textbox(slide, Inches(1.0), Inches(3.0), Inches(8.0), Inches(0.6),
-            "Using Apple Contacts on iPhone, iPad, or Mac",
-            font_size=22, color=LIGHT_GRAY, alignment=PP_ALIGN.CENTER)
-
-# Divider
-add_rounded_rect(slide, Inches(3.5), Inches(3.9), Inches(3.0), Inches(0.04), ACCENT_BLUE)
-
-add_textbox(slide, Inches(1.0), Inches(4.3), Inches(8.0), Inches(0.5),
-            "Good Trouble Safety Automation Toolkit",
-            font_size=18, color=ACCENT_BLUE, alignment=PP_ALIGN.CENTER,
-            font_name="Calibri")
-
-add_textbox(slide, Inches(1.0), Inches(5.0), Inches(8.0), Inches(0.8),
-            "Set up a dedicated contact list so your emergency alerts\n"
-            "reach the right people instantly.",
-            font_size=15, color=MED_GRAY, alignment=PP_ALIGN.CENTER)
-
-add_textbox(slide, Inches(0.5), Inches(6.8), Inches(9.0), Inches(0.4),
-            "Supports iOS 15+ | macOS Ventura+ | iCloud Sync",
-            font_size=12, color=MED_GRAY, alignment=PP_ALIGN.CENTER)
-
-# ─── SLIDE 2 – Overview / Why ────────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.4), Inches(8.8), Inches(0.6),
-            "Why Create an Emergency Contact List?",
-            font_size=28, bold=True, color=DARK_TEXT, alignment=PP_ALIGN.LEFT)
-
-add_rounded_rect(slide, Inches(0.6), Inches(0.95), Inches(3.0), Inches(0.04), ACCENT_BLUE)
-
-reasons = [
-    "Quickly send alerts to trusted people during an encounter",
-    "Keep emergency contacts organized and separate from your full address book",
-    "Syncs automatically across all your Apple devices via iCloud",
-    "Works seamlessly with iOS Shortcuts for the Good Trouble toolkit",
-    "Update the list once and changes propagate everywhere",
-]
-for i, reason in enumerate(reasons):
-    y = Inches(1.4) + Inches(i * 0.7)
-    # Bullet icon rect
-    add_rounded_rect(slide, Inches(0.8), y + Inches(0.05), Inches(0.25), Inches(0.25), ACCENT_BLUE)
-    add_textbox(slide, Inches(0.82), y + Inches(0.02), Inches(0.25), Inches(0.3),
-                ">>", font_size=10, bold=True, color=WHITE, alignment=PP_ALIGN.CENTER)
-    add_textbox(slide, Inches(1.2), y, Inches(8.0), Inches(0.5),
-                reason, font_size=16, color=DARK_TEXT)
-
-add_tip_box(slide,
-            "The contact list you create here is what the Good Trouble Shortcut uses "
-            "to know who to message when you trigger an emergency alert.",
-            Inches(5.5))
-
-# ─── SLIDE 3 – Prerequisites ─────────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.4), Inches(8.8), Inches(0.6),
-            "Before You Begin",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.95), Inches(2.0), Inches(0.04), ACCENT_BLUE)
-
-prereqs = [
-    ("iCloud Account", "Sign in to iCloud on your device (Settings > [Your Name] > iCloud)."),
-    ("Contacts Syncing ON", "Under iCloud settings, make sure Contacts toggle is enabled."),
-    ("Apple Contacts App", "Pre-installed on every iPhone, iPad, and Mac."),
-    ("Emergency Contact Info", "Gather phone numbers / emails of your trusted contacts."),
-]
-for i, (title, desc) in enumerate(prereqs):
-    y = Inches(1.3) + Inches(i * 0.95)
-    # Number circle
-    badge = slide.shapes.add_shape(
-        MSO_SHAPE.OVAL, Inches(0.8), y + Inches(0.05),
-        Inches(0.45), Inches(0.45)
-    )
-    badge.fill.solid()
-    badge.fill.fore_color.rgb = ACCENT_BLUE
-    badge.line.fill.background()
-    tf = badge.text_frame
-    p = tf.paragraphs[0]
-    p.text = str(i + 1)
-    p.font.size = Pt(18)
-    p.font.bold = True
-    p.font.color.rgb = WHITE
-    p.alignment = PP_ALIGN.CENTER
-
-    add_textbox(slide, Inches(1.45), y, Inches(7.5), Inches(0.35),
-                title, font_size=17, bold=True, color=DARK_TEXT)
-    add_textbox(slide, Inches(1.45), y + Inches(0.35), Inches(7.5), Inches(0.4),
-                desc, font_size=13, color=DARK_TEXT)
-
-add_tip_box(slide,
-            "If iCloud Contacts syncing is off, your list will only exist on that one device "
-            "and won't be available to Shortcuts on your other devices.",
-            Inches(5.4), icon_label="NOTE", bg=WARN_BG, label_color=ACCENT_RED)
-
-# ─── SLIDE 4 – Step-by-step: Create the List (iPhone/iPad) ───────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Create the List on iPhone or iPad",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(3.5), Inches(0.04), ACCENT_BLUE)
-
-add_step_card(slide, 1, "Open the Contacts App",
-              "Tap the Contacts app on your Home Screen (or open Phone and tap the Contacts tab).",
-              Inches(1.1))
-
-add_step_card(slide, 2, "Go to the Lists View",
-              "Tap \"Lists\" in the upper-left corner to see all your contact lists. "
-              "If you're already on the Lists screen, skip this step.",
-              Inches(2.35))
-
-add_step_card(slide, 3, "Create a New List",
-              "Tap \"Add List\" in the upper-left. Name it  Emergency Contacts  (or any name you prefer). "
-              "Make sure iCloud is selected as the account, then tap \"Done\".",
-              Inches(3.6))
-
-add_step_card(slide, 4, "Add Contacts to the List",
-              "Tap your new list to open it. Tap the \"+\" button or \"Add Contact\" to browse "
-              "your existing contacts. Select each trusted person, then tap \"Done\".",
-              Inches(4.85))
-
-add_tip_box(slide,
-            "You can also drag and drop contacts into the list on a Mac using the Contacts app sidebar.",
-            Inches(6.2))
-
-# ─── SLIDE 5 – Step-by-step: Create the List (Mac) ───────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Create the List on Mac",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(2.5), Inches(0.04), ACCENT_BLUE)
-
-add_step_card(slide, 1, "Open Contacts",
-              "Launch the Contacts app from Applications, the Dock, or Spotlight (Cmd + Space, type \"Contacts\").",
-              Inches(1.1))
-
-add_step_card(slide, 2, "Show the Sidebar",
-              "If you don't see the sidebar with lists, go to View > Show Groups (or click the sidebar icon).",
-              Inches(2.35))
-
-add_step_card(slide, 3, "Create a New List",
-              "Click File > New List (or press Cmd + Shift + N in older macOS). "
-              "Name it  Emergency Contacts  and make sure it appears under the iCloud section.",
-              Inches(3.6))
-
-add_step_card(slide, 4, "Add Contacts",
-              "Select contacts from \"All Contacts\", then drag them onto the new list in the sidebar. "
-              "You can hold Cmd to select multiple contacts at once.",
-              Inches(4.85))
-
-add_tip_box(slide,
-            "On macOS Ventura and later, the Contacts app has a refreshed sidebar. "
-            "Right-click in the sidebar to see \"New List\" as well.",
-            Inches(6.2))
-
-# ─── SLIDE 6 – Verify iCloud Sync ────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Verify iCloud Sync",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(2.5), Inches(0.04), ACCENT_BLUE)
-
-add_step_card(slide, 1, "Check on Another Device",
-              "Open Contacts on a second Apple device signed into the same iCloud account. "
-              "Your \"Emergency Contacts\" list should appear automatically.",
-              Inches(1.1))
-
-add_step_card(slide, 2, "Check on iCloud.com",
-              "Go to iCloud.com in a browser, sign in, and open Contacts. "
-              "Your list should appear in the sidebar under \"Lists\".",
-              Inches(2.35))
-
-add_step_card(slide, 3, "Force a Sync (if needed)",
-              "On iPhone/iPad: Settings > [Your Name] > iCloud > toggle Contacts off and back on. "
-              "On Mac: System Settings > Apple ID > iCloud > toggle Contacts.",
-              Inches(3.6))
-
-add_tip_box(slide,
-            "iCloud syncing may not be instant. Give it a minute or two, "
-            "and make sure you're connected to Wi-Fi or cellular data.",
-            Inches(5.0))
-
-add_tip_box(slide,
-            "If the list shows up under \"On My iPhone\" instead of \"iCloud\", you need to move "
-            "the contacts. Delete the local list and recreate it while iCloud is the default account "
-            "(Settings > Contacts > Default Account > iCloud).",
-            Inches(5.9), icon_label="WARN", bg=WARN_BG, label_color=ACCENT_RED)
-
-# ─── SLIDE 7 – Using with Good Trouble Shortcut ──────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Using the List with Good Trouble Shortcuts",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(4.0), Inches(0.04), ACCENT_BLUE)
-
-add_textbox(slide, Inches(0.6), Inches(1.1), Inches(8.8), Inches(0.6),
-            "Your emergency contact list integrates directly with the iOS Shortcut workflow:",
-            font_size=15, color=DARK_TEXT)
-
-add_step_card(slide, 1, "Open the Good Trouble Shortcut in the Shortcuts App",
-              "Find the shortcut you built following the ShortcutTutorial. Tap the \"...\" to edit it.",
-              Inches(1.6))
-
-add_step_card(slide, 2, "Locate the \"Send Message\" or \"Get Contacts\" Action",
-              "In the shortcut, find the action that retrieves contacts to message. "
-              "It may say \"Get Contacts from [list]\" or \"Send Message to [contacts]\".",
-              Inches(2.85))
-
-add_step_card(slide, 3, "Point It to Your Emergency Contacts List",
-              "Tap the list name in the action and choose your \"Emergency Contacts\" list. "
-              "The shortcut will now message everyone on that list when triggered.",
-              Inches(4.1))
-
-add_step_card(slide, 4, "Test the Shortcut",
-              "Run the shortcut manually to verify it picks up all the contacts from your list. "
-              "Confirm that each person receives the alert message with your GPS location.",
-              Inches(5.35))
-
-add_tip_box(slide,
-            "When you add or remove someone from the Emergency Contacts list, the shortcut "
-            "automatically picks up the change - no need to edit the shortcut again.",
-            Inches(6.55))
-
-# ─── SLIDE 8 – Best Practices ────────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Best Practices",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(1.8), Inches(0.04), ACCENT_BLUE)
-
-practices = [
-    ("Keep the List Small and Trusted",
-     "3-5 people is ideal. These should be people who will act on an alert immediately."),
-    ("Include Varied Contact Methods",
-     "Ensure contacts have both phone numbers and email addresses saved in their card."),
-    ("Inform Your Contacts",
-     "Let everyone on the list know they're your emergency contacts and what an alert looks like."),
-    ("Review Regularly",
-     "Check the list every few months. Remove outdated contacts, add new trusted people."),
-    ("Test Periodically",
-     "Run a test alert to make sure messages go through and contacts know how to respond."),
-]
-for i, (title, desc) in enumerate(practices):
-    y = Inches(1.1) + Inches(i * 0.85)
-    # Green check circle
-    badge = slide.shapes.add_shape(
-        MSO_SHAPE.OVAL, Inches(0.8), y + Inches(0.05),
-        Inches(0.4), Inches(0.4)
+# Renderers by slide type name: (render function, background color)
+SLIDE_TYPES = {}
+
+
+def slide_type(name, background=SOFT_BG):
+    """Register a function(slide, data) as the renderer of a slide type."""
+    def register(render):
+        SLIDE_TYPES[name] = (render, background)
+        return render
+    return register
+
+
+@slide_type("title", background=DARK_BG)
+def render_title(slide, data):
+    """Opening slide: title, subtitle, organisation, summary and footer."""
+    add_rounded_rect(slide, Inches(0), Inches(0), Inches(10), Inches(0.06), ACCENT_BLUE)
+    add_textbox(slide, Inches(0.8), Inches(1.5), Inches(8.4), Inches(1.0),
+                data["title"], style="hero")
+    add_textbox(slide, Inches(1.0), Inches(3.0), Inches(8.0), Inches(0.6),
+                data.get("subtitle", ""), style="caption", size=22, color=LIGHT_GRAY)
+    add_rounded_rect(slide, Inches(3.5), Inches(3.9), Inches(3.0), Inches(0.04), ACCENT_BLUE)
+    add_textbox(slide, Inches(1.0), Inches(4.3), Inches(8.0), Inches(0.5),
+                data.get("org", ""), style="caption", size=18, color=ACCENT_BLUE)
+    add_textbox(slide, Inches(1.0), Inches(5.0), Inches(8.0), Inches(0.8),
+                data.get("summary", ""), style="caption")
+    add_textbox(slide, Inches(0.5), Inches(6.8), Inches(9.0), Inches(0.4),
+                data.get("footer", ""), style="caption", size=12)
+
+
+@slide_type("icon_list")
+def render_icon_list(slide, data):
+    """Short statements, each behind a small accent icon, then tips."""
+    add_slide_header(slide, data["title"], data.get("rule", 3.0), top=0.4)
+    for i, item in enumerate(data["items"]):
+        y = Inches(1.4) + Inches(i * 0.7)
+        add_rounded_rect(slide, Inches(0.8), y + Inches(0.05), Inches(0.25), Inches(0.25),
+                         ACCENT_BLUE)
+        add_textbox(slide, Inches(0.82), y + Inches(0.02), Inches(0.25), Inches(0.3),
+                    ">>", style="badge", size=10)
+        add_textbox(slide, Inches(1.2), y, Inches(8.0), Inches(0.5), item, style="item")
+    add_tips(slide, data.get("tips", []), 1.4 + len(data["items"]) * 0.7 + 0.25)
+
+
+@slide_type("numbered_list")
+def render_numbered_list(slide, data):
+    """Numbered items with a title and description each, then tips."""
+    add_slide_header(slide, data["title"], data.get("rule", 2.0), top=0.4)
+    for i, item in enumerate(data["items"]):
+        y = Inches(1.3) + Inches(i * 0.95)
+        add_badge(slide, Inches(0.8), y + Inches(0.05), Inches(0.45), str(i + 1),
+                  ACCENT_BLUE, 18)
+        add_textbox(slide, Inches(1.45), y, Inches(7.5), Inches(0.35),
+                    item["title"], style="step_title")
+        add_textbox(slide, Inches(1.45), y + Inches(0.35), Inches(7.5), Inches(0.4),
+                    item["text"], style="body")
+    add_tips(slide, data.get("tips", []), 1.3 + len(data["items"]) * 0.95 + 0.25)
+
+
+@slide_type("steps")
+def render_steps(slide, data):
+    """Step cards (with an optional intro line), then tips."""
+    add_slide_header(slide, data["title"], data.get("rule", 3.0))
+    start = 1.1
+    if data.get("intro"):
+        add_textbox(slide, Inches(0.6), Inches(1.1), Inches(8.8), Inches(0.6),
+                    data["intro"], style="item", size=15)
+        start = 1.6
+    for i, step in enumerate(data["steps"]):
+        add_step_card(slide, i + 1, step["title"], step["text"],
+                      Inches(start + i * 1.25))
+    last_card = start + (len(data["steps"]) - 1) * 1.25
+    add_tips(slide, data.get("tips", []), last_card + 1.1 + 0.25)
+
+
+@slide_type("checklist")
+def render_checklist(slide, data):
+    """Recommendations, each with a green check badge, title and description."""
+    add_slide_header(slide, data["title"], data.get("rule", 2.0))
+    for i, item in enumerate(data["items"]):
+        y = Inches(1.1) + Inches(i * 0.85)
+        add_badge(slide, Inches(0.8), y + Inches(0.05), Inches(0.4), "+", GREEN, 16)
+        add_textbox(slide, Inches(1.4), y, Inches(7.8), Inches(0.3),
+                    item["title"], style="step_title", size=16)
+        add_textbox(slide, Inches(1.4), y + Inches(0.32), Inches(7.8), Inches(0.4),
+                    item["text"], style="body")
+    add_tips(slide, data.get("tips", []), 1.1 + len(data["items"]) * 0.85 + 0.25)
+
+
+@slide_type("issues")
+def render_issues(slide, data):
+    """Problem / solution cards with a red marker."""
+    add_slide_header(slide, data["title"], data.get("rule", 2.0), rule_color=ACCENT_RED)
+    for i, item in enumerate(data["items"]):
+        y = Inches(1.15) + Inches(i * 1.25)
+        add_rounded_rect(slide, Inches(0.6), y, Inches(8.8), Inches(1.1), WHITE_CARD)
+        add_rounded_rect(slide, Inches(0.6), y, Inches(0.08), Inches(1.1), ACCENT_RED)
+        add_textbox(slide, Inches(0.9), y + Inches(0.08), Inches(8.3), Inches(0.35),
+                    item["title"], style="step_title", size=15, color=ACCENT_RED)
+        add_textbox(slide, Inches(0.9), y + Inches(0.45), Inches(8.3), Inches(0.6),
+                    item["text"], style="tip")
+    add_tips(slide, data.get("tips", []), 1.15 + len(data["items"]) * 1.25 + 0.1)
+
+
+@slide_type("closing", background=DARK_BG)
+def render_closing(slide, data):
+    """Closing slide: title, recap items, pointer to more docs and sign-off."""
+    add_rounded_rect(slide, Inches(0), Inches(0), Inches(10), Inches(0.06), ACCENT_BLUE)
+    add_textbox(slide, Inches(0.8), Inches(1.2), Inches(8.4), Inches(0.8),
+                data["title"], style="hero", size=34)
+    add_rounded_rect(slide, Inches(3.5), Inches(2.1), Inches(3.0), Inches(0.04), ACCENT_BLUE)
+    for i, item in enumerate(data.get("items", [])):
+        y = Inches(2.5) + Inches(i * 0.55)
+        add_textbox(slide, Inches(1.5), y, Inches(7.0), Inches(0.4),
+                    f"  {item}", style="caption", size=16, color=LIGHT_GRAY)
+    add_textbox(slide, Inches(0.8), Inches(5.0), Inches(8.4), Inches(0.8),
+                data.get("note", ""), style="caption", size=14)
+    add_textbox(slide, Inches(0.8), Inches(6.2), Inches(8.4), Inches(0.5),
+                data.get("org", ""), style="caption", size=16, bold=True, color=ACCENT_BLUE)
+    add_textbox(slide, Inches(0.8), Inches(6.7), Inches(8.4), Inches(0.4),
+                data.get("tagline", ""), style="caption", size=13)
+
+
+# ═════════════════════════════════════════════════════════════════════════
+# DECK SPECS
+# ═════════════════════════════════════════════════════════════════════════
+def _read_spec_file(path):
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML deck specs need PyYAML: pip install pyyaml") from None
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _substitute(value, variables):
+    """Fill ${name} placeholders in every string of a spec value."""
+    if isinstance(value, str):
+        return string.Template(value).safe_substitute(variables)
+    if isinstance(value, list):
+        return [_substitute(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: _substitute(item, variables) for key, item in value.items()}
+    return value
+
+
+def _resolve_extends(path):
+    """Read a spec, merged over the spec it extends (recursively)."""
+    spec = _read_spec_file(path)
+    if spec.get("extends"):
+        base = _resolve_extends(path.parent / spec["extends"])
+        variables = {**base.get("variables", {}), **spec.get("variables", {})}
+        spec = {**base, **spec, "variables": variables}
+    spec.pop("extends", None)
+    return spec
+
+
+def load_spec(path):
+    """
+    Load a deck spec, resolving ``extends`` and ``${variables}``.
+
+    A spec that extends another (path relative to the spec) replaces the
+    base's top-level keys with its own, except ``variables``, which are
+    merged, so a variant can change just the organisation name.
+
+    Raises:
+        ValueError: If a slide has an unknown type
+    """
+    path = Path(path)
+    spec = _resolve_extends(path)
+    for number, slide in enumerate(spec.get("slides", []), 1):
+        if slide.get("type") not in SLIDE_TYPES:
+            raise ValueError(f"{path}: slide {number} has unknown type {slide.get('type')!r} "
+                             f"(known: {', '.join(sorted(SLIDE_TYPES))})")
+
+    spec["slides"] = _substitute(spec.get("slides", []), spec.get("variables", {}))
+    spec.setdefault("output", f"{path.stem}.pptx")
+    return spec
+
+
+def _style_level(style):
+    """Text style level element (``a:lvlNpPr``) for a TextStyle."""
+    align = "ctr" if style.alignment == PP_ALIGN.CENTER else "l"
+    return parse_xml(
+        f'<a:lvl{style.level + 1}pPr {nsdecls("a")} marL="0" indent="0" algn="{align}">'
+        f'<a:buNone/>'
+        f'<a:defRPr sz="{style.size * 100}" b="{int(style.bold)}">'
+        f'<a:solidFill><a:srgbClr val="{style.color}"/></a:solidFill>'
+        f'<a:latin typeface="{STYLE_FONT}"/>'
+        f'</a:defRPr></a:lvl{style.level + 1}pPr>'
     )
-    badge.fill.solid()
-    badge.fill.fore_color.rgb = GREEN
-    badge.line.fill.background()
-    tf = badge.text_frame
-    p = tf.paragraphs[0]
-    p.text = "+"
-    p.font.size = Pt(16)
-    p.font.bold = True
-    p.font.color.rgb = WHITE
-    p.alignment = PP_ALIGN.CENTER
-
-    add_textbox(slide, Inches(1.4), y, Inches(7.8), Inches(0.3),
-                title, font_size=16, bold=True, color=DARK_TEXT)
-    add_textbox(slide, Inches(1.4), y + Inches(0.32), Inches(7.8), Inches(0.4),
-                desc, font_size=13, color=DARK_TEXT)
-
-# ─── SLIDE 9 – Troubleshooting ───────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, SOFT_BG)
-
-add_textbox(slide, Inches(0.6), Inches(0.3), Inches(8.8), Inches(0.6),
-            "Troubleshooting",
-            font_size=28, bold=True, color=DARK_TEXT)
-add_rounded_rect(slide, Inches(0.6), Inches(0.85), Inches(2.2), Inches(0.04), ACCENT_RED)
-
-issues = [
-    ("List doesn't appear on other devices",
-     "Verify iCloud Contacts sync is ON on all devices. Check that you're signed in with the same Apple ID. "
-     "Go to Settings > [Your Name] > iCloud > Show All > Contacts (toggle ON)."),
-    ("List shows under \"On My iPhone\" instead of iCloud",
-     "Set your default account to iCloud: Settings > Contacts > Default Account > iCloud. "
-     "Then recreate the list so it's stored in iCloud."),
-    ("Shortcut says \"No contacts found\"",
-     "Make sure the shortcut action references the correct list name (exact spelling). "
-     "Re-select the list in the shortcut's \"Get Contacts\" action."),
-    ("Contacts missing from the list",
-     "Open the list, tap \"Add Contact\", and re-add them. Contacts must be explicitly added "
-     "to the list - they don't appear automatically."),
-]
-for i, (problem, solution) in enumerate(issues):
-    y = Inches(1.15) + Inches(i * 1.25)
-    add_rounded_rect(slide, Inches(0.6), y, Inches(8.8), Inches(1.1), RGBColor(0xFF, 0xFF, 0xFF))
-    # Red indicator bar
-    add_rounded_rect(slide, Inches(0.6), y, Inches(0.08), Inches(1.1), ACCENT_RED)
-    add_textbox(slide, Inches(0.9), y + Inches(0.08), Inches(8.3), Inches(0.35),
-                problem, font_size=15, bold=True, color=ACCENT_RED)
-    add_textbox(slide, Inches(0.9), y + Inches(0.45), Inches(8.3), Inches(0.6),
-                solution, font_size=12, color=DARK_TEXT)
-
-# ─── SLIDE 10 – Summary / Closing ────────────────────────────────────────
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, DARK_BG)
-
-add_rounded_rect(slide, Inches(0), Inches(0), Inches(10), Inches(0.06), ACCENT_BLUE)
-
-add_textbox(slide, Inches(0.8), Inches(1.2), Inches(8.4), Inches(0.8),
-            "You're All Set!",
-            font_size=34, bold=True, color=WHITE, alignment=PP_ALIGN.CENTER)
-
-add_rounded_rect(slide, Inches(3.5), Inches(2.1), Inches(3.0), Inches(0.04), ACCENT_BLUE)
-
-summary_items = [
-    "Your emergency iCloud contact list is created and syncing",
-    "Your Good Trouble Shortcut is connected to the list",
-    "Adding or removing contacts updates the alert automatically",
-    "Test your setup periodically to make sure it works",
-]
-for i, item in enumerate(summary_items):
-    y = Inches(2.5) + Inches(i * 0.55)
-    add_textbox(slide, Inches(1.5), y, Inches(7.0), Inches(0.4),
-                f"  {item}", font_size=16, color=LIGHT_GRAY,
-                alignment=PP_ALIGN.CENTER)
-
-add_textbox(slide, Inches(0.8), Inches(5.0), Inches(8.4), Inches(0.8),
-            "For full setup instructions, see the ShortcutTutorial\n"
-            "and WorkflowTutorial guides in the doc/ios/ folder.",
-            font_size=14, color=MED_GRAY, alignment=PP_ALIGN.CENTER)
-
-add_textbox(slide, Inches(0.8), Inches(6.2), Inches(8.4), Inches(0.5),
-            "Good Trouble Safety Automation Toolkit",
-            font_size=16, bold=True, color=ACCENT_BLUE, alignment=PP_ALIGN.CENTER)
-
-add_textbox(slide, Inches(0.8), Inches(6.7), Inches(8.4), Inches(0.4),
-            "Stay safe. Stay informed. Know your rights.",
-            font_size=13, color=MED_GRAY, alignment=PP_ALIGN.CENTER)
+
+
+def install_text_styles(prs):
+    """
+    Store TEXT_STYLES as the levels of the deck's default text styles.
+
+    Text boxes take their defaults from the presentation's
+    defaultTextStyle or the master's otherStyle, depending on the
+    application, so both get the same levels.
+    """
+    targets = [
+        prs.part._element.find(qn("p:defaultTextStyle")),
+        prs.slide_master._element.find(qn("p:txStyles")).find(qn("p:otherStyle")),
+    ]
+    for target in targets:
+        for style in TEXT_STYLES.values():
+            tag = qn(f"a:lvl{style.level + 1}pPr")
+            old = target.find(tag)
+            new = _style_level(style)
+            if old is not None:
+                old.addprevious(new)
+                target.remove(old)
+            else:
+                target.append(new)
+
+
+@functools.lru_cache(maxsize=None)
+def template_bytes(width=10, height=7.5):
+    """Generate (once per size) the blank template holding the text styles."""
+    prs = Presentation()
+    prs.slide_width = Inches(width)
+    prs.slide_height = Inches(height)
+    install_text_styles(prs)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def build_deck(spec):
+    """Render a loaded deck spec and return the Presentation."""
+    prs = Presentation(io.BytesIO(template_bytes(spec.get("width", 10), spec.get("height", 7.5))))
+    blank_layout = prs.slide_layouts[6]  # blank
+
+    for data in spec["slides"]:
+        render, background = SLIDE_TYPES[data["type"]]
+        slide = prs.slides.add_slide(blank_layout)
+        set_slide_bg(slide, background)
+        render(slide, data)
+
+    return prs
+
 
 # ═════════════════════════════════════════════════════════════════════════
-# SAVE
+# INCREMENTAL BUILDS
 # ═════════════════════════════════════════════════════════════════════════
-output_path = (
-    "/Volumes/OWC STX NVMe/Develop/Source/GoodTrouble/"
-    "good-trouble-saftey-automation-tookit/doc/ios/"
-    "Emergency_iCloud_Contact_List_Guide.pptx"
-)
-prs.save(output_path)
-print(f"Saved: {output_path}")
+MANIFEST_VERSION = 1
+
+
+def deck_manifest_file(output):
+    """Manifest of slide hashes kept next to a rendered deck."""
+    output = Path(output)
+    return output.with_name(f"{output.stem}.manifest.json")
+
+
+def _digest(value):
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def slide_hash(data):
+    """Content hash of one slide of a loaded spec."""
+    return _digest(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _render_settings(spec):
+    """Everything besides slide content that changes how a slide renders."""
+    import pptx
+
+    return {
+        "renderer": _renderer_hash(),
+        "python-pptx": pptx.__version__,
+        "width": spec.get("width", 10),
+        "height": spec.get("height", 7.5),
+        "inline_styles": INLINE_STYLES,
+    }
+
+
+def deck_fingerprint(spec):
+    """
+    Hash of everything besides slide content that shapes the package.
+
+    Any change to this script, python-pptx, the slide size or the number
+    of slides forces a full rebuild.
+    """
+    return _digest({**_render_settings(spec), "slides": len(spec["slides"])})
+
+
+def _read_manifest(manifest_file, output):
+    """The previous build's manifest, or None if it cannot be used."""
+    if not output.exists() or not manifest_file.exists():
+        return None
+    try:
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(manifest_file, manifest):
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def _slide_parts(index):
+    """Package part names of the slide at index: (slide XML, its relationships)."""
+    return (f"ppt/slides/slide{index + 1}.xml",
+            f"ppt/slides/_rels/slide{index + 1}.xml.rels")
+
+
+def update_deck(output, spec, changed):
+    """
+    Rebuild only the slides at the indexes in changed, in place in output.
+
+    The changed slides are rendered on their own into a scratch deck, and
+    their parts replace the old ones. All other parts are copied from the
+    previous package byte for byte, keeping their zip entries.
+    """
+    buffer = io.BytesIO()
+    build_deck({**spec, "slides": [spec["slides"][i] for i in changed]}).save(buffer)
+    replaced = {}
+    with zipfile.ZipFile(buffer) as scratch:
+        for position, index in enumerate(changed):
+            for new_part, old_part in zip(_slide_parts(position), _slide_parts(index)):
+                replaced[old_part] = scratch.read(new_part)
+
+    tmp_file = output.with_name(f"{output.name}.tmp")
+    try:
+        with zipfile.ZipFile(output) as previous, zipfile.ZipFile(tmp_file, "w") as deck:
+            for info in previous.infolist():
+                data = replaced.pop(info.filename, None)
+                deck.writestr(info, data if data is not None else previous.read(info))
+        if replaced:
+            raise ValueError(f"Previous deck has no part {sorted(replaced)[0]}")
+        os.replace(tmp_file, output)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+
+# ═════════════════════════════════════════════════════════════════════════
+# EXPORTS
+# ═════════════════════════════════════════════════════════════════════════
+SOFFICE = os.environ.get("SOFFICE", "soffice")
+PDFTOPPM = os.environ.get("PDFTOPPM", "pdftoppm")
+EXPORT_FORMATS = ("pdf", "png")
+
+
+def _run_tool(command, timeout=300):
+    """Run a converter, raising RuntimeError with its stderr on failure."""
+    name = Path(command[0]).name
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"{name} not found: install LibreOffice (soffice) and poppler-utils (pdftoppm), "
+            f"or set SOFFICE / PDFTOPPM"
+        ) from None
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"{name} timed out after {timeout}s") from None
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed: {completed.stderr.strip() or completed.returncode}")
+
+
+def convert_to_pdf(deck_file, pdf_file):
+    """
+    Convert a .pptx to PDF with headless LibreOffice.
+
+    soffice will not start a second instance on a user profile that is in
+    use, so every conversion gets a throwaway profile of its own and
+    parallel workers never wait on (or break) each other.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        profile = Path(tmp) / "profile"
+        _run_tool([SOFFICE, f"-env:UserInstallation={profile.as_uri()}",
+                   "--headless", "--convert-to", "pdf", "--outdir", tmp, str(deck_file)])
+        shutil.move(str(Path(tmp) / f"{Path(deck_file).stem}.pdf"), str(pdf_file))
+
+
+def render_thumbnail(pdf_file, page, png_file, dpi=96):
+    """Render one PDF page (1-based) to a PNG with pdftoppm."""
+    _run_tool([PDFTOPPM, "-png", "-r", str(dpi), "-f", str(page), "-l", str(page),
+               "-singlefile", str(pdf_file), str(Path(png_file).with_suffix(""))])
+
+
+def export_deck(output, spec, hashes, formats, previous, export_dir=None, dpi=96, jobs=1):
+    """
+    Export a rendered deck to PDF and/or one PNG thumbnail per slide.
+
+    The PDF is keyed by every slide hash and each thumbnail by its own
+    slide's hash. Files whose key matches the previous export (and that
+    still exist) are kept; the rest are regenerated, the thumbnails over
+    ``jobs`` pdftoppm processes.
+
+    Args:
+        output: The rendered .pptx
+        spec: Its loaded spec
+        hashes: slide_hash() of each slide
+        formats: Any of EXPORT_FORMATS
+        previous: ``exports`` entry of the previous manifest
+        export_dir: Where to write (default: next to output)
+        dpi: Thumbnail resolution
+        jobs: Parallel thumbnail renders
+
+    Returns:
+        (``exports`` entry for the manifest, number of files written)
+    """
+    export_dir = Path(export_dir) if export_dir else output.parent
+    export_dir.mkdir(parents=True, exist_ok=True)
+    settings = _render_settings(spec)
+    pdf_key = _digest([settings, hashes])
+    png_keys = [_digest([settings, slide, dpi]) for slide in hashes]
+    pdf_file = export_dir / f"{output.stem}.pdf"
+    png_dir = export_dir / f"{output.stem}_slides"
+    png_files = [png_dir / f"slide{i + 1:02d}.png" for i in range(len(hashes))]
+
+    pdf_current = previous.get("pdf") == pdf_key and pdf_file.exists()
+    pdf_stale = "pdf" in formats and not pdf_current
+    old_keys = previous.get("png", [])
+    stale_pages = []
+    if "png" in formats:
+        stale_pages = [i for i, key in enumerate(png_keys)
+                       if i >= len(old_keys) or old_keys[i] != key or not png_files[i].exists()]
+
+    written = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        # Thumbnails come from the exported PDF when there is a current one
+        source = pdf_file if "pdf" in formats or pdf_current else Path(tmp) / "deck.pdf"
+        if pdf_stale or (stale_pages and not source.exists()):
+            convert_to_pdf(output, source)
+            if "pdf" in formats:
+                written += 1
+        if stale_pages:
+            from concurrent.futures import ThreadPoolExecutor
+
+            png_dir.mkdir(parents=True, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                list(pool.map(lambda i: render_thumbnail(source, i + 1, png_files[i], dpi),
+                              stale_pages))
+            written += len(stale_pages)
+
+    exports = dict(previous)
+    if "pdf" in formats:
+        exports["pdf"] = pdf_key
+    if "png" in formats:
+        exports["png"] = png_keys
+        for old in png_dir.glob("slide*.png"):
+            if old not in png_files:
+                old.unlink()
+    return exports, written
+
+
+def render_deck(spec_file, output_file=None, output_dir=OUTPUT_DIR, full=False,
+                export=(), export_dir=None, dpi=96, jobs=1):
+    """
+    Build the deck described by spec_file and save it.
+
+    When output already holds a deck built from this spec (per its
+    manifest), only the slides whose content changed are rebuilt, and
+    only stale exports are regenerated.
+
+    Args:
+        spec_file: JSON or YAML deck spec
+        output_file: Where to save (default: the spec's ``output`` in output_dir)
+        output_dir: Directory for decks saved under their spec's output name
+        full: Rebuild every slide (and export) even if the previous output is up to date
+        export: Formats to export the deck to (any of EXPORT_FORMATS)
+        export_dir: Directory for exports (default: next to the deck)
+        dpi: Resolution of PNG thumbnails
+        jobs: Parallel thumbnail renders
+
+    Returns:
+        Summary with spec, output, slides, rebuilt, exported, seconds and error keys
+    """
+    started = time.perf_counter()
+    result = {"spec": str(spec_file), "output": None, "slides": 0, "rebuilt": 0,
+              "exported": 0, "seconds": 0.0, "error": None}
+    try:
+        spec = load_spec(spec_file)
+        output = Path(output_file) if output_file else Path(output_dir) / spec["output"]
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        manifest_file = deck_manifest_file(output)
+        hashes = [slide_hash(data) for data in spec["slides"]]
+        fingerprint = deck_fingerprint(spec)
+        previous = None if full else _read_manifest(manifest_file, output)
+        if previous and previous.get("fingerprint") == fingerprint:
+            changed = [i for i, (old, new) in enumerate(zip(previous["slides"], hashes))
+                       if old != new]
+            if changed:
+                update_deck(output, spec, changed)
+        else:
+            changed = list(range(len(hashes)))
+            build_deck(spec).save(output)
+
+        # Recorded before exporting, so a failed export does not cost a full rebuild
+        manifest = {"version": MANIFEST_VERSION, "fingerprint": fingerprint, "slides": hashes}
+        exports = (previous or {}).get("exports")
+        _write_manifest(manifest_file, {**manifest, "exports": exports} if exports else manifest)
+        if export:
+            exports, result["exported"] = export_deck(output, spec, hashes, export,
+                                                      exports or {}, export_dir, dpi, jobs)
+            _write_manifest(manifest_file, {**manifest, "exports": exports})
+
+        result["output"] = str(output)
+        result["slides"] = len(spec["slides"])
+        result["rebuilt"] = len(changed)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def _render_job(job):
+    """Process pool entry point: render one (spec, output dir, options) job."""
+    spec_file, output_dir, options = job
+    return render_deck(spec_file, output_dir=output_dir, **options)
+
+
+def discover_specs(source):
+    """Deck specs in a directory (sorted), or the single spec file given."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(p for p in source.iterdir() if p.suffix in (".json", ".yaml", ".yml"))
+    return [source]
+
+
+def render_batch(spec_files, output_dir, jobs=1, **options):
+    """
+    Render many decks in one run.
+
+    Decks are split over ``jobs`` worker processes. Each worker imports
+    python-pptx once and renders many decks, instead of one interpreter
+    start per deck. Exports run inside the workers, each with its own
+    LibreOffice profile. options are passed on to render_deck(). Results
+    keep the order of spec_files.
+    """
+    work = [(str(spec), str(output_dir), options) for spec in spec_files]
+    if jobs <= 1 or len(work) <= 1:
+        return [_render_job(job) for job in work]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+        return list(pool.map(_render_job, work))
+
+
+# ═════════════════════════════════════════════════════════════════════════
+# CLI
+# ═════════════════════════════════════════════════════════════════════════
+def _add_export_arguments(parser):
+    parser.add_argument("--export", nargs="+", choices=EXPORT_FORMATS, default=[],
+                        help="Also export to PDF and/or per-slide PNG thumbnails "
+                             "(needs soffice and pdftoppm)")
+    parser.add_argument("--export-dir", default=None,
+                        help="Directory for exports. Default: next to each deck")
+    parser.add_argument("--dpi", type=int, default=96,
+                        help="PNG thumbnail resolution. Default: 96")
+
+
+def _summary(result):
+    summary = f"{result['rebuilt']}/{result['slides']} slides rebuilt"
+    if result["exported"]:
+        summary += f", {result['exported']} files exported"
+    return summary
+
+
+def _batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="create_contacts_pptx.py batch",
+        description="Render every deck spec in a directory (or the given specs) in one run",
+    )
+    parser.add_argument("specs", nargs="+", help="Deck spec files or directories of specs")
+    parser.add_argument("output", help="Directory for the rendered decks")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes. Default: number of CPUs")
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild every slide, even of decks that are up to date")
+    _add_export_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec_files = [spec for source in args.specs for spec in discover_specs(source)]
+    if not spec_files:
+        print("No deck specs found")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = render_batch(spec_files, args.output, jobs=args.jobs, full=args.full,
+                           export=args.export, export_dir=args.export_dir, dpi=args.dpi)
+    for result in results:
+        if result["error"]:
+            print(f"FAILED {result['spec']}: {result['error']}")
+        else:
+            print(f"Saved: {result['output']} ({_summary(result)}, {result['seconds']:.2f}s)")
+
+    failed = sum(1 for result in results if result["error"])
+    print(f"{len(results) - failed}/{len(results)} decks rendered in "
+          f"{time.perf_counter() - started:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "batch":
+        _batch_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Render a slide deck spec to PowerPoint",
+        epilog="Render many decks at once with: create_contacts_pptx.py batch SPECS... OUTPUT",
+    )
+    parser.add_argument("spec", nargs="?", default=str(DEFAULT_SPEC),
+                        help="Deck spec (JSON or YAML). "
+                             "Default: decks/emergency_icloud_contacts.json")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output .pptx file. Default: doc/ios/<the spec's output name>")
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild every slide instead of only those that changed")
+    _add_export_arguments(parser)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Parallel thumbnail renders. Default: number of CPUs")
+    args = parser.parse_args(argv)
+
+    result = render_deck(args.spec, output_file=args.output, full=args.full,
+                         export=args.export, export_dir=args.export_dir, dpi=args.dpi,
+                         jobs=args.jobs)
+    if result["error"]:
+        print(f"Error: {result['error']}")
+        sys.exit(1)
+    print(f"Saved: {result['output']} ({_summary(result)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,14 +28,10 @@ pip install -q -r requirements.txt
 echo "✅ Dependencies ready"
 echo ""
 
-# Generate English audio
-echo "🔊 Generating English audio files..."
-python tts/text_to_speech.py scripts/legal_rights_en.txt output/ --engine gtts --no-combine
-echo ""
-
-# Generate Spanish audio
-echo "🔊 Generating Spanish audio files..."
-python tts/text_to_speech.py scripts/legal_rights_es.txt output/ --engine gtts --lang es --no-combine
+# Generate English and Spanish audio in one process
+# (language is inferred from the _en / _es script suffix)
+echo "🔊 Generating English and Spanish audio files..."
+python tts/text_to_speech.py batch scripts/ output/ --engine gtts --no-combine --jobs 2
 echo ""
 
 # List generated files
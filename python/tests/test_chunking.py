@@ -0,0 +1,55 @@
+"""
+Tests for chunk_segments(): splitting and packing script lines into requests.
+
+Usage:
+    python -m pytest tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tts'))
+
+from text_to_speech import chunk_segments  # noqa: E402
+
+
+class ChunkSegmentsTests(unittest.TestCase):
+
+    def assertRoundTrip(self, text, lang, max_chars):
+        """Chunks rejoined with spaces give back the original text, closers included."""
+        chunks = chunk_segments([text], lang=lang, max_chars=max_chars)
+        self.assertEqual(' '.join(chunks), text)
+        return chunks
+
+    def test_closing_quote_stays_with_sentence(self):
+        text = 'The officer said "Stop right there." Then keep your hands where they can see them.'
+        chunks = self.assertRoundTrip(text, 'en', 40)
+        self.assertEqual(chunks[0], 'The officer said "Stop right there."')
+
+    def test_closing_bracket_stays_with_sentence(self):
+        text = 'Do not run. (Stay calm.) Ask if you are free to leave, then walk away slowly.'
+        chunks = self.assertRoundTrip(text, 'en', 30)
+        self.assertIn('(Stay calm.)', chunks[0] + ' ' + chunks[1])
+
+    def test_quote_after_bracket(self):
+        text = 'He told me ("Wait here.") and left. I stayed where I was until he came back.'
+        self.assertRoundTrip(text, 'en', 40)
+
+    def test_guillemets_stay_with_sentence_es(self):
+        text = 'El agente dijo «No se mueva.» Mantenga las manos visibles en todo momento.'
+        chunks = self.assertRoundTrip(text, 'es', 40)
+        self.assertEqual(chunks[0], 'El agente dijo «No se mueva.»')
+
+    def test_inverted_marks_open_a_sentence_es(self):
+        text = 'Tiene derecho a guardar silencio. ¿Estoy detenido? ¡No firme nada sin un abogado!'
+        chunks = self.assertRoundTrip(text, 'es', 40)
+        self.assertTrue(all(not chunk.endswith(('¿', '¡')) for chunk in chunks))
+
+    def test_short_lines_are_packed(self):
+        self.assertEqual(chunk_segments(['One.', 'Two.', 'Three.'], max_chars=100),
+                         ['One. Two. Three.'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the cue index written next to combined audio.
+
+Usage:
+    python -m pytest tests
+"""
+
+import contextlib
+import io
+import json
+import struct
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tts'))
+
+from text_to_speech import wav_seek_offsets, write_cue_index  # noqa: E402
+
+
+def write_wav(path: Path, seconds: float, frame_rate: int = 8000, channels: int = 2):
+    """Write a silent 16-bit PCM WAV file."""
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(bytes(int(seconds * frame_rate) * channels * 2))
+
+
+class WavSeekOffsetsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_offsets_are_sample_frame_aligned(self):
+        path = self.dir / 'a.wav'
+        write_wav(path, 2.0)
+        # 44-byte header, 4-byte stereo sample frames, 8 frames per millisecond
+        self.assertEqual(wav_seek_offsets(path, [0, 1000, 1000.1, 1999.99]),
+                         [44, 44 + 8000 * 4, 44 + 8000 * 4, 44 + 15999 * 4])
+
+    def test_clamped_to_end_of_data(self):
+        path = self.dir / 'a.wav'
+        write_wav(path, 1.0)
+        self.assertEqual(wav_seek_offsets(path, [5000]), [44 + 8000 * 4])
+
+    def test_skips_odd_sized_chunks(self):
+        path = self.dir / 'a.wav'
+        write_wav(path, 1.0, channels=1)
+        data = path.read_bytes()
+        extra = b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+        data = data[:12] + extra + data[12:]
+        path.write_bytes(data[:4] + struct.pack('<I', len(data) - 8) + data[8:])
+        self.assertEqual(wav_seek_offsets(path, [0, 500]), [44 + 12, 44 + 12 + 4000 * 2])
+
+    def test_not_a_wav_file(self):
+        path = self.dir / 'a.wav'
+        path.write_bytes(b'not audio at all')
+        self.assertEqual(wav_seek_offsets(path, [0]), [None])
+
+    def test_index_has_wav_byte_offsets(self):
+        path = self.dir / 'programme.wav'
+        write_wav(path, 3.0, channels=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            index_file, _ = write_cue_index(path, [(0, 1000), (2000, 1000)],
+                                            [(1, 'One.'), (2, 'Two.')])
+        segments = json.loads(index_file.read_text(encoding='utf-8'))['segments']
+        self.assertEqual([s['byte_offset'] for s in segments], [44, 44 + 16000 * 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
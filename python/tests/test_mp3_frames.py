@@ -0,0 +1,126 @@
+"""
+Tests for mp3_frames: frame parsing, tag skipping, seeking and joining.
+
+Frames are built by hand from their 4-byte headers, so no encoder or
+sample files are needed.
+
+Usage:
+    python -m pytest tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tts'))
+
+from mp3_frames import (  # noqa: E402
+    Mp3FormatError, join_mp3_data, parse_header, read_frames, seek_offsets
+)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo (1152 samples, ~26.1 ms)
+MPEG1 = bytes([0xFF, 0xFB, 0x90, 0x04])
+MPEG1_PADDED = bytes([0xFF, 0xFB, 0x92, 0x04])
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono (576 samples, 24 ms)
+MPEG2 = bytes([0xFF, 0xF3, 0x44, 0xC4])
+MPEG2_PADDED = bytes([0xFF, 0xF3, 0x46, 0xC4])
+
+
+def frame(header: bytes, fill: int = 0) -> bytes:
+    """A whole frame: the header followed by payload bytes up to the frame length."""
+    return header + bytes([fill]) * (parse_header(header).length - 4)
+
+
+def id3v2(payload: bytes) -> bytes:
+    """An ID3v2.4 tag wrapping payload (size as a syncsafe integer)."""
+    size = len(payload)
+    syncsafe = bytes([(size >> shift) & 0x7F for shift in (21, 14, 7, 0)])
+    return b'ID3\x04\x00\x00' + syncsafe + payload
+
+
+class FrameHeaderTests(unittest.TestCase):
+
+    def test_mpeg1_layer3_length(self):
+        self.assertEqual(parse_header(MPEG1).length, 417)
+        self.assertEqual(parse_header(MPEG1_PADDED).length, 418)
+        self.assertEqual(parse_header(MPEG1).samples, 1152)
+
+    def test_mpeg2_layer3_length(self):
+        self.assertEqual(parse_header(MPEG2).length, 96)
+        self.assertEqual(parse_header(MPEG2_PADDED).length, 97)
+        self.assertEqual(parse_header(MPEG2).samples, 576)
+
+    def test_invalid_headers(self):
+        self.assertIsNone(parse_header(b'\xff\xfb\x90'))        # truncated
+        self.assertIsNone(parse_header(b'\xff\xfb\xf0\x04'))    # bitrate index 15
+        self.assertIsNone(parse_header(b'\xff\xfb\x9c\x04'))    # sample rate index 3
+        self.assertIsNone(parse_header(b'\xff\xeb\x90\x04'))    # reserved version
+
+
+class ReadFramesTests(unittest.TestCase):
+
+    def test_padded_and_unpadded_frames(self):
+        data = frame(MPEG1) + frame(MPEG1_PADDED) + frame(MPEG1)
+        lengths = [len(raw) for _, raw in read_frames(data)]
+        self.assertEqual(lengths, [417, 418, 417])
+
+    def test_skips_id3v2(self):
+        # The tag body holds bytes that look like a frame header
+        data = id3v2(frame(MPEG2)[:40]) + frame(MPEG2) * 3
+        frames = read_frames(data)
+        self.assertEqual(len(frames), 3)
+        self.assertTrue(all(raw == frame(MPEG2) for _, raw in frames))
+
+    def test_skips_id3v1(self):
+        data = frame(MPEG2) * 2 + b'TAG' + bytes(125)
+        self.assertEqual([raw for _, raw in read_frames(data)], [frame(MPEG2)] * 2)
+
+    def test_skips_xing_frame(self):
+        xing = bytearray(frame(MPEG2))
+        xing[13:17] = b'Xing'
+        data = bytes(xing) + frame(MPEG2, fill=1) * 2
+        self.assertEqual([raw for _, raw in read_frames(data)], [frame(MPEG2, fill=1)] * 2)
+
+
+class SeekOffsetsTests(unittest.TestCase):
+
+    def test_frame_boundaries(self):
+        data = frame(MPEG2) * 5  # 24 ms frames of 96 bytes
+        self.assertEqual(seek_offsets(data, [0, 23.9, 24, 47.9, 48, 1000]),
+                         [0, 0, 96, 96, 192, 384])
+
+    def test_offsets_after_id3v2(self):
+        tag = id3v2(bytes(20))
+        data = tag + frame(MPEG2) * 3
+        self.assertEqual(seek_offsets(data, [0, 24]), [len(tag), len(tag) + 96])
+
+    def test_no_frames(self):
+        self.assertEqual(seek_offsets(b'not audio', [0, 10]), [None, None])
+
+
+class JoinTests(unittest.TestCase):
+
+    def test_pause_and_timeline(self):
+        timeline = []
+        joined = join_mp3_data([frame(MPEG2, 1) * 3, frame(MPEG2, 2) * 2], pause_duration=240,
+                               timeline=timeline)
+        frames = [raw for _, raw in read_frames(joined)]
+        self.assertEqual(len(frames), 3 + 10 + 2)
+        self.assertEqual(frames[3:13], [frame(MPEG2)] * 10)
+        self.assertEqual(timeline, [(0.0, 72.0), (312.0, 48.0)])
+
+    def test_mismatched_parameters(self):
+        with self.assertRaises(Mp3FormatError):
+            join_mp3_data([frame(MPEG2) * 2, frame(MPEG1) * 2])
+
+    def test_padding_does_not_mismatch(self):
+        joined = join_mp3_data([frame(MPEG1), frame(MPEG1_PADDED)], pause_duration=0)
+        self.assertEqual(joined, frame(MPEG1) + frame(MPEG1_PADDED))
+
+    def test_segment_without_frames(self):
+        with self.assertRaises(Mp3FormatError):
+            join_mp3_data([frame(MPEG2), b'not audio'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+Vectorized segment post-processing: silence trimming and loudness levelling.
+
+gTTS segments carry their own leading and trailing silence, which stacks
+with the pause inserted between segments, and their loudness varies from
+line to line. ``SegmentPostProcessor`` fixes both on the raw PCM of each
+decoded segment before it is combined. Every step is a NumPy operation on
+the whole sample array (windowed RMS via a reshape, one gain multiply),
+so the cost stays linear and small even for long programmes.
+
+Loudness is measured as gated RMS in dBFS: only windows above the
+silence threshold count, so pauses inside a line do not drag the level
+down. A peak ceiling keeps the gain from clipping.
+
+NumPy is imported on first use, so this module can be imported (and the
+CLI started) without it.
+"""
+
+from typing import Dict, Optional
+
+_EPSILON = 1e-12
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Silence trimming and loudness normalization need numpy: pip install numpy"
+        ) from None
+    return numpy
+
+
+def pcm_to_array(data: bytes, channels: int, sample_width: int):
+    """
+    Convert interleaved PCM to a float32 array of shape (frames, channels).
+
+    Samples are scaled to [-1.0, 1.0). 8-bit PCM is unsigned; 16, 24 and
+    32-bit PCM are signed little-endian.
+    """
+    np = _require_numpy()
+
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    elif sample_width == 4:
+        samples = (np.frombuffer(data, dtype='<i4').astype(np.float64) / 2147483648
+                   ).astype(np.float32)
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    return samples.reshape(-1, channels)
+
+
+def array_to_pcm(samples, sample_width: int) -> bytes:
+    """Convert a float array from pcm_to_array() back to interleaved PCM."""
+    np = _require_numpy()
+
+    flat = np.clip(samples.reshape(-1), -1.0, 1.0)
+    if sample_width == 1:
+        return np.clip(np.rint(flat * 128 + 128), 0, 255).astype(np.uint8).tobytes()
+    if sample_width == 2:
+        return np.clip(np.rint(flat * 32768), -32768, 32767).astype('<i2').tobytes()
+    if sample_width == 3:
+        values = np.clip(np.rint(flat * 8388608), -8388608, 8388607).astype('<i4')
+        return values.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    if sample_width == 4:
+        values = np.clip(np.rint(flat.astype(np.float64) * 2147483648),
+                         -2147483648, 2147483647)
+        return values.astype('<i4').tobytes()
+    raise ValueError(f"Unsupported sample width: {sample_width}")
+
+
+def window_levels(samples, frame_rate: int, window_ms: int = 10):
+    """
+    Return the RMS level in dBFS of each window_ms window, and the window length.
+
+    The array is zero-padded to whole windows and reshaped to
+    (windows, frames per window, channels), so every level comes from a
+    single mean over the last two axes.
+    """
+    np = _require_numpy()
+
+    window = max(1, frame_rate * window_ms // 1000)
+    frames, channels = samples.shape
+    count = -(-frames // window)
+    padded = np.zeros((count * window, channels), dtype=np.float32)
+    padded[:frames] = samples
+    energy = np.square(padded.reshape(count, window, channels)).mean(axis=(1, 2))
+    return 10 * np.log10(energy + _EPSILON), window
+
+
+def trim_silence(samples, frame_rate: int, threshold_db: float = -45.0,
+                 keep_ms: int = 40, window_ms: int = 10):
+    """
+    Cut leading and trailing audio quieter than threshold_db.
+
+    keep_ms of audio is left on each side of the first and last loud
+    window so word onsets and decays are not clipped. A segment with no
+    loud window is returned unchanged.
+    """
+    np = _require_numpy()
+
+    levels, window = window_levels(samples, frame_rate, window_ms)
+    loud = np.flatnonzero(levels > threshold_db)
+    if loud.size == 0:
+        return samples
+
+    keep = frame_rate * keep_ms // 1000
+    start = max(0, int(loud[0]) * window - keep)
+    end = min(len(samples), (int(loud[-1]) + 1) * window + keep)
+    return samples[start:end]
+
+
+def loudness(samples, frame_rate: int, gate_db: float = -45.0,
+             window_ms: int = 10) -> Optional[float]:
+    """Return the gated RMS level in dBFS (None if nothing is above the gate)."""
+    np = _require_numpy()
+
+    levels, _ = window_levels(samples, frame_rate, window_ms)
+    active = levels[levels > gate_db]
+    if active.size == 0:
+        return None
+    return float(10 * np.log10(np.mean(np.power(10.0, active / 10))))
+
+
+def normalize_loudness(samples, frame_rate: int, target_db: float = -20.0,
+                       gate_db: float = -45.0, ceiling_db: float = -1.0):
+    """
+    Scale samples so their gated RMS level is target_db.
+
+    The gain is reduced when needed so no sample peaks above ceiling_db.
+    Silent segments are returned unchanged.
+    """
+    np = _require_numpy()
+
+    level = loudness(samples, frame_rate, gate_db)
+    if level is None:
+        return samples
+
+    gain = 10 ** ((target_db - level) / 20)
+    peak = float(np.max(np.abs(samples))) if samples.size else 0.0
+    if peak > 0:
+        gain = min(gain, 10 ** (ceiling_db / 20) / peak)
+    return samples * np.float32(gain)
+
+
+class SegmentPostProcessor:
+    """
+    Trim silence from and level the loudness of raw PCM segments.
+
+    Instances are called with the raw PCM of one decoded segment and
+    return the processed PCM in the same format. Totals of the trimmed
+    audio are kept for reporting.
+
+    Args:
+        trim_db: Trim leading/trailing audio below this level (None = no trimming)
+        target_db: Normalize each segment to this gated RMS level (None = no levelling)
+        keep_ms: Audio kept either side of the trimmed speech
+        ceiling_db: Peak ceiling applied when normalizing
+    """
+
+    def __init__(self, trim_db: Optional[float] = -45.0, target_db: Optional[float] = -20.0,
+                 keep_ms: int = 40, ceiling_db: float = -1.0):
+        _require_numpy()
+        self.trim_db = trim_db
+        self.target_db = target_db
+        self.keep_ms = keep_ms
+        self.ceiling_db = ceiling_db
+        self.trimmed_ms = 0.0
+
+    def settings(self) -> Dict:
+        """Settings that change the output, for build manifests."""
+        return {'trim_db': self.trim_db, 'target_db': self.target_db,
+                'keep_ms': self.keep_ms, 'ceiling_db': self.ceiling_db}
+
+    def copy(self) -> 'SegmentPostProcessor':
+        """Return a processor with the same settings and fresh totals."""
+        return SegmentPostProcessor(**self.settings())
+
+    def describe(self) -> str:
+        """Short human-readable summary of the enabled steps."""
+        steps = []
+        if self.trim_db is not None:
+            steps.append(f"trim silence below {self.trim_db:g} dBFS")
+        if self.target_db is not None:
+            steps.append(f"normalize to {self.target_db:g} dBFS")
+        return ', '.join(steps) or 'no processing'
+
+    def __call__(self, data: bytes, frame_rate: int, channels: int, sample_width: int) -> bytes:
+        samples = pcm_to_array(data, channels, sample_width)
+        frames = len(samples)
+
+        if self.trim_db is not None:
+            samples = trim_silence(samples, frame_rate, self.trim_db, self.keep_ms)
+            self.trimmed_ms += (frames - len(samples)) * 1000 / frame_rate
+        if self.target_db is not None:
+            gate_db = self.trim_db if self.trim_db is not None else -45.0
+            samples = normalize_loudness(samples, frame_rate, self.target_db, gate_db,
+                                         self.ceiling_db)
+
+        return array_to_pcm(samples, sample_width)
+
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Frame-level MP3 joining for the Safety Automation Toolkit
+
+MP3 files are sequences of self-contained MPEG audio frames. Segments that
+share the same stream parameters can be joined by copying their frames
+back to back, with no decoding or re-encoding, so there is no generation
+loss and almost no CPU cost.
+
+Pauses are made of "silent" frames: a valid frame header followed by
+zeroed side information and payload, which every decoder plays back as
+silence.
+
+Usage:
+    from mp3_frames import join_mp3_data
+    joined = join_mp3_data([Path('a.mp3').read_bytes(), Path('b.mp3').read_bytes()],
+                           pause_duration=1000)
+"""
+
+import bisect
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Bitrates in kbps, indexed by [version is MPEG-1][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    False: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates in Hz, indexed by version id bits then sample rate index
+_SAMPLE_RATES = {
+    0b11: [44100, 48000, 32000],  # MPEG-1
+    0b10: [22050, 24000, 16000],  # MPEG-2
+    0b00: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+
+class Mp3FormatError(ValueError):
+    """Raised when data cannot be joined at the frame level."""
+
+
+class FrameHeader(NamedTuple):
+    """Decoded fields of a 4-byte MPEG audio frame header."""
+
+    raw: bytes
+    version_id: int
+    layer: int
+    bitrate: int
+    sample_rate: int
+    padding: int
+    channel_mode: int
+
+    @property
+    def mpeg1(self) -> bool:
+        return self.version_id == 0b11
+
+    @property
+    def samples(self) -> int:
+        """PCM samples per channel carried by one frame."""
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and not self.mpeg1:
+            return 576
+        return 1152
+
+    @property
+    def length(self) -> int:
+        """Frame length in bytes, header included."""
+        if self.layer == 1:
+            return (12 * self.bitrate * 1000 // self.sample_rate + self.padding) * 4
+        return self.samples // 8 * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def stream_params(self) -> Tuple[int, int, int, int, int]:
+        """Parameters that must match for frames to be joined."""
+        return (self.version_id, self.layer, self.sample_rate, self.bitrate,
+                self.channel_mode)
+
+
+def parse_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """
+    Decode the frame header at offset.
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid header
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_id = (b1 >> 3) & 0b11
+    layer = _LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0b11
+    if version_id == 0b01 or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    return FrameHeader(
+        raw=bytes(data[offset:offset + 4]),
+        version_id=version_id,
+        layer=layer,
+        bitrate=_BITRATES[version_id == 0b11][layer][bitrate_index],
+        sample_rate=_SAMPLE_RATES[version_id][rate_index],
+        padding=(b2 >> 1) & 1,
+        channel_mode=b3 >> 6,
+    )
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Return the offset just past a leading ID3v2 tag (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """True if the frame holds a Xing/Info/VBRI tag instead of audio."""
+    frame = data[offset:offset + header.length]
+    return any(tag in frame[:64] for tag in (b'Xing', b'Info', b'VBRI'))
+
+
+def _audio_frames(data: bytes) -> Iterator[Tuple[int, FrameHeader]]:
+    """Yield (byte offset, header) for each audio frame, skipping tags and info frames."""
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+
+    offset = _skip_id3v2(data)
+    first = True
+    while offset < end:
+        header = parse_header(data, offset)
+        if header is None or offset + header.length > end:
+            # Resynchronise on the next plausible header
+            offset = data.find(b'\xff', offset + 1, end)
+            if offset < 0:
+                break
+            continue
+
+        if not (first and _is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset += header.length
+
+
+def read_frames(data: bytes) -> List[Tuple[FrameHeader, bytes]]:
+    """
+    Split MP3 data into audio frames.
+
+    Leading ID3v2 tags, trailing ID3v1 tags and Xing/Info/VBRI header
+    frames are dropped, since they describe a single file and would be
+    wrong once files are joined.
+
+    Returns:
+        List of (header, frame bytes) tuples
+    """
+    return [(header, data[offset:offset + header.length])
+            for offset, header in _audio_frames(data)]
+
+
+def seek_offsets(data: bytes, times_ms: List[float]) -> List[Optional[int]]:
+    """
+    Find the byte offset a player can start decoding from for each time.
+
+    Each offset is that of the last audio frame starting at or before the
+    time, so playback from it begins slightly early (by up to one frame,
+    plus the decoder's start-up delay) and never cuts into the segment.
+
+    Args:
+        data: MP3 data
+        times_ms: Positions in milliseconds
+
+    Returns:
+        Byte offset for each time (None if the data has no audio frames)
+    """
+    starts = []
+    offsets = []
+    position = 0.0
+    for offset, header in _audio_frames(data):
+        starts.append(position)
+        offsets.append(offset)
+        position += header.samples * 1000 / header.sample_rate
+
+    if not offsets:
+        return [None] * len(times_ms)
+    return [offsets[max(0, bisect.bisect_right(starts, t) - 1)] for t in times_ms]
+
+
+def silent_frame(header: FrameHeader) -> bytes:
+    """
+    Build one silent frame matching header's stream parameters.
+
+    The padding bit is cleared and CRC protection disabled; zeroed side
+    information declares no audio data, which decodes to silence.
+    """
+    raw = bytearray(header.raw)
+    raw[1] |= 0x01          # protection bit set = no CRC
+    raw[2] &= ~0x02 & 0xFF  # no padding
+    unpadded = header._replace(raw=bytes(raw), padding=0)
+    return bytes(raw) + b'\x00' * (unpadded.length - 4)
+
+
+def join_mp3_data(segments: List[bytes], pause_duration: int = 1000,
+                  timeline: Optional[List[Tuple[float, float]]] = None) -> bytes:
+    """
+    Join MP3 data frame by frame, inserting silent frames between segments.
+
+    Args:
+        segments: Raw MP3 data of each segment
+        pause_duration: Pause between segments in milliseconds
+        timeline: If given, (start ms, duration ms) of each segment in the
+            joined audio is appended to it
+
+    Returns:
+        The joined MP3 data
+
+    Raises:
+        Mp3FormatError: If a segment has no frames or the segments do not
+            share sample rate, bitrate, MPEG version, layer and channel mode
+    """
+    parts = []
+    reference = None
+    pause = b''
+    pause_ms = 0.0
+    position = 0.0
+
+    for i, data in enumerate(segments):
+        frames = read_frames(data)
+        if not frames:
+            raise Mp3FormatError(f"segment {i + 1} contains no MPEG audio frames")
+
+        for header, _ in frames:
+            if reference is None:
+                reference = header
+                frame = silent_frame(header)
+                count = round(pause_duration * header.sample_rate / 1000 / header.samples)
+                pause = frame * count
+                pause_ms = count * header.samples * 1000 / header.sample_rate
+            elif header.stream_params != reference.stream_params:
+                raise Mp3FormatError(
+                    f"segment {i + 1} does not match the stream parameters of segment 1"
+                )
+
+        parts.extend(frame for _, frame in frames)
+        duration = len(frames) * reference.samples * 1000 / reference.sample_rate
+        if timeline is not None:
+            timeline.append((position, duration))
+        position += duration
+
+        # Add pause between segments (but not after the last one)
+        if i < len(segments) - 1:
+            parts.append(pause)
+            position += pause_ms
+
+    return b''.join(parts)
+
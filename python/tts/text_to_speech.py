@@ -9,35 +9,123 @@ Supports multiple TTS engines:
 Usage:
     python text_to_speech.py input.txt output.mp3 --engine gtts
     python text_to_speech.py input.txt output.mp3 --engine pyttsx3
+    python text_to_speech.py batch scripts/ output/ --jobs 4
 """
 
 import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
 import os
+import re
+import shutil
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Union
 
+if TYPE_CHECKING:
+    from audio_postprocess import SegmentPostProcessor
 
-def check_dependencies():
-    """Check if required dependencies are installed."""
-    missing = []
 
-    try:
-        import pyttsx3
-    except ImportError:
-        missing.append("pyttsx3")
+def check_dependencies(engines: Optional[List[str]] = None):
+    """
+    Check if the dependencies of the selected engines are installed.
 
-    try:
-        from gtts import gTTS
-    except ImportError:
-        missing.append("gTTS")
+    Modules are located with importlib spec lookups rather than imported,
+    so checking is cheap and does not load speech drivers or HTTP stacks.
+    Programs (for engines driving a local binary) are looked up on PATH.
+
+    Args:
+        engines: Engines that will be used (default: gtts and pyttsx3)
+    """
+    missing = []
+    programs = []
+
+    for engine in engines or ['gtts', 'pyttsx3']:
+        engine_class = ENGINES.get(engine)
+        if engine_class is None:
+            continue
+        for module, package in engine_class.dependencies.items():
+            if importlib.util.find_spec(module) is None and package not in missing:
+                missing.append(package)
+        for program in engine_class.programs:
+            if shutil.which(program) is None and program not in programs:
+                programs.append(program)
 
     if missing:
         print(f"⚠️  Missing dependencies: {', '.join(missing)}")
         print(f"Install with: pip install {' '.join(missing)}")
-        return False
+    if programs:
+        print(f"⚠️  Missing programs: {', '.join(programs)}")
+        print("Install them and make sure they are on your PATH")
+
+    return not missing and not programs
+
 
-    return True
+class Metrics:
+    """
+    Structured timing and counters for the TTS pipeline.
+
+    Each ``stage()`` records wall time, CPU time and any fields the caller
+    adds (bytes produced, retries, cache hits...). Events are kept in
+    ``events`` and, when a metrics file is given, appended to it as JSON
+    lines for build dashboards.
+
+    Args:
+        metrics_file: JSON lines file to append events to (None = memory only)
+        context: Fields added to every event (e.g. the script name)
+    """
+
+    def __init__(self, metrics_file: Optional[str] = None, **context):
+        self.metrics_file = metrics_file
+        self.context = context
+        self.events: List[Dict] = []
+        self.lock = threading.Lock()
+
+    def bind(self, **context) -> 'Metrics':
+        """Return a view of these metrics that adds context to every event."""
+        bound = Metrics.__new__(Metrics)
+        bound.metrics_file = self.metrics_file
+        bound.context = {**self.context, **context}
+        bound.events = self.events
+        bound.lock = self.lock
+        return bound
+
+    def emit(self, event: str, **fields):
+        """Record one event."""
+        record = {'event': event, 'ts': round(time.time(), 3), **self.context, **fields}
+        with self.lock:
+            self.events.append(record)
+            if self.metrics_file:
+                with open(self.metrics_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    @contextlib.contextmanager
+    def stage(self, name: str, per_thread: bool = False, **fields):
+        """
+        Time a pipeline stage.
+
+        Yields a dict the caller can add fields to. CPU time is the
+        calling thread's when per_thread is set (for work on pool threads),
+        otherwise the whole process's.
+        """
+        cpu_clock = time.thread_time if per_thread else time.process_time
+        record = dict(fields)
+        wall_started = time.perf_counter()
+        cpu_started = cpu_clock()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = str(e) or type(e).__name__
+            raise
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall_started, 6)
+            record['cpu_s'] = round(cpu_clock() - cpu_started, 6)
+            self.emit('stage', stage=name, **record)
 
 
 def read_script(script_file: str) -> List[str]:
@@ -67,7 +155,174 @@ def read_script(script_file: str) -> List[str]:
     return segments
 
 
-def generate_tts_pyttsx3(text: str, output_file: str, rate: int = 150, volume: float = 1.0):
+# Languages written without spaces between words or sentences
+_UNSPACED_LANGS = ('zh', 'ja')
+
+
+def _boundary_patterns(lang: str) -> List[str]:
+    """Return split patterns from strongest (sentence) to weakest (word) boundary."""
+    base = lang.split('-')[0].lower()
+    if base in _UNSPACED_LANGS:
+        return [r'(?<=[。！？!?])\s*', r'(?<=[，、；：,;:])\s*', r'\s+']
+
+    # Closing quotes/brackets stay with their sentence: only the whitespace is consumed
+    sentence = r'(?:(?<=[.!?…])|(?<=[.!?…]["\')\]»])|(?<=[.!?…]["\')\]»]{2}))\s+'
+    clause = r'(?<=[,;:])\s+'
+    if base in ('es', 'gl', 'ca', 'ast'):
+        # ¿ and ¡ open a question/exclamation: break before them, never after
+        sentence = rf'{sentence}|\s+(?=[¿¡])'
+        clause = rf'{clause}|\s+(?=[¿¡])'
+    return [sentence, clause, r'\s+']
+
+
+def _split_text(text: str, max_chars: int, patterns: List[str], joiner: str) -> List[str]:
+    """Split text on the strongest boundary that brings pieces under max_chars."""
+    if len(text) <= max_chars:
+        return [text]
+
+    for i, pattern in enumerate(patterns):
+        parts = [part.strip() for part in re.split(pattern, text) if part and part.strip()]
+        if len(parts) > 1:
+            pieces = []
+            for part in parts:
+                pieces.extend(_split_text(part, max_chars, patterns[i:], joiner))
+            return _pack_pieces(pieces, max_chars, joiner)
+
+    # A single unbroken word longer than the budget
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def _pack_pieces(pieces: List[str], max_chars: int, joiner: str) -> List[str]:
+    """Greedily merge consecutive pieces while they fit in max_chars."""
+    packed = []
+    for piece in pieces:
+        if packed and len(packed[-1]) + len(joiner) + len(piece) <= max_chars:
+            packed[-1] = f"{packed[-1]}{joiner}{piece}"
+        else:
+            packed.append(piece)
+    return packed
+
+
+def chunk_segments(segments: List[str], lang: str = 'en', max_chars: int = 100) -> List[str]:
+    """
+    Rebalance script lines into requests of roughly max_chars characters.
+
+    Lines longer than the budget are split on sentence boundaries, then
+    clause boundaries, then words. Consecutive short lines are merged
+    until the budget is reached, so fewer, fuller requests are made.
+    Boundaries are language-aware: Spanish breaks before ``¿``/``¡`` and
+    Chinese/Japanese break after full-width punctuation.
+
+    Args:
+        segments: Text segments from read_script()
+        lang: Language code of the script
+        max_chars: Target maximum characters per segment
+
+    Returns:
+        List of rebalanced text segments
+    """
+    patterns = _boundary_patterns(lang)
+    joiner = '' if lang.split('-')[0].lower() in _UNSPACED_LANGS else ' '
+
+    pieces = []
+    for segment in segments:
+        pieces.extend(_split_text(segment, max_chars, patterns, joiner))
+
+    return _pack_pieces(pieces, max_chars, joiner)
+
+
+class Pyttsx3Session:
+    """
+    Long-lived pyttsx3 engine shared by every segment of a script.
+
+    Driver startup and voice lookup are paid once when the session is
+    created. Segments are queued with ``queue()`` and rendered together by
+    a single ``run()`` call, instead of one ``runAndWait()`` per line.
+
+    Args:
+        rate: Speech rate (words per minute), default 150
+        volume: Volume level (0.0 to 1.0), default 1.0
+    """
+
+    def __init__(self, rate: int = 150, volume: float = 1.0):
+        import pyttsx3
+
+        self.engine = pyttsx3.init()
+
+        # Configure engine
+        self.engine.setProperty('rate', rate)
+        self.engine.setProperty('volume', volume)
+
+        self.rate = rate
+        self.volume = volume
+        self.voice_id = self._select_voice()
+        self.pending: List[str] = []
+
+    def _select_voice(self) -> Optional[str]:
+        """Pick a preferred voice once and return its id (None for default)."""
+        # Try to set a better voice if available
+        # Prefer female voices for clarity
+        for voice in self.engine.getProperty('voices'):
+            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                self.engine.setProperty('voice', voice.id)
+                return voice.id
+
+        return None
+
+    def queue(self, text: str, output_file: str):
+        """Queue a segment to be written to output_file on the next run()."""
+        self.engine.save_to_file(text, output_file)
+        self.pending.append(output_file)
+
+    def run(self) -> List[str]:
+        """
+        Render every queued segment with a single runAndWait().
+
+        Returns:
+            List of output files written, in queue order
+        """
+        written = self.pending
+        self.pending = []
+        if written:
+            self.engine.runAndWait()
+        return written
+
+    def render_bytes(self, texts: List[str]) -> List[bytes]:
+        """
+        Render texts in one batch and return each as WAV bytes.
+
+        pyttsx3 drivers can only write files, so the audio goes through a
+        scratch directory on tmpfs (when available) that is removed again.
+
+        Returns:
+            WAV data for each text, in order
+        """
+        import tempfile
+
+        with tempfile.TemporaryDirectory(dir=_scratch_dir()) as scratch:
+            files = [os.path.join(scratch, f"{i:04d}.wav") for i in range(len(texts))]
+            for text, output_file in zip(texts, files):
+                self.queue(text, output_file)
+            self.run()
+
+            buffers = []
+            for output_file in files:
+                with open(output_file, 'rb') as f:
+                    buffers.append(f.read())
+
+        return buffers
+
+
+def _scratch_dir() -> Optional[str]:
+    """Return a memory-backed scratch directory if the system has one."""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def generate_tts_pyttsx3(text: str, output_file: str, rate: int = 150, volume: float = 1.0,
+                         session: Optional[Pyttsx3Session] = None):
     """
     Generate TTS using pyttsx3 (offline engine).
 
@@ -76,31 +331,27 @@ def generate_tts_pyttsx3(text: str, output_file: str, rate: int = 150, volume: f
         output_file: Output audio file path
         rate: Speech rate (words per minute), default 150
         volume: Volume level (0.0 to 1.0), default 1.0
+        session: Existing engine session to reuse (created if omitted)
     """
-    import pyttsx3
-
-    engine = pyttsx3.init()
+    if session is None:
+        session = Pyttsx3Session(rate=rate, volume=volume)
 
-    # Configure engine
-    engine.setProperty('rate', rate)
-    engine.setProperty('volume', volume)
+    # Save to file
+    session.queue(text, output_file)
+    session.run()
 
-    # Get available voices
-    voices = engine.getProperty('voices')
 
-    # Try to set a better voice if available
-    # Prefer female voices for clarity
-    for voice in voices:
-        if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-            engine.setProperty('voice', voice.id)
-            break
+def _make_gtts(text: str, lang: str = 'en', slow: bool = False, endpoint: Optional[str] = None):
+    """Build a gTTS request object, optionally aimed at a custom endpoint."""
+    from gtts import gTTS
 
-    # Save to file
-    engine.save_to_file(text, output_file)
-    engine.runAndWait()
+    if endpoint:
+        return _endpoint_gtts_class(gTTS)(text=text, lang=lang, slow=slow, endpoint=endpoint)
+    return gTTS(text=text, lang=lang, slow=slow)
 
 
-def generate_tts_gtts(text: str, output_file: str, lang: str = 'en', slow: bool = False):
+def generate_tts_gtts(text: str, output_file: str, lang: str = 'en', slow: bool = False,
+                      endpoint: Optional[str] = None):
     """
     Generate TTS using gTTS (Google TTS, online).
 
@@ -109,197 +360,2954 @@ def generate_tts_gtts(text: str, output_file: str, lang: str = 'en', slow: bool
         output_file: Output audio file path
         lang: Language code (en, es, fr, etc.)
         slow: Use slow speech mode
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
     """
-    from gtts import gTTS
+    _make_gtts(text, lang=lang, slow=slow, endpoint=endpoint).save(output_file)
 
-    tts = gTTS(text=text, lang=lang, slow=slow)
-    tts.save(output_file)
 
+def generate_tts_gtts_bytes(text: str, lang: str = 'en', slow: bool = False,
+                            endpoint: Optional[str] = None) -> bytes:
+    """
+    Generate TTS using gTTS and return the MP3 data instead of saving it.
+
+    Args:
+        text: Text to convert to speech
+        lang: Language code (en, es, fr, etc.)
+        slow: Use slow speech mode
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
 
-def combine_audio_segments(segments: List[str], output_file: str, pause_duration: int = 1000):
+    Returns:
+        MP3 audio data
     """
-    Combine multiple audio segments with pauses.
+    buffer = io.BytesIO()
+    _make_gtts(text, lang=lang, slow=slow, endpoint=endpoint).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def _endpoint_gtts_class(gtts_class):
+    """Return a gTTS subclass that sends its requests to a custom endpoint."""
+
+    class EndpointGTTS(gtts_class):
+        def __init__(self, *args, endpoint: str, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.endpoint = endpoint
+
+        def _prepare_requests(self):
+            prepared_requests = super()._prepare_requests()
+            for request in prepared_requests:
+                request.prepare_url(self.endpoint, None)
+            return prepared_requests
+
+    return EndpointGTTS
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing request start times evenly.
 
     Args:
-        segments: List of audio file paths
-        output_file: Output combined audio file
-        pause_duration: Pause between segments in milliseconds
+        rate: Maximum requests per second (0 or less disables limiting)
+    """
+
+    def __init__(self, rate: float = 0):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller is allowed to start its next request."""
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _call_with_retries(func, retries: int = 2, backoff: float = 1.0,
+                       limiter: Optional[RateLimiter] = None):
+    """
+    Call func, retrying failures with exponential backoff and jitter.
+
+    Args:
+        func: Zero-argument callable to run
+        retries: Number of retries after the first failed attempt
+        backoff: Base delay in seconds, doubled after each failure
+        limiter: Rate limiter consulted before every attempt
+
+    Returns:
+        Tuple of (func result, number of retries used)
+    """
+    import random
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.wait()
+        try:
+            return func(), attempt
+        except Exception:
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay / 2))
+            attempt += 1
+
+
+class TTSEngine:
+    """
+    Base class of TTS engine backends.
+
+    An engine describes what it can do with class attributes and renders
+    text with ``write()``. Registering the class with ``@register_engine``
+    makes it available to the CLI (``--engine``), batch and bundle
+    conversion, ``Synthesizer`` and the TTS service, with no other changes
+    to this module. Engines in other modules are loaded by naming the
+    modules in the ``TTS_ENGINE_PLUGINS`` environment variable.
+
+    Subclasses only need ``write()``; ``render_files()`` and
+    ``render_bytes()`` have generic implementations built on it that
+    engines override when they can do better.
+
+    Attributes:
+        name: Engine name used on the command line and in build manifests
+        output_format: Audio format written ('mp3' or 'wav')
+        max_chars: Target characters per request when chunking
+        supports_batch: write() renders many texts for one start-up cost
+        thread_safe: One instance may synthesize on several threads at once
+        uses_lang: The language changes the voice (False: one voice for all)
+        dependencies: Python modules needed, mapped to the pip package
+        programs: Executables that must be on PATH
+
+    Args:
+        lang: Language code
+        rate: Speech rate (words per minute)
+        voice: Engine-specific voice name or model (None = engine default)
+        workers: Concurrent requests or processes for thread-safe engines
+        **options: Options for other engines, ignored
     """
+
+    name = ''
+    output_format = 'mp3'
+    max_chars = 100
+    supports_batch = False
+    thread_safe = True
+    uses_lang = True
+    dependencies: Dict[str, str] = {}
+    programs: Tuple[str, ...] = ()
+
+    def __init__(self, lang: str = 'en', rate: int = 150, voice: Optional[str] = None,
+                 workers: int = 1, **options):
+        self.lang = lang
+        self.rate = rate
+        self.voice = voice
+        self.workers = max(1, workers)
+
+    @property
+    def suffix(self) -> str:
+        """File extension of the audio this engine produces."""
+        return f".{self.output_format}"
+
+    @property
+    def ready(self) -> bool:
+        """False until start() has done the engine's one-off set-up."""
+        return True
+
+    def start(self):
+        """Do one-off set-up (load drivers or models) before the first synthesis."""
+
+    @classmethod
+    def supports_lang(cls, lang: str) -> bool:
+        """Whether the engine can speak lang (engines that cannot tell accept any code)."""
+        return True
+
+    def settings(self) -> Dict:
+        """Settings that change the audio, as SegmentCache.make_key() arguments."""
+        return {'lang': self.lang, 'rate': self.rate, 'voice': self.voice}
+
+    def write(self, texts: List[str], files: List[str]):
+        """Render each text to the output file at the same position."""
+        raise NotImplementedError
+
+    def _batches(self, jobs: List) -> List[List]:
+        """Split jobs into the units handed to write()."""
+        if not self.supports_batch:
+            return [[job] for job in jobs]
+        # One batch per worker keeps start-up costs at one per worker
+        count = self.workers if self.thread_safe else 1
+        size = max(1, -(-len(jobs) // count))
+        return [jobs[start:start + size] for start in range(0, len(jobs), size)]
+
+    def render_files(self, jobs: List[Tuple[int, str, Path]],
+                     metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+        """
+        Synthesize segments to files.
+
+        Args:
+            jobs: (segment number, text, output file) tuples
+            metrics: Pipeline metrics to record each write() call in
+
+        Returns:
+            Mapping of segment number to the file that was written
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        metrics = metrics or Metrics()
+
+        def render(batch):
+            with metrics.stage('synthesize', per_thread=True, engine=self.name,
+                               segments=len(batch)) as record:
+                self.write([text for _, text, _ in batch], [str(f) for _, _, f in batch])
+                record['bytes'] = sum(f.stat().st_size for _, _, f in batch if f.exists())
+
+        for i, text, _ in jobs:
+            print(f"🔊 Generating segment {i}: {text[:50]}...")
+
+        results = {}
+        started = time.perf_counter()
+        batches = self._batches(jobs)
+        workers = self.workers if self.thread_safe else 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(batch, pool.submit(render, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    first, last = batch[0][0], batch[-1][0]
+                    label = f"segment {first}" if first == last else f"segments {first}-{last}"
+                    print(f"❌ Error generating {label}: {e}")
+                    continue
+                for i, _, segment_file in batch:
+                    if segment_file.exists():
+                        results[i] = segment_file
+                        print(f"   ✓ Saved to: {segment_file}")
+                    else:
+                        print(f"❌ Error generating segment {i}: no audio written")
+
+        if results:
+            elapsed = time.perf_counter() - started
+            print(f"⏱️  Synthesized {len(results)} segments in {elapsed:.2f}s "
+                  f"with {workers} worker(s)")
+
+        return results
+
+    def render_bytes(self, texts: List[str]) -> List[bytes]:
+        """Synthesize texts and return their encoded audio, via a tmpfs scratch directory."""
+        import tempfile
+
+        with tempfile.TemporaryDirectory(dir=_scratch_dir()) as scratch:
+            files = [os.path.join(scratch, f"{i:04d}{self.suffix}") for i in range(len(texts))]
+            for batch in self._batches(list(zip(texts, files))):
+                self.write([text for text, _ in batch], [f for _, f in batch])
+
+            buffers = []
+            for output_file in files:
+                with open(output_file, 'rb') as f:
+                    buffers.append(f.read())
+
+        return buffers
+
+
+# Registered engines by name
+ENGINES: Dict[str, type] = {}
+
+# Environment variable naming extra modules that register engines
+ENGINE_PLUGINS_ENV = 'TTS_ENGINE_PLUGINS'
+
+
+def register_engine(engine_class: type) -> type:
+    """Class decorator adding a TTSEngine subclass to the registry under its name."""
+    if not engine_class.name:
+        raise ValueError(f"{engine_class.__name__} has no engine name")
+    ENGINES[engine_class.name] = engine_class
+    return engine_class
+
+
+def get_engine(name: str) -> type:
+    """Return the registered engine class called name."""
     try:
-        from pydub import AudioSegment
-        from pydub.playback import play
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {name}") from None
 
-        combined = AudioSegment.empty()
-        pause = AudioSegment.silent(duration=pause_duration)
 
-        for i, segment_file in enumerate(segments):
-            print(f"  Adding segment {i+1}/{len(segments)}: {Path(segment_file).name}")
-            audio = AudioSegment.from_file(segment_file)
-            combined += audio
+def create_engine(name: str, **options) -> TTSEngine:
+    """Create an instance of the registered engine called name (see TTSEngine)."""
+    return get_engine(name)(**options)
 
-            # Add pause between segments (but not after the last one)
-            if i < len(segments) - 1:
-                combined += pause
 
-        # Export combined audio
-        combined.export(output_file, format='mp3')
-        print(f"✅ Combined audio saved to: {output_file}")
+def load_engine_plugins(modules: Optional[str] = None):
+    """
+    Import the modules listed (comma-separated) in TTS_ENGINE_PLUGINS.
 
-    except ImportError:
-        print("⚠️  pydub not installed. Cannot combine audio segments.")
-        print("Install with: pip install pydub")
-        print("Note: Also requires ffmpeg to be installed on your system")
+    Plugin modules register their engines with ``@register_engine`` when
+    imported. They can ``import text_to_speech`` even when this file runs
+    as a script.
+    """
+    import importlib
 
+    modules = modules if modules is not None else os.environ.get(ENGINE_PLUGINS_ENV, '')
+    sys.modules.setdefault('text_to_speech', sys.modules[__name__])
+    for module in filter(None, (m.strip() for m in modules.split(','))):
+        importlib.import_module(module)
 
-def convert_script_to_speech(
-    script_file: str,
-    output_dir: str,
-    engine: str = 'gtts',
-    lang: str = 'en',
-    combine: bool = True,
-    rate: int = 150
-):
+
+@register_engine
+class GTTSEngine(TTSEngine):
     """
-    Convert a script file to speech audio files.
+    Google Translate TTS over HTTP.
+
+    Every segment is an independent request, so up to ``workers`` run at
+    once, spaced by ``rate_limit`` and retried with backoff.
 
     Args:
-        script_file: Path to script text file
-        output_dir: Directory to save audio files
-        engine: TTS engine ('gtts' or 'pyttsx3')
-        lang: Language code for gTTS
-        combine: Whether to combine segments into one file
-        rate: Speech rate for pyttsx3
+        slow: Use slow speech mode
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
+        retries: Retries per failed request
+        rate_limit: Maximum requests per second (0 = unlimited)
+        limiter: RateLimiter shared with other engines (replaces rate_limit)
     """
-    # Ensure output directory exists
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
 
-    # Read script
-    print(f"📖 Reading script: {script_file}")
-    segments = read_script(script_file)
+    name = 'gtts'
+    output_format = 'mp3'
+    # gTTS splits anything longer than 100 characters into separate requests
+    max_chars = 100
+    dependencies = {'gtts': 'gTTS'}
+
+    def __init__(self, lang: str = 'en', rate: int = 150, voice: Optional[str] = None,
+                 workers: int = 1, slow: bool = False, endpoint: Optional[str] = None,
+                 retries: int = 2, rate_limit: float = 0,
+                 limiter: Optional[RateLimiter] = None, **options):
+        super().__init__(lang=lang, rate=rate, voice=voice, workers=workers)
+        self.slow = slow
+        self.endpoint = endpoint
+        self.retries = retries
+        self.rate_limit = rate_limit
+        self.limiter = limiter or RateLimiter(rate_limit)
+
+    @classmethod
+    def supports_lang(cls, lang: str) -> bool:
+        from gtts.lang import _fallback_deprecated_lang, tts_langs
+
+        return _fallback_deprecated_lang(lang) in tts_langs()
+
+    def settings(self) -> Dict:
+        settings = {'lang': self.lang, 'rate': None, 'voice': None, 'slow': self.slow}
+        if self.endpoint:
+            settings['endpoint'] = self.endpoint
+        return settings
+
+    def write(self, texts: List[str], files: List[str]):
+        for text, output_file in zip(texts, files):
+            _call_with_retries(
+                lambda: generate_tts_gtts(text, output_file, lang=self.lang, slow=self.slow,
+                                          endpoint=self.endpoint),
+                retries=self.retries, limiter=self.limiter
+            )
+
+    def render_files(self, jobs: List[Tuple[int, str, Path]],
+                     metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+        return _generate_segments_gtts(jobs, lang=self.lang, slow=self.slow,
+                                       workers=self.workers, retries=self.retries,
+                                       limiter=self.limiter, endpoint=self.endpoint,
+                                       metrics=metrics)
+
+    def render_bytes(self, texts: List[str]) -> List[bytes]:
+        def synthesize(text):
+            data, _ = _call_with_retries(
+                lambda: generate_tts_gtts_bytes(text, lang=self.lang, slow=self.slow,
+                                                endpoint=self.endpoint),
+                retries=self.retries, limiter=self.limiter
+            )
+            return data
+
+        if self.workers <= 1 or len(texts) == 1:
+            return [synthesize(text) for text in texts]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(synthesize, texts))
+
+
+@register_engine
+class Pyttsx3Engine(TTSEngine):
+    """
+    Offline speech through the operating system's driver (SAPI5, NSSpeech, espeak).
 
-    if not segments:
-        print("❌ No text segments found in script file")
-        return
+    All segments share one Pyttsx3Session and are rendered by a single
+    runAndWait(). The drivers are not thread-safe, so extra throughput
+    comes from ``processes`` worker processes, each with its own engine.
 
-    print(f"✅ Found {len(segments)} text segments")
+    Args:
+        session: Shared pyttsx3 session to reuse (created by start())
+        processes: Worker processes used by render_files()
+    """
+
+    name = 'pyttsx3'
+    output_format = 'wav'
+    max_chars = 400
+    supports_batch = True
+    thread_safe = False
+    uses_lang = False
+    dependencies = {'pyttsx3': 'pyttsx3'}
+
+    def __init__(self, lang: str = 'en', rate: int = 150, voice: Optional[str] = None,
+                 workers: int = 1, session: Optional[Pyttsx3Session] = None,
+                 processes: int = 1, **options):
+        super().__init__(lang=lang, rate=rate, voice=voice, workers=workers)
+        self.session = session
+        self.processes = processes
+        self.init_time = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.session is not None
+
+    def start(self):
+        if self.session is None:
+            started = time.perf_counter()
+            self.session = Pyttsx3Session(rate=self.rate)
+            self.init_time = time.perf_counter() - started
+
+    def settings(self) -> Dict:
+        self.start()
+        return {'lang': None, 'rate': self.session.rate, 'voice': self.session.voice_id}
+
+    def write(self, texts: List[str], files: List[str]):
+        self.start()
+        for text, output_file in zip(texts, files):
+            self.session.queue(text, output_file)
+        self.session.run()
+
+    def render_files(self, jobs: List[Tuple[int, str, Path]],
+                     metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+        self.start()
+        if self.processes > 1 and len(jobs) > 1:
+            return _generate_segments_pyttsx3_pool(jobs, rate=self.session.rate,
+                                                   processes=self.processes, metrics=metrics)
+        # Start-up is only reported (and saved) once per session
+        init_time, self.init_time = self.init_time, 0.0
+        return _generate_segments_pyttsx3(jobs, self.session, init_time=init_time,
+                                          metrics=metrics)
+
+    def render_bytes(self, texts: List[str]) -> List[bytes]:
+        self.start()
+        return self.session.render_bytes(texts)
+
+
+def _run_program(command: List[str], stdin: str):
+    """Run a synthesizer binary, raising RuntimeError with its stderr on failure."""
+    import subprocess
+
+    process = subprocess.run(command, input=stdin.encode('utf-8'), capture_output=True)
+    if process.returncode != 0:
+        detail = process.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise RuntimeError(f"{command[0]} exited with {process.returncode}"
+                           + (f": {detail[-1]}" if detail else ""))
+
+
+@register_engine
+class PiperEngine(TTSEngine):
+    """
+    Offline neural voices with the piper binary (https://github.com/rhasspy/piper).
+
+    A batch of segments goes to one piper process as JSON lines on stdin
+    (``--json-input``), each naming its output file, so the voice model
+    is loaded once per batch rather than once per segment. Thread-safe:
+    ``workers`` splits the segments over that many piper processes.
+
+    The voice is ``voice`` (a .onnx model file), or the first
+    ``<lang>*.onnx`` model in PIPER_VOICES (default: ~/.local/share/piper).
+    """
+
+    name = 'piper'
+    output_format = 'wav'
+    max_chars = 400
+    supports_batch = True
+    programs = ('piper',)
+
+    def __init__(self, lang: str = 'en', rate: int = 150, voice: Optional[str] = None,
+                 workers: int = 1, **options):
+        super().__init__(lang=lang, rate=rate, voice=voice, workers=workers)
+        self.model: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.model is not None
+
+    @staticmethod
+    def _voices() -> Path:
+        return Path(os.environ.get('PIPER_VOICES', '~/.local/share/piper')).expanduser()
+
+    @classmethod
+    def _find_model(cls, lang: str) -> Optional[Path]:
+        """First voice model for lang (or its base language) in PIPER_VOICES."""
+        voices = cls._voices()
+        base = lang.split('-')[0]
+        models = sorted(voices.glob(f"{lang}*.onnx")) or sorted(voices.glob(f"{base}*.onnx"))
+        return models[0] if models else None
+
+    @classmethod
+    def supports_lang(cls, lang: str) -> bool:
+        return cls._find_model(lang) is not None
+
+    def start(self):
+        if self.model is not None:
+            return
+        if self.voice:
+            self.model = self.voice
+            return
+        model = self._find_model(self.lang)
+        if model is None:
+            raise RuntimeError(f"no piper voice for '{self.lang}' in {self._voices()}; "
+                               f"pass --voice MODEL.onnx")
+        self.model = str(model)
+
+    def settings(self) -> Dict:
+        self.start()
+        return {'lang': self.lang, 'rate': self.rate, 'voice': Path(self.model).name}
+
+    def write(self, texts: List[str], files: List[str]):
+        self.start()
+        lines = ''.join(
+            json.dumps({'text': text, 'output_file': output_file}, ensure_ascii=False) + '\n'
+            for text, output_file in zip(texts, files)
+        )
+        # piper speaks at about 150 words per minute at length scale 1
+        _run_program(['piper', '--model', self.model, '--json-input',
+                      '--length_scale', f"{150 / self.rate:.3f}"], lines)
 
-    # Generate audio for each segment
-    segment_files = []
-    base_name = Path(script_file).stem
 
-    for i, text in enumerate(segments, 1):
-        segment_file = output_path / f"{base_name}_segment_{i:02d}.mp3"
-        print(f"🔊 Generating segment {i}/{len(segments)}: {text[:50]}...")
+@register_engine
+class EspeakEngine(TTSEngine):
+    """
+    Offline formant speech with the espeak-ng binary.
+
+    Each segment is one short-lived espeak-ng process reading its text
+    from stdin; start-up is a few milliseconds, and segments run on
+    ``workers`` threads. ``voice`` is an espeak-ng voice name
+    (default: the language code).
+    """
+
+    name = 'espeak-ng'
+    output_format = 'wav'
+    max_chars = 400
+    programs = ('espeak-ng',)
+
+    @classmethod
+    def supports_lang(cls, lang: str) -> bool:
+        import subprocess
 
         try:
-            if engine == 'gtts':
-                generate_tts_gtts(text, str(segment_file), lang=lang)
-            elif engine == 'pyttsx3':
-                # pyttsx3 saves as WAV, convert filename
-                segment_file = segment_file.with_suffix('.wav')
-                generate_tts_pyttsx3(text, str(segment_file), rate=rate)
-            else:
-                print(f"❌ Unknown engine: {engine}")
-                return
+            listing = subprocess.run(['espeak-ng', f"--voices={lang}"], capture_output=True,
+                                     text=True).stdout
+        except OSError:
+            return True  # not installed: synthesis reports that
+        # A header line, then one line per voice for the language
+        return len(listing.strip().splitlines()) > 1
 
-            segment_files.append(str(segment_file))
-            print(f"   ✓ Saved to: {segment_file}")
+    def write(self, texts: List[str], files: List[str]):
+        for text, output_file in zip(texts, files):
+            _run_program(['espeak-ng', '-v', self.voice or self.lang, '-s', str(self.rate),
+                          '-w', output_file, '--stdin'], text)
 
-        except Exception as e:
-            print(f"❌ Error generating segment {i}: {e}")
-            continue
 
-    # Combine segments if requested
-    if combine and len(segment_files) > 1:
-        combined_file = output_path / f"{base_name}_complete.mp3"
-        print(f"\n🎵 Combining {len(segment_files)} segments...")
-        combine_audio_segments(segment_files, str(combined_file))
+# An audio segment given either as a file path or as encoded bytes
+AudioSource = Union[str, Path, bytes]
 
-    print(f"\n✅ All done! Audio files saved to: {output_dir}")
+# Format version of <name>_complete.index.json
+CUE_INDEX_VERSION = 1
 
 
-def main():
-    """Main entry point for CLI."""
-    parser = argparse.ArgumentParser(
-        description='Convert text scripts to speech audio files',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Generate English audio using Google TTS
-  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine gtts
+def _source_label(source: AudioSource) -> str:
+    """Short display name for an audio source."""
+    if isinstance(source, bytes):
+        return f"<{len(source)} bytes>"
+    return Path(source).name
 
-  # Generate Spanish audio using Google TTS
-  python text_to_speech.py scripts/legal_rights_es.txt output/ --engine gtts --lang es
 
-  # Generate audio using offline TTS (no internet required)
-  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine pyttsx3
+def _is_mp3(source: AudioSource) -> bool:
+    """True if the source is an MP3 file name or MP3 data."""
+    if isinstance(source, bytes):
+        return source[:3] == b'ID3' or (len(source) > 1 and source[0] == 0xFF
+                                         and source[1] & 0xE0 == 0xE0)
+    return Path(source).suffix.lower() == '.mp3'
 
-  # Generate without combining segments
-  python text_to_speech.py scripts/legal_rights_en.txt output/ --no-combine
 
-  # Adjust speech rate for pyttsx3
-  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine pyttsx3 --rate 130
-        """
-    )
+def _load_audio(source: AudioSource):
+    """Decode an audio file path or encoded bytes into a pydub AudioSegment."""
+    from pydub import AudioSegment
 
-    parser.add_argument(
-        'script',
-        help='Path to script text file'
-    )
+    if isinstance(source, bytes):
+        fmt = 'wav' if source[:4] == b'RIFF' else 'mp3'
+        return AudioSegment.from_file(io.BytesIO(source), format=fmt)
+    return AudioSegment.from_file(source)
 
-    parser.add_argument(
-        'output',
-        help='Output directory for audio files'
-    )
 
-    parser.add_argument(
-        '--engine',
-        choices=['gtts', 'pyttsx3'],
-        default='gtts',
-        help='TTS engine to use (default: gtts)'
-    )
+def concatenate_audio(segments: List[AudioSource], pause_duration: int = 1000,
+                      postprocess: Optional['SegmentPostProcessor'] = None,
+                      timeline: Optional[List[Tuple[float, float]]] = None,
+                      verbose: bool = True):
+    """
+    Decode segments and join them with pauses in a single pass.
 
-    parser.add_argument(
-        '--lang',
-        default='en',
-        help='Language code for gTTS (en, es, fr, etc.). Default: en'
-    )
+    Raw PCM from every segment (converted to the first segment's frame
+    rate, channels and sample width) and the generated silence are
+    collected and joined once, so the cost is linear in the total audio
+    length rather than copying the accumulated buffer per segment.
 
-    parser.add_argument(
-        '--no-combine',
-        action='store_true',
-        help='Do not combine segments into a single file'
-    )
+    Args:
+        segments: Audio file paths or in-memory audio data
+        pause_duration: Pause between segments in milliseconds
+        postprocess: Optional SegmentPostProcessor applied to each
+            segment's PCM (silence trimming, loudness normalization)
+        timeline: If given, (start ms, duration ms) of each segment in the
+            combined audio is appended to it
+        verbose: Print a progress line per segment
 
-    parser.add_argument(
-        '--rate',
-        type=int,
-        default=150,
-        help='Speech rate for pyttsx3 (words per minute). Default: 150'
+    Returns:
+        pydub AudioSegment holding the combined audio
+    """
+    from pydub import AudioSegment
+
+    chunks = []
+    params = None
+    silence = b''
+    position = 0
+
+    for i, segment_file in enumerate(segments):
+        if verbose:
+            print(f"  Adding segment {i+1}/{len(segments)}: {_source_label(segment_file)}")
+        audio = _load_audio(segment_file)
+
+        if params is None:
+            params = (audio.frame_rate, audio.channels, audio.sample_width)
+            silence = _silence_bytes(pause_duration, *params)
+        else:
+            audio = (audio.set_frame_rate(params[0])
+                          .set_channels(params[1])
+                          .set_sample_width(params[2]))
+
+        data = audio.raw_data
+        if postprocess is not None:
+            data = postprocess(data, *params)
+        chunks.append(data)
+        position = _advance_timeline(timeline, position, len(data), params)
+
+        # Add pause between segments (but not after the last one)
+        if i < len(segments) - 1:
+            chunks.append(silence)
+            position += len(silence)
+
+    if params is None:
+        return AudioSegment.empty()
+
+    frame_rate, channels, sample_width = params
+    return AudioSegment(
+        data=b''.join(chunks),
+        sample_width=sample_width,
+        frame_rate=frame_rate,
+        channels=channels
     )
 
-    args = parser.parse_args()
 
-    # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
+def _advance_timeline(timeline: Optional[List[Tuple[float, float]]], position: int,
+                      length: int, params: Tuple[int, int, int]) -> int:
+    """
+    Record a segment of length PCM bytes starting at byte position.
 
-    # Validate input file
-    if not os.path.exists(args.script):
-        print(f"❌ Script file not found: {args.script}")
-        sys.exit(1)
+    Returns:
+        Byte position just past the segment
+    """
+    if timeline is not None:
+        frame_rate, channels, sample_width = params
+        bytes_per_ms = frame_rate * channels * sample_width / 1000
+        timeline.append((position / bytes_per_ms, length / bytes_per_ms))
+    return position + length
 
-    # Convert script to speech
-    try:
-        convert_script_to_speech(
-            script_file=args.script,
-            output_dir=args.output,
-            engine=args.engine,
-            lang=args.lang,
-            combine=not args.no_combine,
-            rate=args.rate
-        )
+
+def _silence_bytes(duration: int, frame_rate: int, channels: int, sample_width: int) -> bytes:
+    """Return raw PCM silence of duration milliseconds."""
+    frames = int(frame_rate * duration / 1000)
+    # 8-bit PCM is unsigned, so its midpoint is 0x80 rather than zero
+    sample = b'\x80' if sample_width == 1 else b'\x00' * sample_width
+    return sample * (frames * channels)
+
+
+# Export format name -> (file extension, ffmpeg muxer, ffmpeg audio codec)
+EXPORT_FORMATS = {
+    'mp3': ('mp3', 'mp3', None),
+    'opus': ('opus', 'ogg', 'libopus'),
+    'ogg': ('ogg', 'ogg', 'libvorbis'),
+    'aac': ('m4a', 'ipod', 'aac'),
+    'flac': ('flac', 'flac', None),
+    'wav': ('wav', 'wav', None),
+}
+
+
+class ExportTarget(NamedTuple):
+    """One encoded rendition of the combined programme."""
+
+    output_file: str
+    fmt: str = 'mp3'
+    bitrate: Optional[str] = None
+
+
+def parse_formats(spec: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse a format list such as ``mp3:64k,opus:24k,wav``.
+
+    Returns:
+        (format, bitrate) pairs; bitrate is None when not given
+
+    Raises:
+        ValueError: For unknown formats or malformed bitrates
+    """
+    formats = []
+    for item in spec.split(','):
+        item = item.strip().lower()
+        if not item:
+            continue
+        fmt, _, bitrate = item.partition(':')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"unknown format '{fmt}' (choose from {', '.join(EXPORT_FORMATS)})")
+        if bitrate and not re.fullmatch(r'\d+(\.\d+)?[km]?', bitrate):
+            raise ValueError(f"invalid bitrate '{bitrate}' for {fmt} (e.g. 64k)")
+        formats.append((fmt, bitrate or None))
+    return formats
+
+
+def export_targets(output_path: Path, base_name: str,
+                   formats: List[Tuple[str, Optional[str]]]) -> List[ExportTarget]:
+    """
+    Name the extra renditions of ``<base_name>_complete.mp3``.
+
+    Files are ``<base_name>_complete[_<bitrate>].<ext>``. The default MP3
+    is always written separately (automations look for it by name), so
+    a plain ``mp3`` entry is skipped here.
+    """
+    targets = []
+    for fmt, bitrate in formats:
+        if (fmt, bitrate) == ('mp3', None):
+            continue
+        suffix = f"_{bitrate}" if bitrate else ''
+        name = f"{base_name}_complete{suffix}.{EXPORT_FORMATS[fmt][0]}"
+        target = ExportTarget(str(output_path / name), fmt, bitrate)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+class PcmEncoder:
+    """
+    Long-lived ffmpeg process encoding raw PCM written to its stdin.
+
+    Audio is fed chunk by chunk with ``write()``, so the encoder never
+    needs the whole programme in memory.
+
+    Args:
+        output_file: Encoded output file
+        frame_rate: Sample rate of the PCM input
+        channels: Channel count of the PCM input
+        sample_width: Bytes per sample of the PCM input
+        fmt: Output container/codec name understood by ffmpeg
+        bitrate: Optional output bitrate (e.g. '64k')
+        codec: Optional ffmpeg audio codec (default: the container's)
+    """
+
+    PCM_FORMATS = {1: 'u8', 2: 's16le', 3: 's24le', 4: 's32le'}
+
+    def __init__(self, output_file: str, frame_rate: int, channels: int, sample_width: int,
+                 fmt: str = 'mp3', bitrate: Optional[str] = None, codec: Optional[str] = None):
+        import subprocess
+        import tempfile
+
+        from pydub import AudioSegment
+
+        command = [
+            AudioSegment.converter, '-y', '-loglevel', 'error',
+            '-f', self.PCM_FORMATS[sample_width], '-ar', str(frame_rate),
+            '-ac', str(channels), '-i', 'pipe:0',
+        ]
+        if codec:
+            command += ['-c:a', codec]
+        if bitrate:
+            command += ['-b:a', bitrate]
+        command += ['-f', fmt, output_file]
+
+        self.output_file = output_file
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self.stderr)
+
+    @classmethod
+    def for_target(cls, target: ExportTarget, frame_rate: int, channels: int,
+                   sample_width: int) -> 'PcmEncoder':
+        """Start an encoder for an export target (format names from EXPORT_FORMATS)."""
+        _, muxer, codec = EXPORT_FORMATS.get(target.fmt, (None, target.fmt, None))
+        return cls(target.output_file, frame_rate, channels, sample_width,
+                   fmt=muxer, bitrate=target.bitrate, codec=codec)
+
+    def write(self, data: bytes):
+        """Feed a chunk of PCM to the encoder."""
+        try:
+            self.process.stdin.write(data)
+        except BrokenPipeError:
+            # The encoder exited early; close() reports its error message
+            pass
+
+    def close(self):
+        """Flush the encoder and wait for it to finish writing the output."""
+        self.process.stdin.close()
+        returncode = self.process.wait()
+        self.stderr.seek(0)
+        message = self.stderr.read().decode('utf-8', 'replace').strip()
+        self.stderr.close()
+        if returncode != 0:
+            raise RuntimeError(f"Encoding {self.output_file} failed: {message}")
+
+
+def stream_audio_segments(segments: List[AudioSource], output_file: str, pause_duration: int = 1000,
+                          fmt: str = 'mp3',
+                          postprocess: Optional['SegmentPostProcessor'] = None,
+                          exports: Optional[List[ExportTarget]] = None,
+                          timeline: Optional[List[Tuple[float, float]]] = None):
+    """
+    Decode segments one at a time and stream them into a single encoder.
+
+    Only the segment currently being decoded is held in memory, so peak
+    usage is bounded by the longest segment rather than the programme.
+    Extra export targets get their own encoder process fed with the same
+    PCM, so every rendition comes from one decode pass.
+
+    Args:
+        segments: Audio file paths or in-memory audio data
+        output_file: Output combined audio file (None to write only exports)
+        pause_duration: Pause between segments in milliseconds
+        fmt: Output format for the encoder
+        postprocess: Optional SegmentPostProcessor applied to each segment's PCM
+        exports: Further renditions to encode alongside output_file
+        timeline: If given, (start ms, duration ms) of each segment is appended to it
+    """
+    targets = ([ExportTarget(output_file, fmt)] if output_file else []) + list(exports or [])
+    encoders = []
+    params = None
+    silence = b''
+    position = 0
+
+    try:
+        for i, segment_file in enumerate(segments):
+            print(f"  Streaming segment {i+1}/{len(segments)}: {_source_label(segment_file)}")
+            audio = _load_audio(segment_file)
+
+            if params is None:
+                params = (audio.frame_rate, audio.channels, audio.sample_width)
+                silence = _silence_bytes(pause_duration, *params)
+                for target in targets:
+                    encoders.append(PcmEncoder.for_target(target, *params))
+            else:
+                audio = (audio.set_frame_rate(params[0])
+                              .set_channels(params[1])
+                              .set_sample_width(params[2]))
+
+            data = audio.raw_data
+            if postprocess is not None:
+                data = postprocess(data, *params)
+            # Each encoder is its own process, so they encode in parallel
+            for encoder in encoders:
+                encoder.write(data)
+            position = _advance_timeline(timeline, position, len(data), params)
+            del audio, data
+
+            # Add pause between segments (but not after the last one)
+            if i < len(segments) - 1:
+                for encoder in encoders:
+                    encoder.write(silence)
+                position += len(silence)
+    finally:
+        errors = []
+        for encoder in encoders:
+            try:
+                encoder.close()
+            except RuntimeError as e:
+                errors.append(str(e))
+        if errors:
+            raise RuntimeError('; '.join(errors))
+
+
+def export_audio(audio, targets: List[ExportTarget], metrics: Optional[Metrics] = None):
+    """
+    Encode one decoded programme into several formats at once.
+
+    Every target gets its own ffmpeg process, fed the same PCM from its
+    own thread, so the encodings run concurrently and the programme is
+    decoded only once.
+
+    Args:
+        audio: pydub AudioSegment holding the combined programme
+        targets: Renditions to write
+        metrics: Pipeline metrics to record each encoding in
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    metrics = metrics or Metrics()
+    data = audio.raw_data
+    params = (audio.frame_rate, audio.channels, audio.sample_width)
+
+    def encode(target: ExportTarget):
+        with metrics.stage('encode', per_thread=True, format=target.fmt,
+                           bitrate=target.bitrate) as record:
+            encoder = PcmEncoder.for_target(target, *params)
+            try:
+                encoder.write(data)
+            finally:
+                encoder.close()
+            record['bytes'] = os.path.getsize(target.output_file)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(targets))) as pool:
+        for future in [pool.submit(encode, target) for target in targets]:
+            future.result()
+
+
+def combine_audio_segments(segments: List[AudioSource], output_file: str, pause_duration: int = 1000,
+                           stream: bool = False, reencode: bool = False,
+                           metrics: Optional[Metrics] = None,
+                           postprocess: Optional['SegmentPostProcessor'] = None,
+                           exports: Optional[List[ExportTarget]] = None,
+                           cues: Optional[List[Tuple[int, str]]] = None):
+    """
+    Combine multiple audio segments with pauses.
+
+    MP3 segments sharing the same stream parameters are joined frame by
+    frame without re-encoding. Anything else, or any run with segment
+    post-processing, falls back to decoding and encoding the programme.
+    Extra export renditions are all encoded concurrently from a single
+    decode of the programme.
+
+    Args:
+        segments: Audio file paths or in-memory audio data
+        output_file: Output combined audio file
+        pause_duration: Pause between segments in milliseconds
+        stream: Stream segments through one encoder instead of building the
+            whole programme in memory
+        reencode: Always decode and re-encode, even if frames could be copied
+        metrics: Pipeline metrics to record the combine stages in
+        postprocess: Optional SegmentPostProcessor (silence trimming,
+            loudness normalization) applied to each decoded segment
+        exports: Further renditions (format, bitrate) to write besides the MP3
+        cues: (segment number, text) of each segment; when given, a cue
+            index and CUE sheet for output_file are written next to it
+
+    Returns:
+        True if the combined file was written
+    """
+    metrics = metrics or Metrics()
+    targets = [ExportTarget(output_file)] + list(exports or [])
+    timeline: Optional[List[Tuple[float, float]]] = [] if cues is not None else None
+
+    if postprocess is not None:
+        print(f"🎚️  Post-processing segments: {postprocess.describe()}")
+    elif not reencode and all(_is_mp3(f) for f in segments):
+        from mp3_frames import Mp3FormatError, join_mp3_data
+
+        try:
+            with metrics.stage('combine', mode='frames', segments=len(segments)) as record:
+                joined = join_mp3_data([_read_source(f) for f in segments], pause_duration,
+                                       timeline=timeline)
+                with open(output_file, 'wb') as f:
+                    f.write(joined)
+                record['bytes'] = len(joined)
+            print(f"✅ Combined audio saved to: {output_file} (frames copied, no re-encode)")
+            if cues is not None:
+                write_cue_index(output_file, timeline, cues)
+                # Extra renditions below must not add to the finished index
+                cues = timeline = None
+            targets = targets[1:]
+            if not targets:
+                return True
+        except Mp3FormatError as e:
+            print(f"  Cannot join MP3 frames directly ({e}); decoding instead")
+            if timeline:
+                timeline.clear()
+
+    try:
+        if stream:
+            with metrics.stage('combine', mode='stream', segments=len(segments),
+                               outputs=len(targets)) as record:
+                stream_audio_segments(segments, None, pause_duration,
+                                      postprocess=postprocess, exports=targets,
+                                      timeline=timeline)
+                record['bytes'] = sum(os.path.getsize(t.output_file) for t in targets)
+        else:
+            with metrics.stage('decode', segments=len(segments)) as record:
+                combined = concatenate_audio(segments, pause_duration, postprocess=postprocess,
+                                             timeline=timeline)
+                record['pcm_bytes'] = len(combined.raw_data)
+
+            # Export combined audio, every rendition from the same PCM
+            export_audio(combined, targets, metrics=metrics)
+        if postprocess is not None and postprocess.trimmed_ms:
+            trimmed = postprocess.trimmed_ms / 1000
+            print(f"✂️  Trimmed {trimmed:.1f}s of silence from segment edges")
+            metrics.emit('trim', trimmed_ms=round(postprocess.trimmed_ms))
+        for target in targets:
+            print(f"✅ Combined audio saved to: {target.output_file}")
+        if cues is not None:
+            write_cue_index(output_file, timeline, cues)
+        return True
+
+    except ImportError:
+        print("⚠️  pydub not installed. Cannot combine audio segments.")
+        print("Install with: pip install pydub")
+        print("Note: Also requires ffmpeg to be installed on your system")
+    except FileNotFoundError:
+        print("⚠️  ffmpeg not found. Cannot encode combined audio.")
+        print("Note: pydub requires ffmpeg to be installed on your system")
+    except RuntimeError as e:
+        print(f"❌ Error encoding combined audio: {e}")
+
+    return False
+
+
+def cue_index_file(audio_file: Union[str, Path]) -> Path:
+    """Return the cue index path for a combined audio file."""
+    return Path(audio_file).with_suffix('.index.json')
+
+
+def wav_seek_offsets(audio_file: Union[str, Path], times_ms: List[float]) -> List[Optional[int]]:
+    """
+    Find the byte offset of the sample frame at each time in a PCM WAV file.
+
+    Offsets are aligned to whole sample frames (all channels of one
+    sample), counted from the start of the file.
+
+    Returns:
+        Byte offset for each time (None if the file has no fmt/data chunks)
+    """
+    import struct
+
+    block_align = sample_rate = None
+    with open(audio_file, 'rb') as f:
+        if f.read(12)[8:12] != b'WAVE':
+            return [None] * len(times_ms)
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return [None] * len(times_ms)
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                sample_rate, = struct.unpack_from('<I', fmt, 4)
+                block_align, = struct.unpack_from('<H', fmt, 12)
+                f.seek(size & 1, io.SEEK_CUR)
+                continue
+            if chunk_id == b'data':
+                break
+            # Chunks are padded to an even size
+            f.seek(size + (size & 1), io.SEEK_CUR)
+        data_offset = f.tell()
+
+    if not block_align or not sample_rate:
+        return [None] * len(times_ms)
+    frames = size // block_align
+    return [data_offset + min(int(t * sample_rate / 1000), frames) * block_align
+            for t in times_ms]
+
+
+def write_cue_index(audio_file: Union[str, Path], timeline: List[Tuple[float, float]],
+                    cues: List[Tuple[int, str]]) -> Tuple[Path, Path]:
+    """
+    Write a seek index and a CUE sheet for a combined audio file.
+
+    ``<name>.index.json`` lists every segment's number, text, start and
+    duration in milliseconds, and the byte offset a player can start
+    decoding from (an MP3 frame, or a WAV sample frame), so a client can
+    jump straight to a segment without decoding from the beginning. ``<name>.cue`` carries
+    the same boundaries as chapter marks for media players.
+
+    Args:
+        audio_file: The combined audio file
+        timeline: (start ms, duration ms) of each segment, from the combiner
+        cues: (segment number, text) of each segment, in the same order
+
+    Returns:
+        Paths of the index and the CUE sheet
+    """
+    audio_path = Path(audio_file)
+    starts = [start for start, _ in timeline]
+    if _is_mp3(audio_path):
+        from mp3_frames import seek_offsets
+
+        offsets = seek_offsets(audio_path.read_bytes(), starts)
+    else:
+        offsets = wav_seek_offsets(audio_path, starts)
+
+    entries = [
+        {'segment': number, 'text': text, 'start_ms': round(start),
+         'duration_ms': round(duration), 'byte_offset': offset}
+        for (number, text), (start, duration), offset in zip(cues, timeline, offsets)
+    ]
+    index = {
+        'version': CUE_INDEX_VERSION,
+        'audio': audio_path.name,
+        'duration_ms': round(starts[-1] + timeline[-1][1]) if timeline else 0,
+        'segments': entries,
+    }
+    index_file = cue_index_file(audio_path)
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    file_type = 'MP3' if _is_mp3(audio_path) else 'WAVE'
+    lines = [f'TITLE "{audio_path.stem}"', f'FILE "{audio_path.name}" {file_type}']
+    for track, entry in enumerate(entries, 1):
+        # CUE positions are minutes:seconds:frames at 75 frames per second
+        frames = round(entry['start_ms'] * 75 / 1000)
+        minutes, frames = divmod(frames, 60 * 75)
+        seconds, frames = divmod(frames, 75)
+        title = ' '.join(entry['text'].split()).replace('"', "'")
+        lines += [
+            f"  TRACK {track:02d} AUDIO",
+            f'    TITLE "{title}"',
+            f"    INDEX 01 {minutes:02d}:{seconds:02d}:{frames:02d}",
+        ]
+    cue_file = audio_path.with_suffix('.cue')
+    with open(cue_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    print(f"📑 Cue index saved to: {index_file}")
+    return index_file, cue_file
+
+
+def _read_source(source: AudioSource) -> bytes:
+    """Return the encoded bytes of an audio source."""
+    if isinstance(source, bytes):
+        return source
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def combine_audio_bytes(segments: List[AudioSource], pause_duration: int = 1000,
+                        reencode: bool = False,
+                        postprocess: Optional['SegmentPostProcessor'] = None,
+                        timeline: Optional[List[Tuple[float, float]]] = None,
+                        verbose: bool = True) -> bytes:
+    """
+    Combine audio segments in memory and return the MP3 data.
+
+    Like combine_audio_segments(), MP3 inputs sharing stream parameters
+    are joined frame by frame; anything else is decoded and encoded.
+
+    Args:
+        segments: Audio file paths or in-memory audio data
+        pause_duration: Pause between segments in milliseconds
+        reencode: Always decode and re-encode, even if frames could be copied
+        postprocess: Optional SegmentPostProcessor applied to each decoded segment
+        timeline: If given, (start ms, duration ms) of each segment is appended to it
+        verbose: Print a progress line per decoded segment
+
+    Returns:
+        Combined MP3 data
+    """
+    if postprocess is None and not reencode and all(_is_mp3(f) for f in segments):
+        from mp3_frames import Mp3FormatError, join_mp3_data
+
+        try:
+            return join_mp3_data([_read_source(f) for f in segments], pause_duration,
+                                 timeline=timeline)
+        except Mp3FormatError:
+            if timeline:
+                timeline.clear()
+
+    buffer = io.BytesIO()
+    combined = concatenate_audio(segments, pause_duration, postprocess=postprocess,
+                                 timeline=timeline, verbose=verbose)
+    combined.export(buffer, format='mp3')
+    return buffer.getvalue()
+
+
+class SegmentCache:
+    """
+    Content-addressed on-disk cache of synthesized segments.
+
+    Entries are keyed on the normalized text plus every engine setting that
+    changes the audio, so an edited line misses while unchanged lines hit.
+    Hits refresh the entry's mtime; ``prune()`` evicts least recently used
+    entries until the cache fits in ``max_bytes``.
+
+    Args:
+        cache_dir: Directory holding cached audio
+        max_bytes: Size bound enforced by prune()
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, engine: str, lang: Optional[str] = None, rate: Optional[int] = None,
+                 voice: Optional[str] = None, slow: bool = False,
+                 endpoint: Optional[str] = None) -> str:
+        """Hash normalized text and engine settings into a cache key."""
+        normalized = ' '.join(text.split())
+        fields = [normalized, engine, lang, rate, voice, slow]
+        if endpoint:
+            # Stand-in servers never share entries with the real service
+            fields.append(endpoint)
+        payload = json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, output_file: Path) -> bool:
+        """Copy a cached segment to output_file. Returns True on a hit."""
+        entry = self._entry(key, output_file.suffix)
+        try:
+            shutil.copyfile(entry, output_file)
+            os.utime(entry)
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return False
+
+        with self.lock:
+            self.hits += 1
+        return True
+
+    def get_bytes(self, key: str, suffix: str) -> Optional[bytes]:
+        """Return a cached segment's data, or None on a miss."""
+        entry = self._entry(key, suffix)
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+            os.utime(entry)
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return data
+
+    def put_bytes(self, key: str, data: bytes, suffix: str):
+        """Store freshly synthesized segment data under key."""
+        entry = self._entry(key, suffix)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, entry)
+
+    def put(self, key: str, source_file: Path):
+        """Store a freshly synthesized segment under key."""
+        entry = self._entry(key, source_file.suffix)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source_file, tmp_file)
+        os.replace(tmp_file, entry)
+
+    def prune(self) -> int:
+        """
+        Evict least recently used entries until the cache fits max_bytes.
+
+        Scripts sharing a cache directory may prune at the same time, so
+        entries that vanish while pruning are skipped.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob('*/*'):
+            if entry.suffix == '.tmp':
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            total -= size
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+
+        self.evicted += removed
+        return removed
+
+    def report(self, metrics: Metrics):
+        """Print and record the hit/miss/eviction counts of this run."""
+        print(f"📦 Cache: {self.hits} hits, {self.misses} misses"
+              + (f", {self.evicted} evicted" if self.evicted else ""))
+        metrics.emit('cache', hits=self.hits, misses=self.misses, evicted=self.evicted)
+
+
+class Synthesizer:
+    """
+    Library API: synthesize text to audio bytes without temporary files.
+
+    gTTS audio is written straight into memory; engines that can only write
+    files (pyttsx3, piper, espeak-ng) go through a tmpfs scratch directory.
+    Results can be combined in memory with ``combine()``, so files are
+    only written for outputs the caller asks for::
+
+        synth = Synthesizer(engine='gtts', lang='es')
+        audio = synth.render(["Tiene derecho a guardar silencio."])
+        Path('prompt.mp3').write_bytes(audio)
+
+    Args:
+        engine: Registered engine name (see ENGINES), or an engine instance
+        lang: Language code
+        rate: Speech rate for offline engines
+        slow: Use gTTS slow speech mode
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
+        workers: Concurrent requests in synthesize_many() (thread-safe engines)
+        retries: Retries per failed gTTS request
+        rate_limit: Maximum gTTS requests per second (0 = unlimited)
+        cache_dir: Directory for the segment cache (None disables caching)
+        cache_size: Cache size bound in megabytes
+        session: Shared pyttsx3 session to reuse (created on first use)
+        voice: Engine-specific voice name or model file
+    """
+
+    def __init__(self, engine: Union[str, TTSEngine] = 'gtts', lang: str = 'en',
+                 rate: int = 150, slow: bool = False, endpoint: Optional[str] = None,
+                 workers: int = 1, retries: int = 2, rate_limit: float = 0,
+                 cache_dir: Optional[str] = None, cache_size: int = 500,
+                 session: Optional[Pyttsx3Session] = None, voice: Optional[str] = None):
+        if isinstance(engine, str):
+            engine = create_engine(engine, lang=lang, rate=rate, voice=voice, workers=workers,
+                                   slow=slow, endpoint=endpoint, retries=retries,
+                                   rate_limit=rate_limit, session=session)
+
+        self.backend = engine
+        self.engine = engine.name
+        self.lang = lang
+        self.cache = SegmentCache(cache_dir, cache_size * 1024 * 1024) if cache_dir else None
+        self.backend_lock = threading.Lock()
+
+    @property
+    def suffix(self) -> str:
+        """File extension of the audio this engine produces."""
+        return self.backend.suffix
+
+    def cache_key(self, text: str) -> str:
+        """Cache key of text under this synthesizer's settings."""
+        return SegmentCache.make_key(text, self.engine, **self.backend.settings())
+
+    def synthesize(self, text: str) -> bytes:
+        """Synthesize one text and return its encoded audio."""
+        return self.synthesize_many([text])[0]
+
+    def synthesize_many(self, texts: List[str]) -> List[bytes]:
+        """
+        Synthesize several texts and return their audio in the same order.
+
+        Thread-safe engines synthesize on up to ``workers`` threads; other
+        engines are called by one thread at a time.
+        """
+        keys = [self.cache_key(text) for text in texts] if self.cache else []
+        buffers: List[Optional[bytes]] = [None] * len(texts)
+        missing = []
+        for i, text in enumerate(texts):
+            if self.cache is not None:
+                buffers[i] = self.cache.get_bytes(keys[i], self.suffix)
+            if buffers[i] is None:
+                missing.append(i)
+
+        if missing:
+            if self.backend.thread_safe:
+                rendered = self.backend.render_bytes([texts[i] for i in missing])
+            else:
+                with self.backend_lock:
+                    rendered = self.backend.render_bytes([texts[i] for i in missing])
+
+            for i, data in zip(missing, rendered):
+                buffers[i] = data
+                if self.cache is not None:
+                    self.cache.put_bytes(keys[i], data, self.suffix)
+            # Long-lived synthesizers (the TTS service) never reach the CLI's prune
+            if self.cache is not None:
+                self.cache.prune()
+
+        return buffers
+
+    def combine(self, buffers: List[AudioSource], pause_duration: int = 1000,
+                reencode: bool = False,
+                postprocess: Optional['SegmentPostProcessor'] = None,
+                timeline: Optional[List[Tuple[float, float]]] = None) -> bytes:
+        """Combine audio with pauses in memory and return the MP3 data."""
+        # Quiet without redirecting stdout, which is shared by every thread
+        return combine_audio_bytes(buffers, pause_duration, reencode=reencode,
+                                   postprocess=postprocess, timeline=timeline, verbose=False)
+
+    def render(self, texts: List[str], pause_duration: int = 1000) -> bytes:
+        """Synthesize texts and return them combined into one MP3 programme."""
+        buffers = self.synthesize_many(texts)
+        if len(buffers) == 1 and self.suffix == '.mp3':
+            return buffers[0]
+        return self.combine(buffers, pause_duration)
+
+
+def _generate_segments_pyttsx3(jobs: List[Tuple[int, str, Path]], session: Pyttsx3Session,
+                               init_time: float = 0.0,
+                               metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+    """
+    Synthesize all segments with one shared pyttsx3 session.
+
+    Every segment is queued on the same engine and rendered by a single
+    runAndWait(). Timings are printed so the saving over per-segment
+    engine start-up is visible.
+
+    Args:
+        jobs: (segment number, text, output file) tuples
+        session: Engine session to queue the segments on
+        init_time: Seconds spent starting the session, for the timing report
+        metrics: Pipeline metrics to record the batch in
+
+    Returns:
+        Mapping of segment number to the file that was written
+    """
+    metrics = metrics or Metrics()
+
+    for i, text, segment_file in jobs:
+        print(f"🔊 Queueing segment {i}: {text[:50]}...")
+        session.queue(text, str(segment_file))
+
+    synth_started = time.perf_counter()
+    try:
+        with metrics.stage('synthesize', engine='pyttsx3', segments=len(jobs)) as record:
+            session.run()
+            record['bytes'] = sum(f.stat().st_size for _, _, f in jobs if f.exists())
+    except Exception as e:
+        print(f"❌ Error generating segments: {e}")
+        return {}
+    synth_time = time.perf_counter() - synth_started
+
+    results = {}
+    for i, _, segment_file in jobs:
+        if segment_file.exists():
+            results[i] = segment_file
+            print(f"   ✓ Saved to: {segment_file}")
+        else:
+            print(f"❌ Error generating segment {i}: no audio written")
+
+    if results:
+        per_segment = (init_time + synth_time) / len(results)
+        print(f"⏱️  Engine start-up {init_time:.2f}s (once), synthesis {synth_time:.2f}s, "
+              f"{per_segment:.3f}s per segment")
+        print(f"   Shared session saved ~{init_time * (len(results) - 1):.2f}s "
+              f"of repeated engine start-up")
+
+    return results
+
+
+# Engine session owned by each pyttsx3 pool worker process
+_worker_session: Optional[Pyttsx3Session] = None
+
+
+def _init_pyttsx3_worker(rate: int):
+    """Process pool initializer: start one long-lived engine per worker."""
+    global _worker_session
+    _worker_session = Pyttsx3Session(rate=rate)
+
+
+def _render_pyttsx3_chunk(chunk: List[Tuple[int, str, str]]) -> List[Tuple[int, bool]]:
+    """Render a chunk of segments on the worker's engine with one runAndWait()."""
+    for _, text, output_file in chunk:
+        _worker_session.queue(text, output_file)
+    _worker_session.run()
+    return [(i, os.path.exists(output_file)) for i, _, output_file in chunk]
+
+
+def _generate_segments_pyttsx3_pool(jobs: List[Tuple[int, str, Path]], rate: int = 150,
+                                    processes: int = 2,
+                                    metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+    """
+    Synthesize pyttsx3 segments across a pool of worker processes.
+
+    pyttsx3 is CPU-bound and not thread-safe, so each worker process owns
+    one engine, started (and its voice resolved) once at worker start-up.
+    Segments are split into contiguous chunks, each rendered with a single
+    runAndWait(). Output file names are fixed by segment number, so the
+    result does not depend on which worker finished first.
+
+    Args:
+        jobs: (segment number, text, output file) tuples
+        rate: Speech rate for every worker's engine
+        processes: Number of worker processes
+        metrics: Pipeline metrics to record the batch in
+
+    Returns:
+        Mapping of segment number to the file that was written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    metrics = metrics or Metrics()
+
+    processes = max(1, min(processes, len(jobs)))
+    # A few chunks per worker keeps workers busy when segment lengths vary
+    size = max(1, -(-len(jobs) // (processes * 4)))
+    chunks = [
+        [(i, text, str(segment_file)) for i, text, segment_file in jobs[start:start + size]]
+        for start in range(0, len(jobs), size)
+    ]
+    files = {i: segment_file for i, _, segment_file in jobs}
+
+    for i, text, _ in jobs:
+        print(f"🔊 Queueing segment {i}: {text[:50]}...")
+
+    results = {}
+    started = time.perf_counter()
+    try:
+        with metrics.stage('synthesize', engine='pyttsx3', segments=len(jobs),
+                           processes=processes) as record, \
+                ProcessPoolExecutor(max_workers=processes, initializer=_init_pyttsx3_worker,
+                                    initargs=(rate,)) as pool:
+            for rendered in pool.map(_render_pyttsx3_chunk, chunks):
+                for i, written in rendered:
+                    if written:
+                        results[i] = files[i]
+                        print(f"   ✓ Saved to: {files[i]}")
+                    else:
+                        print(f"❌ Error generating segment {i}: no audio written")
+            record['bytes'] = sum(f.stat().st_size for f in results.values())
+    except Exception as e:
+        print(f"❌ Error generating segments: {e}")
+        return results
+
+    if results:
+        elapsed = time.perf_counter() - started
+        print(f"⏱️  Synthesized {len(results)} segments in {elapsed:.2f}s "
+              f"with {processes} worker process(es)")
+
+    return results
+
+
+def _generate_segments_gtts(jobs: List[Tuple[int, str, Path]], lang: str = 'en',
+                            slow: bool = False, workers: int = 1, retries: int = 2,
+                            limiter: Optional[RateLimiter] = None,
+                            endpoint: Optional[str] = None,
+                            metrics: Optional[Metrics] = None) -> Dict[int, Path]:
+    """
+    Synthesize segments with gTTS using a bounded pool of worker threads.
+
+    Each segment is an independent HTTP round-trip, so up to ``workers``
+    requests run at once. Requests are spaced by ``limiter`` and
+    failed segments are retried with backoff. Output names always follow
+    the script order.
+
+    Args:
+        jobs: (segment number, text, output file) tuples
+        limiter: Rate limiter shared with the engine's other requests
+        metrics: Pipeline metrics to record each segment in
+
+    Returns:
+        Mapping of segment number to the file that was written
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    metrics = metrics or Metrics()
+
+    def synthesize(job):
+        i, text, segment_file = job
+        with metrics.stage('synthesize', per_thread=True, engine='gtts', segment=i,
+                           chars=len(text)) as record:
+            outcome = _call_with_retries(
+                lambda: generate_tts_gtts(text, str(segment_file), lang=lang, slow=slow,
+                                          endpoint=endpoint),
+                retries=retries, limiter=limiter
+            )
+            record['retries'] = outcome[1]
+            record['bytes'] = segment_file.stat().st_size
+        return outcome
+
+    results = {}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(synthesize, job): job for job in jobs}
+        for i, text, _ in jobs:
+            print(f"🔊 Generating segment {i}: {text[:50]}...")
+        for future in as_completed(futures):
+            i, text, segment_file = futures[future]
+            try:
+                _, retried = future.result()
+                results[i] = segment_file
+                note = f" (retried {retried}x)" if retried else ""
+                print(f"   ✓ Saved to: {segment_file}{note}")
+            except Exception as e:
+                print(f"❌ Error generating segment {i}: {e}")
+
+    if results:
+        elapsed = time.perf_counter() - started
+        print(f"⏱️  Synthesized {len(results)} segments in {elapsed:.2f}s "
+              f"with {max(1, workers)} worker(s)")
+
+    return results
+
+
+MANIFEST_VERSION = 1
+
+
+def _file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_build_manifest(manifest_file: Path) -> Dict:
+    """Load a build manifest, returning an empty one if missing or unreadable."""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def write_build_manifest(manifest_file: Path, manifest: Dict):
+    """Atomically write a build manifest next to the outputs it describes."""
+    tmp_file = manifest_file.with_name(f"{manifest_file.name}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, manifest_file)
+
+
+def _reusable_output(output_file: Path, recorded_hash: Optional[str]) -> bool:
+    """True if output_file still holds the bytes recorded in the manifest."""
+    if not recorded_hash or not output_file.exists():
+        return False
+    return _file_hash(output_file) == recorded_hash
+
+
+def _export_entries(exports: Optional[List[ExportTarget]]) -> List[Dict]:
+    """Manifest entries (file name and hash) for written export renditions."""
+    return [
+        {'file': Path(t.output_file).name, 'hash': _file_hash(Path(t.output_file))}
+        for t in exports or []
+    ]
+
+
+def _reusable_exports(output_path: Path, previous_combined: Dict) -> bool:
+    """True if every export rendition recorded with a combined file is intact."""
+    return all(
+        _reusable_output(output_path / entry['file'], entry.get('hash'))
+        for entry in previous_combined.get('exports', [])
+    )
+
+
+def _convert_in_memory(result: Dict, segments: List[str], output_path: Path, base_name: str,
+                       manifest_file: Path, previous: Dict, settings: Dict, script_file: str,
+                       pause_duration: int, reencode: bool, synthesizer: Synthesizer,
+                       metrics: Metrics,
+                       postprocess: Optional['SegmentPostProcessor'] = None,
+                       exports: Optional[List[ExportTarget]] = None):
+    """
+    Synthesize and combine a script in memory, writing only the combined file.
+
+    The combined file is kept when the segment texts, engine settings and
+    pause length all match the previous build manifest.
+    """
+    engine = synthesizer.engine
+    keys = [SegmentCache.make_key(text, engine, **settings) for text in segments]
+    combined_file = output_path / f"{base_name}_complete.mp3"
+    combined_entry = {
+        'file': combined_file.name,
+        'pause_duration': pause_duration,
+        'reencode': reencode,
+        'postprocess': postprocess.settings() if postprocess else None,
+        'formats': [[t.fmt, t.bitrate] for t in exports or []],
+    }
+
+    previous_keys = [entry['key'] for entry in previous.get('segments', [])]
+    previous_combined = previous.get('combined') or {}
+    unchanged = previous_keys == keys and all(
+        previous_combined.get(field) == value for field, value in combined_entry.items()
+    )
+    if (unchanged and _reusable_output(combined_file, previous_combined.get('hash'))
+            and _reusable_exports(output_path, previous_combined)
+            and cue_index_file(combined_file).exists()):
+        print(f"⏭️  Combined audio unchanged: {combined_file}")
+        result['reused'] = result['written'] = len(segments)
+        result['combined'] = str(combined_file)
+        result['exports'] = [t.output_file for t in exports or []]
+        return
+
+    print(f"🔊 Synthesizing {len(segments)} segments in memory...")
+    try:
+        with metrics.stage('synthesize', engine=engine, segments=len(segments)) as record:
+            buffers = synthesizer.synthesize_many(segments)
+            record['bytes'] = sum(len(data) for data in buffers)
+        print(f"🎵 Combining {len(buffers)} segments...")
+        cues = list(enumerate(segments, 1))
+        if exports:
+            # Renditions are encoded from one decode, so go through the file combiner
+            if not combine_audio_segments(buffers, str(combined_file), pause_duration,
+                                          reencode=reencode, metrics=metrics,
+                                          postprocess=postprocess, exports=exports,
+                                          cues=cues):
+                raise RuntimeError("combining failed")
+            with open(combined_file, 'rb') as f:
+                combined = f.read()
+        else:
+            timeline = []
+            with metrics.stage('combine', mode='memory', segments=len(buffers)) as record:
+                combined = synthesizer.combine(buffers, pause_duration, reencode=reencode,
+                                               postprocess=postprocess, timeline=timeline)
+                record['bytes'] = len(combined)
+            with open(combined_file, 'wb') as f:
+                f.write(combined)
+            print(f"✅ Combined audio saved to: {combined_file}")
+            write_cue_index(combined_file, timeline, cues)
+    except Exception as e:
+        print(f"❌ Error generating audio: {e}")
+        result['error'] = str(e)
+        return
+
+    result['written'] = len(buffers)
+    if synthesizer.cache is not None:
+        result['cached'] = synthesizer.cache.hits
+        synthesizer.cache.report(metrics)
+    result['combined'] = str(combined_file)
+    combined_entry['inputs'] = [hashlib.sha256(data).hexdigest() for data in buffers]
+    combined_entry['hash'] = hashlib.sha256(combined).hexdigest()
+    combined_entry['exports'] = _export_entries(exports)
+    result['exports'] = [t.output_file for t in exports or []]
+
+    write_build_manifest(manifest_file, {
+        'version': MANIFEST_VERSION,
+        'script': str(script_file),
+        'script_hash': _file_hash(Path(script_file)),
+        'engine': engine,
+        'settings': settings,
+        'segments': [
+            {'index': i, 'key': key, 'file': None, 'hash': digest}
+            for i, (key, digest) in enumerate(zip(keys, combined_entry['inputs']), 1)
+        ],
+        'combined': combined_entry,
+    })
+
+
+def convert_script_to_speech(
+    script_file: str,
+    output_dir: str,
+    engine: Union[str, TTSEngine] = 'gtts',
+    lang: str = 'en',
+    combine: bool = True,
+    rate: int = 150,
+    workers: int = 1,
+    retries: int = 2,
+    rate_limit: float = 0,
+    endpoint: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = 500,
+    stream: bool = False,
+    reencode: bool = False,
+    name: Optional[str] = None,
+    session: Optional[Pyttsx3Session] = None,
+    pause_duration: int = 1000,
+    force: bool = False,
+    chunk: bool = False,
+    max_chars: Optional[int] = None,
+    keep_segments: bool = True,
+    processes: int = 1,
+    metrics: Optional[Metrics] = None,
+    postprocess: Optional['SegmentPostProcessor'] = None,
+    formats: Optional[List[Tuple[str, Optional[str]]]] = None,
+    voice: Optional[str] = None
+) -> Dict:
+    """
+    Convert a script file to speech audio files.
+
+    Args:
+        script_file: Path to script text file
+        output_dir: Directory to save audio files
+        engine: Registered engine name (see ENGINES), or an engine instance
+            shared between scripts
+        lang: Language code
+        combine: Whether to combine segments into one file
+        rate: Speech rate for offline engines
+        workers: Concurrent requests for thread-safe engines (segment order
+            is preserved)
+        retries: Retries per failed gTTS segment
+        rate_limit: Maximum gTTS requests per second (0 = unlimited)
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
+        cache_dir: Directory for the segment cache (None disables caching)
+        cache_size: Cache size bound in megabytes
+        stream: Stream segments through one encoder when combining
+        reencode: Decode and re-encode MP3 segments instead of copying frames
+        name: Base name for output files (default: script file name)
+        session: Shared pyttsx3 session to reuse (created if omitted)
+        pause_duration: Pause between combined segments in milliseconds
+        force: Ignore the build manifest and regenerate every output
+        chunk: Rebalance lines into requests of about max_chars characters
+        max_chars: Characters per request when chunking (default: per engine)
+        keep_segments: Write per-segment files; when False (and combining)
+            segments stay in memory and only the combined file is written
+        processes: pyttsx3 worker processes, each with its own engine
+        metrics: Pipeline metrics to record stage timings in (events are
+            tagged with the script name)
+        postprocess: SegmentPostProcessor that trims silence and levels
+            loudness of each segment before combining (None = off)
+        formats: Extra (format, bitrate) renditions of the combined file,
+            e.g. [('opus', '24k'), ('wav', None)], see parse_formats()
+        voice: Engine-specific voice name or model file (piper, espeak-ng)
+
+    A build manifest (``<name>.manifest.json``) is written next to the
+    outputs. On the next run, segments whose text and engine settings
+    are unchanged and whose files still match their recorded hashes are
+    kept as they are, and the combined file is only rebuilt when a
+    segment or the pause length changed.
+
+    Returns:
+        Summary of the run: segment counts, reused and cached segments,
+        combined file, elapsed seconds and an error message if the script
+        was not converted
+    """
+    started = time.perf_counter()
+    base_name = name or Path(script_file).stem
+    tts = engine if isinstance(engine, TTSEngine) else None
+    engine = tts.name if tts else engine
+    result = {
+        'script': str(script_file), 'name': base_name, 'engine': engine, 'lang': lang,
+        'segments': 0, 'written': 0, 'reused': 0, 'cached': 0, 'combined': None,
+        'exports': [], 'seconds': 0.0, 'error': None,
+    }
+
+    metrics = (metrics or Metrics()).bind(script=base_name)
+    if postprocess is not None:
+        # Per-script totals, even when a batch shares one processor
+        postprocess = postprocess.copy()
+
+    def finish(error: Optional[str] = None) -> Dict:
+        result['error'] = error
+        result['seconds'] = time.perf_counter() - started
+        metrics.emit('script', engine=engine, lang=lang, segments=result['segments'],
+                     written=result['written'], reused=result['reused'],
+                     cached=result['cached'], combined=result['combined'],
+                     wall_s=round(result['seconds'], 6), error=error)
+        return result
+
+    # Ensure output directory exists
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # Read script
+    print(f"📖 Reading script: {script_file}")
+    with metrics.stage('read', file=str(script_file)) as record:
+        segments = read_script(script_file)
+        record['segments'] = len(segments)
+
+    if not segments:
+        print("❌ No text segments found in script file")
+        return finish("no text segments")
+
+    print(f"✅ Found {len(segments)} text segments")
+
+    if tts is None:
+        try:
+            tts = create_engine(engine, lang=lang, rate=rate, voice=voice, workers=workers,
+                                retries=retries, rate_limit=rate_limit, endpoint=endpoint,
+                                session=session, processes=processes)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return finish(f"unknown engine {engine}")
+
+    if chunk:
+        budget = max_chars or tts.max_chars
+        lines = len(segments)
+        segments = chunk_segments(segments, lang=lang, max_chars=budget)
+        print(f"✂️  Chunked {lines} lines into {len(segments)} segments "
+              f"of up to {budget} characters")
+
+    result['segments'] = len(segments)
+
+    if not tts.ready:
+        try:
+            with metrics.stage('engine_init', engine=engine):
+                tts.start()
+        except Exception as e:
+            print(f"❌ Error starting {engine} engine: {e}")
+            return finish(f"{engine} start-up failed: {e}")
+
+    # Engine settings that change the audio (used for cache keys)
+    settings = tts.settings()
+
+    jobs = [
+        (i, text, output_path / f"{base_name}_segment_{i:02d}{tts.suffix}")
+        for i, text in enumerate(segments, 1)
+    ]
+
+    # Previous build of this script, if any
+    manifest_file = output_path / f"{base_name}.manifest.json"
+    previous = {} if force else load_build_manifest(manifest_file)
+    previous_segments = {
+        entry['file']: entry for entry in previous.get('segments', [])
+    }
+
+    exports = export_targets(output_path, base_name, formats or [])
+
+    if combine and not keep_segments:
+        _convert_in_memory(result, segments, output_path, base_name, manifest_file, previous,
+                           settings, script_file, pause_duration=pause_duration,
+                           reencode=reencode, synthesizer=Synthesizer(
+                               engine=tts, lang=lang, cache_dir=cache_dir,
+                               cache_size=cache_size),
+                           metrics=metrics, postprocess=postprocess, exports=exports)
+        print(f"\n✅ All done! Audio files saved to: {output_dir}")
+        return finish(result['error'])
+
+    # Reuse unchanged outputs, then cached segments
+    cache = SegmentCache(cache_dir, cache_size * 1024 * 1024) if cache_dir else None
+    results = {}
+    keys = {}
+    pending = []
+    for i, text, segment_file in jobs:
+        keys[i] = SegmentCache.make_key(text, engine, **settings)
+        entry = previous_segments.get(segment_file.name, {})
+        if entry.get('key') == keys[i] and _reusable_output(segment_file, entry.get('hash')):
+            results[i] = segment_file
+            result['reused'] += 1
+            continue
+        if cache is not None and cache.get(keys[i], segment_file):
+            results[i] = segment_file
+            print(f"♻️  Segment {i} from cache: {segment_file}")
+            continue
+        pending.append((i, text, segment_file))
+
+    if result['reused']:
+        print(f"⏭️  {result['reused']} unchanged segments kept from the previous build")
+
+    # Generate audio for each remaining segment
+    if pending:
+        generated = tts.render_files(pending, metrics=metrics)
+
+        if cache is not None:
+            for i, segment_file in generated.items():
+                cache.put(keys[i], segment_file)
+        results.update(generated)
+
+    segment_files = [str(results[i]) for i in sorted(results)]
+    result['written'] = len(segment_files)
+
+    if cache is not None:
+        result['cached'] = cache.hits
+        cache.prune()
+        cache.report(metrics)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'script': str(script_file),
+        'script_hash': _file_hash(Path(script_file)),
+        'engine': engine,
+        'settings': settings,
+        'segments': [
+            {'index': i, 'key': keys[i], 'file': results[i].name,
+             'hash': _file_hash(results[i])}
+            for i in sorted(results)
+        ],
+        'combined': None,
+    }
+
+    # Combine segments if requested. A single segment is still written as
+    # _complete.mp3 (copied, or encoded from WAV) so automations find it by name
+    if combine and segment_files:
+        combined_file = output_path / f"{base_name}_complete.mp3"
+        combined_entry = {
+            'file': combined_file.name,
+            'inputs': [entry['hash'] for entry in manifest['segments']],
+            'pause_duration': pause_duration,
+            'reencode': reencode,
+            'postprocess': postprocess.settings() if postprocess else None,
+            'formats': [[t.fmt, t.bitrate] for t in exports],
+        }
+        previous_combined = previous.get('combined') or {}
+        unchanged = all(
+            previous_combined.get(field) == value
+            for field, value in combined_entry.items()
+        )
+
+        if (unchanged and _reusable_output(combined_file, previous_combined.get('hash'))
+                and _reusable_exports(output_path, previous_combined)
+                and cue_index_file(combined_file).exists()):
+            print(f"\n⏭️  Combined audio unchanged: {combined_file}")
+            result['combined'] = str(combined_file)
+            result['exports'] = [t.output_file for t in exports]
+            combined_entry['hash'] = previous_combined['hash']
+            combined_entry['exports'] = previous_combined.get('exports', [])
+            manifest['combined'] = combined_entry
+        else:
+            print(f"\n🎵 Combining {len(segment_files)} segment(s)...")
+            if combine_audio_segments(segment_files, str(combined_file), pause_duration,
+                                      stream=stream, reencode=reencode, metrics=metrics,
+                                      postprocess=postprocess, exports=exports,
+                                      cues=[(i, segments[i - 1]) for i in sorted(results)]):
+                result['combined'] = str(combined_file)
+                result['exports'] = [t.output_file for t in exports]
+                combined_entry['hash'] = _file_hash(combined_file)
+                combined_entry['exports'] = _export_entries(exports)
+                manifest['combined'] = combined_entry
+
+    write_build_manifest(manifest_file, manifest)
+
+    print(f"\n✅ All done! Audio files saved to: {output_dir}")
+
+    failed = len(segments) - len(segment_files)
+    return finish(f"{failed} segment(s) failed" if failed else None)
+
+
+def infer_lang(script_file: str, default: str = 'en') -> str:
+    """
+    Infer a language code from a script name suffix.
+
+    ``legal_rights_es.txt`` gives ``es`` and ``legal_rights_zh-CN.txt``
+    gives ``zh-CN``; names without a suffix fall back to default.
+    """
+    match = re.search(r'_([a-z]{2,3}(?:-[A-Za-z]{2,4})?)$', Path(script_file).stem)
+    return match.group(1) if match else default
+
+
+def discover_scripts(directory: str, engine: str = 'gtts', lang: str = 'en',
+                     pattern: str = '*.txt') -> List[Dict]:
+    """
+    Build batch entries for every script in a directory.
+
+    Args:
+        directory: Directory to scan
+        engine: Engine used for every script
+        lang: Language used when it cannot be inferred from the file name
+        pattern: Glob pattern script file names must match
+
+    Returns:
+        Batch entries with script, lang, engine and name keys
+    """
+    return [
+        {'script': str(path), 'lang': infer_lang(path.name, lang), 'engine': engine,
+         'name': path.stem}
+        for path in sorted(Path(directory).glob(pattern))
+    ]
+
+
+def load_batch_manifest(manifest_file: str, engine: str = 'gtts', lang: str = 'en') -> List[Dict]:
+    """
+    Load batch entries from a JSON manifest.
+
+    The manifest is either a list of entries or an object with a
+    ``scripts`` list. Each entry needs a ``script`` path (relative to the
+    manifest) and may set ``lang``, ``engine`` and ``name``::
+
+        {"scripts": [
+            {"script": "scripts/legal_rights_en.txt"},
+            {"script": "scripts/legal_rights_es.txt", "lang": "es",
+             "engine": "gtts", "name": "derechos_es"}
+        ]}
+
+    Args:
+        manifest_file: Path to the manifest
+        engine: Engine for entries that do not set one
+        lang: Language for entries that do not set one and whose file name
+            has no language suffix
+
+    Returns:
+        Batch entries with script, lang, engine and name keys
+    """
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_dir = Path(manifest_file).parent
+    entries = []
+    for entry in manifest['scripts'] if isinstance(manifest, dict) else manifest:
+        script = base_dir / entry['script']
+        entries.append({
+            'script': str(script),
+            'lang': entry.get('lang') or infer_lang(script.name, lang),
+            'engine': entry.get('engine', engine),
+            'name': entry.get('name') or script.stem,
+        })
+
+    return entries
+
+
+class _ThreadOutput:
+    """
+    sys.stdout stand-in that holds back each thread's output while it runs.
+
+    Inside captured(), a thread's prints go to its own buffer, which is
+    written out in one piece when the block ends. Scripts converted at the
+    same time therefore print whole blocks instead of interleaved lines.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        with self.lock:
+            return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @contextlib.contextmanager
+    def captured(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield
+        finally:
+            text, self.local.buffer = self.local.buffer.getvalue(), None
+            with self.lock:
+                self.stream.write(text)
+                self.stream.flush()
+
+
+def convert_batch(entries: List[Dict], output_dir: str, jobs: int = 1, **options) -> List[Dict]:
+    """
+    Convert many scripts in one process.
+
+    Scripts for thread-safe engines (gTTS, piper, espeak-ng) run
+    concurrently across ``jobs`` threads. Scripts for other engines
+    (pyttsx3, whose drivers are not thread-safe) run one after another on
+    the calling thread and share one engine instance (per language, if the
+    engine uses it), so the driver starts once for the whole batch.
+
+    All gTTS requests of the batch share one rate limiter, so
+    ``rate_limit`` holds for the batch as a whole rather than per script.
+    When scripts run concurrently, each script's progress is printed as
+    one block once it finishes.
+
+    Args:
+        entries: Batch entries with script, lang, engine and name keys
+        output_dir: Directory to save audio files
+        jobs: Number of scripts converted at once
+        **options: Further convert_script_to_speech() arguments
+
+    Returns:
+        One convert_script_to_speech() summary per entry, in entry order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = [None] * len(entries)
+    limiter = RateLimiter(options.get('rate_limit', 0))
+    output = _ThreadOutput(sys.stdout) if jobs > 1 and len(entries) > 1 else None
+
+    def convert(index: int, entry: Dict, engine: Optional[TTSEngine] = None):
+        with output.captured() if output else contextlib.nullcontext():
+            try:
+                if engine is None and entry['engine'] in ENGINES:
+                    engine = create_engine(entry['engine'], lang=entry['lang'],
+                                           limiter=limiter, **options)
+                results[index] = convert_script_to_speech(
+                    script_file=entry['script'], output_dir=output_dir,
+                    engine=engine or entry['engine'], lang=entry['lang'], name=entry['name'],
+                    **options
+                )
+            except Exception as e:
+                print(f"❌ Error converting {entry['script']}: {e}")
+                results[index] = {
+                    'script': entry['script'], 'name': entry['name'], 'engine': entry['engine'],
+                    'lang': entry['lang'], 'segments': 0, 'written': 0, 'reused': 0,
+                    'cached': 0, 'combined': None, 'exports': [], 'seconds': 0.0,
+                    'error': str(e),
+                }
+
+    def thread_safe(entry: Dict) -> bool:
+        engine_class = ENGINES.get(entry['engine'])
+        return engine_class is None or engine_class.thread_safe
+
+    parallel = [(i, e) for i, e in enumerate(entries) if thread_safe(e)]
+    serial = [(i, e) for i, e in enumerate(entries) if not thread_safe(e)]
+
+    if output:
+        sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = [pool.submit(convert, i, entry) for i, entry in parallel]
+
+            shared = {}
+            for i, entry in serial:
+                uses_lang = ENGINES[entry['engine']].uses_lang
+                key = (entry['engine'], entry['lang'] if uses_lang else None)
+                if key not in shared:
+                    shared[key] = create_engine(entry['engine'], lang=entry['lang'], **options)
+                    try:
+                        shared[key].start()
+                    except Exception as e:
+                        print(f"❌ Error starting {entry['engine']} engine: {e}")
+                        # Each script retries and reports the failure itself
+                        shared[key] = None
+                convert(i, entry, engine=shared[key])
+
+            for future in futures:
+                future.result()
+    finally:
+        if output:
+            sys.stdout = output.stream
+
+    return results
+
+
+# Scripts that make up the device audio bundle
+BUNDLE_PATTERN = 'legal_rights_*.txt'
+
+# Folder the audio is unpacked to on devices (matches the repo's audio/ folder)
+BUNDLE_AUDIO_DIR = 'audio'
+
+
+def _bundle_fingerprint(entry: Dict, options: Dict) -> str:
+    """Hash a script and every option that changes its bundled audio."""
+    postprocess = options.get('postprocess')
+    payload = {
+        'script_hash': _file_hash(Path(entry['script'])),
+        'engine': entry['engine'],
+        'lang': entry['lang'],
+        'rate': options.get('rate', 150),
+        'pause_duration': options.get('pause_duration', 1000),
+        'reencode': options.get('reencode', False),
+        'chunk': options.get('chunk', False),
+        'max_chars': options.get('max_chars'),
+        'postprocess': postprocess.settings() if postprocess else None,
+        'formats': options.get('formats') or [],
+        'voice': options.get('voice'),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _next_bundle_version(previous: Optional[str]) -> str:
+    """Increment the trailing number of a bundle version ('7' -> '8', '2024.3' -> '2024.4')."""
+    if not previous:
+        return '1'
+    match = re.search(r'(\d+)$', previous)
+    if not match:
+        return f"{previous}.1"
+    return previous[:match.start()] + str(int(match.group(1)) + 1)
+
+
+def _bundle_script_entry(entry: Dict, result: Dict, fingerprint: str) -> Dict:
+    """Describe the files one converted script contributes to a bundle."""
+    combined = Path(result['combined'])
+    files = [combined] + [Path(f) for f in result['exports']]
+    files += [f for f in (cue_index_file(combined), combined.with_suffix('.cue')) if f.exists()]
+
+    duration_ms = None
+    if cue_index_file(combined).exists():
+        with open(cue_index_file(combined), encoding='utf-8') as f:
+            duration_ms = json.load(f).get('duration_ms')
+
+    return {
+        'name': entry['name'],
+        'script': Path(entry['script']).name,
+        'lang': entry['lang'],
+        'engine': entry['engine'],
+        'fingerprint': fingerprint,
+        'duration_ms': duration_ms,
+        'files': [
+            {'path': f"{BUNDLE_AUDIO_DIR}/{path.name}", 'sha256': _file_hash(path),
+             'bytes': path.stat().st_size, 'source': str(path)}
+            for path in files
+        ],
+    }
+
+
+def _write_bundle_archive(archive_file: Path, manifest: Dict,
+                          previous_archive: Optional[Path]):
+    """Write the bundle zip atomically, copying reused files from the previous bundle."""
+    import zipfile
+
+    tmp_file = archive_file.with_name(f"{archive_file.name}.tmp")
+    previous_zip = None
+    try:
+        if previous_archive is not None and previous_archive.exists():
+            previous_zip = zipfile.ZipFile(previous_archive)
+        with zipfile.ZipFile(tmp_file, 'w') as bundle:
+            for script in manifest['scripts']:
+                for entry in script['files']:
+                    # Compressed audio is stored as is; text and WAV files are deflated
+                    compression = (zipfile.ZIP_DEFLATED
+                                   if entry['path'].endswith(('.json', '.cue', '.wav'))
+                                   else zipfile.ZIP_STORED)
+                    if entry.get('source'):
+                        bundle.write(entry['source'], entry['path'], compress_type=compression)
+                    else:
+                        bundle.writestr(entry['path'], previous_zip.read(entry['path']),
+                                        compress_type=compression)
+            public = {key: value for key, value in manifest.items() if key != 'archive'}
+            bundle.writestr('manifest.json', json.dumps(_without_sources(public), indent=2,
+                                                        ensure_ascii=False),
+                            compress_type=zipfile.ZIP_DEFLATED)
+        os.replace(tmp_file, archive_file)
+    finally:
+        if previous_zip is not None:
+            previous_zip.close()
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+
+def _without_sources(manifest: Dict) -> Dict:
+    """Drop build-machine file paths from a bundle manifest."""
+    return {
+        **manifest,
+        'scripts': [
+            {**script, 'files': [{k: v for k, v in entry.items() if k != 'source'}
+                                 for entry in script['files']]}
+            for script in manifest['scripts']
+        ],
+    }
+
+
+def _previous_bundle_scripts(previous: Dict, previous_archive: Optional[Path]) -> Dict[str, Dict]:
+    """Scripts of the previous bundle whose files can be copied from its archive."""
+    import zipfile
+
+    if previous_archive is None or not previous_archive.exists():
+        return {}
+    try:
+        with zipfile.ZipFile(previous_archive) as bundle:
+            members = set(bundle.namelist())
+    except zipfile.BadZipFile:
+        return {}
+    return {
+        script['name']: script for script in previous.get('scripts', [])
+        if all(entry['path'] in members for entry in script['files'])
+    }
+
+
+def build_bundle(scripts_dir: str, bundle_dir: str, jobs: int = 1,
+                 pattern: str = BUNDLE_PATTERN, engine: str = 'gtts', lang: str = 'en',
+                 version: Optional[str] = None, keep: int = 3,
+                 **options) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    Build a versioned audio bundle of every script in a directory, for device sync.
+
+    The language of each script comes from its file name suffix. Scripts
+    whose text and audio settings match the previous bundle are copied
+    from its archive unchanged; the rest are converted in parallel with
+    convert_batch() in ``<bundle_dir>/build`` (where their build manifests
+    keep unchanged segments between runs). The result is a zip named
+    ``good_trouble_audio_v<version>.zip`` holding ``audio/`` and a
+    ``manifest.json`` with every file's hash, size and duration.
+    ``<bundle_dir>/bundle.json`` records the latest bundle.
+
+    Args:
+        scripts_dir: Directory holding the scripts
+        bundle_dir: Directory for bundles and the build area
+        jobs: Number of scripts converted at once
+        pattern: Glob pattern of the scripts to bundle
+        engine: TTS engine for every script
+        lang: Language for scripts without a language suffix
+        version: Bundle version (default: the previous version plus one)
+        keep: Number of bundle archives to keep
+        **options: Further convert_script_to_speech() arguments
+
+    Returns:
+        The bundle manifest (None if a script failed to convert), and the
+        convert_batch() results of the scripts that were rebuilt
+    """
+    bundle_path = Path(bundle_dir)
+    bundle_path.mkdir(parents=True, exist_ok=True)
+    state_file = bundle_path / 'bundle.json'
+
+    entries = discover_scripts(scripts_dir, engine=engine, lang=lang, pattern=pattern)
+    if not entries:
+        print(f"❌ No scripts matching {pattern} in: {scripts_dir}")
+        return None, []
+
+    previous = load_build_manifest(state_file)
+    previous_archive = bundle_path / previous['archive'] if previous.get('archive') else None
+    reusable = {} if options.get('force') else _previous_bundle_scripts(previous, previous_archive)
+
+    fingerprints = {entry['name']: _bundle_fingerprint(entry, options) for entry in entries}
+    reused = [e for e in entries
+              if reusable.get(e['name'], {}).get('fingerprint') == fingerprints[e['name']]]
+    pending = [e for e in entries if e not in reused]
+
+    for entry in reused:
+        print(f"⏭️  {entry['name']} unchanged since bundle v{previous['bundle_version']}")
+
+    results = []
+    if pending:
+        print(f"📚 Converting {len(pending)} scripts")
+        results = convert_batch(pending, str(bundle_path / 'build'), jobs=jobs,
+                                **{**options, 'combine': True})
+        failed = [r for r in results if r['error'] or not r['combined']]
+        if failed:
+            for r in failed:
+                print(f"❌ {r['name']}: {r['error'] or 'no combined audio'}")
+            return None, results
+
+    names = sorted(e['name'] for e in entries)
+    if not pending and names == sorted(s['name'] for s in previous.get('scripts', [])):
+        print(f"\n✅ Bundle unchanged: {previous_archive}")
+        return previous, results
+
+    scripts = [reusable[e['name']] for e in reused]
+    by_name = {r['name']: r for r in results}
+    scripts += [_bundle_script_entry(e, by_name[e['name']], fingerprints[e['name']])
+                for e in pending]
+    scripts.sort(key=lambda script: script['name'])
+
+    version = version or _next_bundle_version(previous.get('bundle_version'))
+    archive_file = bundle_path / f"good_trouble_audio_v{version}.zip"
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'bundle_version': version,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'archive': archive_file.name,
+        'scripts': scripts,
+    }
+
+    print(f"\n📦 Writing bundle v{version} ({len(scripts)} scripts, {len(reused)} reused)")
+    _write_bundle_archive(archive_file, manifest, previous_archive)
+    manifest = _without_sources(manifest)
+    write_build_manifest(state_file, manifest)
+
+    # Keep the newest bundles so devices on older versions can still sync
+    archives = sorted(bundle_path.glob('good_trouble_audio_v*.zip'),
+                      key=lambda path: path.stat().st_mtime, reverse=True)
+    for old in archives[max(1, keep):]:
+        old.unlink()
+
+    print(f"✅ Bundle saved to: {archive_file}")
+    return manifest, results
+
+
+def print_batch_report(results: List[Dict]):
+    """Print a consolidated table of batch results."""
+    print("\n📊 Batch report")
+    print(f"  {'name':<28} {'lang':<6} {'engine':<8} {'segments':>8} {'reused':>6} "
+          f"{'cached':>6} {'seconds':>8}  status")
+    for r in results:
+        status = f"❌ {r['error']}" if r['error'] else "✅"
+        print(f"  {r['name']:<28} {r['lang']:<6} {r['engine']:<8} "
+              f"{r['written']:>3}/{r['segments']:<4} {r['reused']:>6} {r['cached']:>6} "
+              f"{r['seconds']:>8.2f}  {status}")
+
+    failed = sum(1 for r in results if r['error'])
+    print(f"\n  {len(results) - failed}/{len(results)} scripts converted")
+
+
+def _formats_argument(value: str) -> List[Tuple[str, Optional[str]]]:
+    """argparse type for --formats."""
+    try:
+        return parse_formats(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _add_synthesis_arguments(parser: argparse.ArgumentParser):
+    """Add the options shared by single-script and batch conversion."""
+    parser.add_argument(
+        '--engine',
+        choices=sorted(ENGINES),
+        default='gtts',
+        help='TTS engine to use (default: gtts)'
+    )
+
+    parser.add_argument(
+        '--lang',
+        default='en',
+        help='Language code (en, es, fr, etc.). Default: en'
+    )
+
+    parser.add_argument(
+        '--voice',
+        default=None,
+        help='Voice model file for piper, or voice name for espeak-ng. Default: per language'
+    )
+
+    parser.add_argument(
+        '--no-combine',
+        action='store_true',
+        help='Do not combine segments into a single file'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=int,
+        default=150,
+        help='Speech rate for offline engines (words per minute). Default: 150'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of concurrent requests or processes (gtts, piper, espeak-ng). Default: 1'
+    )
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=2,
+        help='Retries per failed gTTS segment, with exponential backoff. Default: 2'
+    )
+
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=0,
+        help='Maximum gTTS requests per second, across all scripts of a batch '
+             '(0 = unlimited). Default: 0'
+    )
+
+    parser.add_argument(
+        '--gtts-endpoint',
+        default=None,
+        help='Send gTTS requests to this URL instead of Google (for local testing)'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Reuse unchanged segments from this cache directory'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=500,
+        help='Maximum segment cache size in megabytes (LRU eviction). Default: 500'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Combine by streaming one segment at a time into the encoder (bounded memory)'
+    )
+
+    parser.add_argument(
+        '--reencode',
+        action='store_true',
+        help='Decode and re-encode MP3 segments instead of joining their frames directly'
+    )
+
+    parser.add_argument(
+        '--pause',
+        type=int,
+        default=1000,
+        help='Pause between combined segments in milliseconds. Default: 1000'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Ignore the build manifest and regenerate every output'
+    )
+
+    parser.add_argument(
+        '--chunk',
+        action='store_true',
+        help='Merge short lines and split long ones on sentence boundaries'
+    )
+
+    parser.add_argument(
+        '--max-chars',
+        type=int,
+        default=None,
+        help='Characters per segment with --chunk (default: 100 gtts, 400 offline engines)'
+    )
+
+    parser.add_argument(
+        '--combined-only',
+        action='store_true',
+        help='Keep segments in memory and only write the combined file'
+    )
+
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Worker processes for pyttsx3, each with its own engine. Default: 1'
+    )
+
+    parser.add_argument(
+        '--formats',
+        type=_formats_argument,
+        default=None,
+        help='Extra renditions of the combined file, encoded concurrently from one decode, '
+             'e.g. mp3:64k,opus:24k,wav (the default MP3 is always written)'
+    )
+
+    parser.add_argument(
+        '--trim-silence',
+        action='store_true',
+        help='Trim leading/trailing silence from each segment before combining (needs numpy)'
+    )
+
+    parser.add_argument(
+        '--silence-threshold',
+        type=float,
+        default=-45.0,
+        help='Level in dBFS below which audio counts as silence. Default: -45'
+    )
+
+    parser.add_argument(
+        '--normalize',
+        action='store_true',
+        help='Level every segment to the same loudness before combining (needs numpy)'
+    )
+
+    parser.add_argument(
+        '--target-level',
+        type=float,
+        default=-20.0,
+        help='Loudness in dBFS (gated RMS) that --normalize levels segments to. Default: -20'
+    )
+
+    parser.add_argument(
+        '--metrics-file',
+        default=None,
+        help='Append per-stage timings (wall/CPU time, bytes, retries) as JSON lines'
+    )
+
+    parser.add_argument(
+        '--profile',
+        default=None,
+        metavar='PATH',
+        help='Run under cProfile and dump the stats to PATH (view with pstats/snakeviz)'
+    )
+
+
+@contextlib.contextmanager
+def _profiled(profile_file: Optional[str]):
+    """Run the enclosed block under cProfile when a stats file is given."""
+    if not profile_file:
+        yield
+        return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_file)
+        print(f"\n⏱️  Profile saved to: {profile_file} (top functions by cumulative time)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+
+def _postprocessor(args: argparse.Namespace):
+    """Build the segment post-processor for --trim-silence / --normalize, if any."""
+    if not (args.trim_silence or args.normalize):
+        return None
+
+    from audio_postprocess import SegmentPostProcessor
+
+    try:
+        return SegmentPostProcessor(
+            trim_db=args.silence_threshold if args.trim_silence else None,
+            target_db=args.target_level if args.normalize else None,
+        )
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+def _synthesis_options(args: argparse.Namespace) -> Dict:
+    """Map parsed shared options to convert_script_to_speech() arguments."""
+    return {
+        'combine': not args.no_combine,
+        'rate': args.rate,
+        'workers': args.workers,
+        'retries': args.retries,
+        'rate_limit': args.rate_limit,
+        'endpoint': args.gtts_endpoint,
+        'cache_dir': args.cache_dir,
+        'cache_size': args.cache_size,
+        'stream': args.stream,
+        'reencode': args.reencode,
+        'pause_duration': args.pause,
+        'force': args.force,
+        'chunk': args.chunk,
+        'max_chars': args.max_chars,
+        'keep_segments': not args.combined_only,
+        'processes': args.processes,
+        'metrics': Metrics(args.metrics_file),
+        'postprocess': _postprocessor(args),
+        'formats': args.formats,
+        'voice': args.voice,
+    }
+
+
+def _batch_main(argv: List[str]):
+    """Entry point for the ``batch`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='text_to_speech.py batch',
+        description='Convert a directory or manifest of scripts in one process',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Convert every script in a directory (language inferred from _xx suffix)
+  python text_to_speech.py batch scripts/ output/ --jobs 4
+
+  # Convert the scripts listed in a JSON manifest
+  python text_to_speech.py batch manifest.json output/ --report output/report.json
+        """
+    )
+
+    parser.add_argument(
+        'source',
+        help='Directory of .txt scripts, or a JSON manifest'
+    )
+
+    parser.add_argument(
+        'output',
+        help='Output directory for audio files'
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of scripts converted at once (not pyttsx3). Default: 1'
+    )
+
+    parser.add_argument(
+        '--report',
+        default=None,
+        help='Write the consolidated batch report to this JSON file'
+    )
+
+    _add_synthesis_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        entries = discover_scripts(args.source, engine=args.engine, lang=args.lang)
+    elif os.path.exists(args.source):
+        entries = load_batch_manifest(args.source, engine=args.engine, lang=args.lang)
+    else:
+        print(f"❌ Batch source not found: {args.source}")
+        sys.exit(1)
+
+    if not entries:
+        print(f"❌ No scripts found in: {args.source}")
+        sys.exit(1)
+
+    if not check_dependencies(sorted({entry['engine'] for entry in entries})):
+        sys.exit(1)
+
+    print(f"📚 Converting {len(entries)} scripts")
+    try:
+        with _profiled(args.profile):
+            results = convert_batch(entries, args.output, jobs=args.jobs,
+                                    **_synthesis_options(args))
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(1)
+
+    print_batch_report(results)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"  Report saved to: {args.report}")
+
+    if any(r['error'] for r in results):
+        sys.exit(1)
+
+
+def _bundle_main(argv: List[str]):
+    """Entry point for the ``bundle`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='text_to_speech.py bundle',
+        description='Build a versioned audio bundle of every script for device sync',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Bundle every scripts/legal_rights_*.txt (language inferred from _xx suffix)
+  python text_to_speech.py bundle scripts/ bundles/ --jobs 4
+
+  # Bundle with phone-sized Opus renditions and an explicit version
+  python text_to_speech.py bundle scripts/ bundles/ --formats opus:24k --bundle-version 2.0
+        """
+    )
+
+    parser.add_argument(
+        'scripts',
+        help='Directory of scripts'
+    )
+
+    parser.add_argument(
+        'bundle_dir',
+        help='Directory for bundle archives, bundle.json and the build area'
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of scripts converted at once (not pyttsx3). Default: 1'
+    )
+
+    parser.add_argument(
+        '--pattern',
+        default=BUNDLE_PATTERN,
+        help=f'Glob pattern of the scripts to bundle. Default: {BUNDLE_PATTERN}'
+    )
+
+    parser.add_argument(
+        '--bundle-version',
+        default=None,
+        help='Version of the new bundle. Default: previous version plus one'
+    )
+
+    parser.add_argument(
+        '--keep',
+        type=int,
+        default=3,
+        help='Number of bundle archives kept in the bundle directory. Default: 3'
+    )
+
+    _add_synthesis_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.scripts):
+        print(f"❌ Scripts directory not found: {args.scripts}")
+        sys.exit(1)
+
+    if not check_dependencies([args.engine]):
+        sys.exit(1)
+
+    try:
+        with _profiled(args.profile):
+            manifest, results = build_bundle(
+                args.scripts, args.bundle_dir, jobs=args.jobs, pattern=args.pattern,
+                engine=args.engine, lang=args.lang, version=args.bundle_version,
+                keep=args.keep, **_synthesis_options(args)
+            )
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(1)
+
+    if results:
+        print_batch_report(results)
+
+    if manifest is None:
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for CLI."""
+    if argv is None:
+        argv = sys.argv[1:]
+    load_engine_plugins()
+    if argv and argv[0] == 'batch':
+        _batch_main(argv[1:])
+        return
+    if argv and argv[0] == 'bundle':
+        _bundle_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description='Convert text scripts to speech audio files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Generate English audio using Google TTS
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine gtts
+
+  # Generate Spanish audio using Google TTS
+  python text_to_speech.py scripts/legal_rights_es.txt output/ --engine gtts --lang es
+
+  # Generate audio using offline TTS (no internet required)
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine pyttsx3
+
+  # Generate without combining segments
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --no-combine
+
+  # Adjust speech rate for pyttsx3
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine pyttsx3 --rate 130
+
+  # Synthesize gTTS segments 4 at a time, at most 5 requests per second
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --workers 4 --rate-limit 5
+
+  # Offline neural voice: batch every segment through one piper process
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine piper \\
+      --voice voices/en_US-lessac-medium.onnx
+
+  # Spread offline pyttsx3 synthesis over 8 worker processes
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --engine pyttsx3 --processes 8
+
+  # Only re-synthesize lines that changed since the last run
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --cache-dir .tts_cache
+
+  # Also write small Opus and low-bitrate MP3 renditions for phones
+  python text_to_speech.py scripts/legal_rights_en.txt output/ --formats opus:24k,mp3:64k
+
+  # Record per-stage timings and a cProfile dump
+  python text_to_speech.py scripts/legal_rights_en.txt output/ \\
+      --metrics-file metrics.jsonl --profile tts.prof
+
+  # Convert every script in a directory in one process (see: batch --help)
+  python text_to_speech.py batch scripts/ output/ --jobs 4
+
+  # Build a versioned audio bundle for device sync (see: bundle --help)
+  python text_to_speech.py bundle scripts/ bundles/ --jobs 4
+        """
+    )
+
+    parser.add_argument(
+        'script',
+        help='Path to script text file'
+    )
+
+    parser.add_argument(
+        'output',
+        help='Output directory for audio files'
+    )
+
+    _add_synthesis_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Check dependencies
+    if not check_dependencies([args.engine]):
+        sys.exit(1)
+
+    # Validate input file
+    if not os.path.exists(args.script):
+        print(f"❌ Script file not found: {args.script}")
+        sys.exit(1)
+
+    # Convert script to speech
+    try:
+        with _profiled(args.profile):
+            convert_script_to_speech(
+                script_file=args.script,
+                output_dir=args.output,
+                engine=args.engine,
+                lang=args.lang,
+                **_synthesis_options(args)
+            )
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Local TTS Service for Safety Automation Toolkit
+
+A small asyncio HTTP service that synthesizes rights prompts on demand,
+for example personalised with a name, jurisdiction or language.
+
+- Identical in-flight requests (same text and settings) are coalesced
+  into a single synthesis
+- Finished audio is kept in a bounded in-memory cache (plus the optional
+  on-disk segment cache), so repeats are served without synthesis
+- Audio is streamed back with chunked transfer encoding
+
+Endpoints:
+    POST /synthesize   JSON body, returns audio/mpeg (or audio/wav for the stub)
+    GET  /health       JSON status and counters
+
+Request body:
+    {"text": "Hello $name, you have the right to remain silent.",
+     "params": {"name": "Alex"}, "lang": "en", "engine": "gtts", "pause": 800}
+
+``text`` may also be a list of segments, or ``script`` may name a file in
+the scripts directory (e.g. "legal_rights_es"). ``$placeholders`` are
+filled from ``params``. ``pause`` is the silence between segments in
+milliseconds (0 to MAX_PAUSE_MS). ``engine`` may only name the service's
+backend (the stub backend answers for any engine), and ``lang`` must be
+a language that engine supports.
+
+Usage:
+    python tts_service.py --port 8080
+    python tts_service.py --port 8080 --backend stub --stub-delay 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import math
+import re
+import string
+import struct
+import sys
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from text_to_speech import ENGINES, Synthesizer, load_engine_plugins, read_script
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+STREAM_CHUNK = 16 * 1024
+MAX_BODY = 64 * 1024
+# Longest pause a request may ask for between segments, in milliseconds
+MAX_PAUSE_MS = 10_000
+# Synthesizers kept alive, one per engine and language (least recently used go first)
+MAX_SYNTHESIZERS = 16
+
+# Language codes such as en, es, pt-PT or zh-CN
+LANG_CODE = re.compile(r'[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})*')
+
+
+@lru_cache(maxsize=256)
+def supports_lang(engine: str, lang: str) -> bool:
+    """Whether a registered engine can speak lang (cached: some engines run a program)."""
+    return ENGINES[engine].supports_lang(lang)
+
+
+class StubSynthesizer:
+    """
+    Deterministic offline stand-in for Synthesizer, for load testing.
+
+    Renders a mono WAV tone whose length is proportional to the text, after
+    sleeping ``delay`` seconds to imitate synthesis latency.
+
+    Args:
+        delay: Simulated synthesis time per request in seconds
+        ms_per_char: Audio length per character of text
+    """
+
+    suffix = '.wav'
+
+    def __init__(self, delay: float = 0.2, ms_per_char: int = 60):
+        self.delay = delay
+        self.ms_per_char = ms_per_char
+
+    def render(self, texts: List[str], pause_duration: int = 1000) -> bytes:
+        time.sleep(self.delay)
+        frame_rate = 8000
+        samples = []
+        for i, text in enumerate(texts):
+            frames = frame_rate * len(text) * self.ms_per_char // 1000
+            freq = 300 + int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:2], 16)
+            samples.extend(int(6000 * math.sin(2 * math.pi * freq * n / frame_rate))
+                           for n in range(frames))
+            if i < len(texts) - 1:
+                samples.extend([0] * (frame_rate * pause_duration // 1000))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(frame_rate)
+            wav.writeframes(struct.pack(f'<{len(samples)}h', *samples))
+        return buffer.getvalue()
+
+
+class AudioCache:
+    """
+    In-memory LRU cache of finished audio, bounded by total bytes.
+
+    Args:
+        max_bytes: Size bound of the cache
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes):
+        if key in self.entries or len(data) > self.max_bytes:
+            return
+        self.entries[key] = data
+        self.total += len(data)
+        while self.total > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total -= len(evicted)
+
+
+class RequestError(Exception):
+    """Raised for malformed synthesis requests (answered with HTTP 400)."""
+
+
+class TTSService:
+    """
+    Coalescing, caching synthesis service.
+
+    Args:
+        backend: A registered engine name (see ENGINES) or 'stub'
+        max_workers: Threads running blocking synthesis
+        cache_bytes: In-memory audio cache bound
+        cache_dir: Optional on-disk segment cache shared with the CLI
+        stub_delay: Simulated latency of the stub backend
+        endpoint: Override the Google TTS URL (e.g. a local stand-in server)
+    """
+
+    def __init__(self, backend: str = 'gtts', max_workers: int = 4,
+                 cache_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 stub_delay: float = 0.2, endpoint: Optional[str] = None):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.stub_delay = stub_delay
+        self.endpoint = endpoint
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Engines that are not thread-safe (pyttsx3) run on one thread of their own
+        self.serial_executors: Dict[str, ThreadPoolExecutor] = {}
+        self.cache = AudioCache(cache_bytes)
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.synthesizers: "OrderedDict[Tuple[str, Optional[str]], object]" = OrderedDict()
+        self.stats = {'requests': 0, 'syntheses': 0, 'coalesced': 0, 'cache_hits': 0,
+                      'errors': 0}
+
+    def _serial(self, engine: str) -> bool:
+        """Whether requests for engine must run one at a time."""
+        return self.backend != 'stub' and not ENGINES[engine].thread_safe
+
+    def _executor(self, engine: str) -> ThreadPoolExecutor:
+        """Thread pool to synthesize with, whatever engine the request names."""
+        if not self._serial(engine):
+            return self.executor
+        if engine not in self.serial_executors:
+            self.serial_executors[engine] = ThreadPoolExecutor(max_workers=1)
+        return self.serial_executors[engine]
+
+    def _synthesizer(self, engine: str, lang: str):
+        # Engines that ignore the language (pyttsx3 drives one cached driver
+        # engine) get a single synthesizer for all languages
+        key = (engine, lang if self.backend == 'stub' or ENGINES[engine].uses_lang else None)
+        if key in self.synthesizers:
+            self.synthesizers.move_to_end(key)
+            return self.synthesizers[key]
+
+        if self.backend == 'stub':
+            synthesizer = StubSynthesizer(delay=self.stub_delay)
+        else:
+            synthesizer = Synthesizer(
+                engine=engine, lang=lang, endpoint=self.endpoint, cache_dir=self.cache_dir
+            )
+        self.synthesizers[key] = synthesizer
+        # Jobs still rendering with an evicted synthesizer keep their own reference
+        while len(self.synthesizers) > MAX_SYNTHESIZERS:
+            self.synthesizers.popitem(last=False)
+        return synthesizer
+
+    def parse_job(self, body: bytes) -> Dict:
+        """Validate a request body and resolve it into segments and settings."""
+        try:
+            request = json.loads(body.decode('utf-8') or '{}')
+        except ValueError:
+            raise RequestError("body is not valid JSON")
+        if not isinstance(request, dict):
+            raise RequestError("body must be a JSON object")
+
+        if 'script' in request:
+            script = SCRIPTS_DIR / f"{Path(str(request['script'])).name}.txt"
+            if not script.exists():
+                raise RequestError(f"unknown script: {request['script']}")
+            segments = read_script(str(script))
+        elif isinstance(request.get('text'), list):
+            segments = [str(text) for text in request['text'] if str(text).strip()]
+        elif isinstance(request.get('text'), str):
+            segments = [request['text']]
+        else:
+            raise RequestError("request needs 'text' or 'script'")
+
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            raise RequestError("'params' must be a JSON object")
+        segments = [string.Template(text).safe_substitute(params) for text in segments]
+        if not segments:
+            raise RequestError("no text to synthesize")
+
+        # The stub stands in for any engine; a real backend serves only itself
+        engine = request.get('engine', 'gtts' if self.backend == 'stub' else self.backend)
+        if engine not in ENGINES:
+            raise RequestError(f"unknown engine: {engine}")
+        if self.backend != 'stub' and engine != self.backend:
+            raise RequestError(f"this service only serves engine '{self.backend}'")
+
+        lang = request.get('lang', 'en')
+        if not isinstance(lang, str) or not LANG_CODE.fullmatch(lang):
+            raise RequestError("'lang' must be a language code such as 'en' or 'pt-PT'")
+        if self.backend != 'stub' and not supports_lang(engine, lang):
+            raise RequestError(f"engine '{engine}' does not support language '{lang}'")
+
+        pause = request.get('pause', 1000)
+        if not isinstance(pause, int) or isinstance(pause, bool) or not 0 <= pause <= MAX_PAUSE_MS:
+            raise RequestError(f"'pause' must be an integer from 0 to {MAX_PAUSE_MS} (ms)")
+
+        return {
+            'segments': segments,
+            'engine': engine,
+            'lang': lang,
+            'pause': pause,
+        }
+
+    @staticmethod
+    def job_key(job: Dict) -> str:
+        payload = json.dumps(
+            [job['segments'], job['engine'], job['lang'], job['pause']],
+            ensure_ascii=False, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def synthesize(self, job: Dict) -> bytes:
+        """Return audio for a job, coalescing with identical in-flight jobs."""
+        self.stats['requests'] += 1
+        key = self.job_key(job)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        task = self.inflight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            # The synthesis runs as a task of its own, so a caller that is
+            # cancelled (e.g. the client hung up) never cancels it for the
+            # requests coalesced onto it
+            self.stats['syntheses'] += 1
+            task = asyncio.ensure_future(self._render(key, job))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    async def _render(self, key: str, job: Dict) -> bytes:
+        """Synthesize a job on its executor and cache the audio."""
+        try:
+            synthesizer = self._synthesizer(job['engine'], job['lang'])
+            audio = await asyncio.get_running_loop().run_in_executor(
+                self._executor(job['engine']), synthesizer.render, job['segments'], job['pause']
+            )
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        self.cache.put(key, audio)
+        return audio
+
+    def _finished(self, key: str, task: asyncio.Future):
+        del self.inflight[key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve a single HTTP/1.1 request on a connection."""
+        try:
+            request_line = await reader.readline()
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY:
+                await self._respond(writer, 413, {'error': 'request body too large'})
+                return
+            body = await reader.readexactly(length) if length else b''
+
+            if method == 'GET' and path == '/health':
+                await self._respond(writer, 200, {'status': 'ok', 'stats': self.stats,
+                                                  'inflight': len(self.inflight)})
+            elif method == 'POST' and path == '/synthesize':
+                try:
+                    job = self.parse_job(body)
+                except RequestError as e:
+                    await self._respond(writer, 400, {'error': str(e)})
+                    return
+                try:
+                    audio = await self.synthesize(job)
+                except Exception as e:
+                    await self._respond(writer, 502, {'error': f"synthesis failed: {e}"})
+                    return
+                await self._stream(writer, audio)
+            else:
+                await self._respond(writer, 404, {'error': 'not found'})
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._respond(writer, 400, {'error': 'malformed request'})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  502: 'Bad Gateway'}.get(status, '')
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _stream(writer: asyncio.StreamWriter, audio: bytes):
+        content_type = 'audio/wav' if audio[:4] == b'RIFF' else 'audio/mpeg'
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+            f"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n".encode('latin-1')
+        )
+        for start in range(0, len(audio), STREAM_CHUNK):
+            chunk = audio[start:start + STREAM_CHUNK]
+            writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(service: TTSService, host: str, port: int):
+    """Run the service until cancelled."""
+    server = await asyncio.start_server(service.handle, host, port)
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"🎙️  TTS service ({service.backend}) listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Main entry point for CLI."""
+    load_engine_plugins()
+    parser = argparse.ArgumentParser(
+        description='Serve on-demand TTS synthesis over HTTP',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve Google TTS on port 8080
+  python tts_service.py --port 8080
+
+  # Load-test locally with the deterministic stub backend
+  python tts_service.py --backend stub --stub-delay 0.5
+
+  # Request a personalised prompt
+  curl -o prompt.mp3 localhost:8080/synthesize \\
+       -d '{"text": "$name, you have the right to remain silent.", "params": {"name": "Alex"}}'
+        """
+    )
+
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind. Default: 127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help='Port to bind. Default: 8080')
+    parser.add_argument(
+        '--backend',
+        choices=sorted(ENGINES) + ['stub'],
+        default='gtts',
+        help='Synthesis backend (stub = offline fake for load testing). Default: gtts'
+    )
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Threads running synthesis. Default: 4')
+    parser.add_argument('--cache-mb', type=int, default=64,
+                        help='In-memory audio cache size in megabytes. Default: 64')
+    parser.add_argument('--cache-dir', default=None,
+                        help='On-disk segment cache shared with text_to_speech.py')
+    parser.add_argument('--stub-delay', type=float, default=0.2,
+                        help='Simulated synthesis latency of the stub backend. Default: 0.2')
+    parser.add_argument('--gtts-endpoint', default=None,
+                        help='Send gTTS requests to this URL instead of Google (for local testing)')
+
+    args = parser.parse_args()
+
+    service = TTSService(
+        backend=args.backend, max_workers=args.workers,
+        cache_bytes=args.cache_mb * 1024 * 1024, cache_dir=args.cache_dir,
+        stub_delay=args.stub_delay, endpoint=args.gtts_endpoint
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n⚠️  Service stopped")
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()